@@ -0,0 +1,72 @@
+"""Benchmark of the HTML cleaning, against the two-pass implementation it replaced.
+
+Runs offline, on a generated document shaped like the HTML of a large 10-K:
+
+    python benchmarks/bench_clean_html.py [size in MB]
+"""
+import re
+import sys
+import timeit
+
+from edgar_data.html_cleaner import HTMLCleaner, clean_html
+
+ROW = ('<tr valign="bottom" style="font-size:1pt">'
+       '<td width="45%" style="padding-left:0.5em"><font style="font-family:Times New Roman" size="2">'
+       'Net revenues</font></td>'
+       '<td align="right" colspan="2" style="border-bottom:1px solid"><FONT SIZE="2">$</FONT></td>'
+       '<td ALIGN="right" WIDTH="10%"><font size="2">229,234</font></td></tr>\n')
+PARAGRAPH = ('<p style="margin-top:12pt;text-align:justify"><font style="font-family:Times New Roman" size="2">'
+             'Our results of operations could be materially affected by a number of risks, uncertainties and '
+             'other factors, many of which are beyond our control.</font></p>\n')
+
+
+def legacy_clean_html(content):
+    # EdgarData._clean_html before the single-pass cleaner
+    font_tags = re.compile(r'(<(font|FONT).*?>|</(font|FONT)>)')
+    style_attrs = re.compile(r'('
+                             r'((style|STYLE)=\".*?\")|'
+                             r'((valign|VALIGN)=\".*?\")|'
+                             r'((align|ALIGN)=\".*?\")|'
+                             r'((width|WIDTH)=\".*?\")|'
+                             r'((height|HEIGHT)=\".*?\")|'
+                             r'((border|BORDER)=\".*?\")|'
+                             r'((cellpadding|CELLPADDING)=\".*?\")|'
+                             r'((cellspacing|CELLSPACING)=\".*?\")|'
+                             r'((size|SIZE)=\".*?\")|'
+                             r'((colspan|COLSPAN)=\".*?\")'
+                             r')')
+    no_font = re.sub(font_tags, '', content)
+    return re.sub(style_attrs, '', no_font)
+
+
+def generate_document(size):
+    parts = ['<html><body>\n']
+    length = 0
+    while length < size:
+        block = PARAGRAPH * 4 + '<table cellpadding="0" cellspacing="0" border="0">\n' + ROW * 20 + '</table>\n'
+        parts.append(block)
+        length += len(block)
+    parts.append('</body></html>\n')
+    return ''.join(parts)
+
+
+def clean_in_chunks(document, chunk_size=64 * 1024):
+    cleaner = HTMLCleaner()
+    parts = [cleaner.feed(document[start:start + chunk_size]) for start in range(0, len(document), chunk_size)]
+    parts.append(cleaner.close())
+    return ''.join(parts)
+
+
+def main(size_mb=20.0):
+    document = generate_document(int(size_mb * 1024 * 1024))
+    assert clean_html(document) == legacy_clean_html(document) == clean_in_chunks(document)
+
+    print('document: {0:.1f} MB'.format(len(document) / 1024 / 1024))
+    for name, function in (('two passes (legacy)', legacy_clean_html), ('single pass', clean_html),
+                           ('single pass, 64 KB chunks', clean_in_chunks)):
+        seconds = min(timeit.repeat(lambda: function(document), number=1, repeat=3))
+        print('{0:<28} {1:.3f} s'.format(name, seconds))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
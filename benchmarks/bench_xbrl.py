@@ -0,0 +1,274 @@
+"""Benchmark of the XBRL parsing, on the instance documents of benchmarks/fixtures, against stored baselines.
+
+Runs offline. The fixtures are small US-GAAP 10-K and 10-Q, and IFRS 20-F instances. The medium and large documents
+are made from them by adding business segments: each segment repeats the contexts and facts of the filing
+under a dimension, with a text block, as large filings do. Their fields must be those of the small documents.
+
+    python benchmarks/bench_xbrl.py [--sizes small medium large] [--save-baseline] [--tolerance 0.25]
+
+Measures the construction of `XBRL`, `loadYear`, `EdgarForm.set_period` toggling and the peak memory of the
+construction, and reports the measures exceeding their baseline by more than the tolerance. Baselines depend on
+the machine: save them again when moving to another one.
+"""
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+from lxml import etree
+
+from edgar_data.EdgarData import EdgarForm
+from edgar_data.xbrl import XBRL, XBRLI_NS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'xbrl.json')
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'edgar-data-benchmarks')
+
+FIXTURES = ['us-gaap-10k', 'us-gaap-10q', 'ifrs-20f']
+# Number of segments added to the fixtures
+SIZES = {'small': 0, 'medium': 250, 'large': 7500}
+
+XBRLDI_NS = 'http://xbrl.org/2006/xbrldi'
+SEGMENT_NS = 'http://benchmarks.edgar-data/segments'
+TEXT_BLOCK = '<p>{0}</p>'.format('Segment results of operations and outlook. ' * 25)
+
+# Below these differences, measures are noise rather than regressions
+MIN_SECONDS = 0.002
+MIN_MEMORY_MB = 2.0
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name + '.xml'), 'rb') as f:
+        return f.read()
+
+
+def add_segments(document, segments):
+    """Document with `segments` business segments added, each one repeating the contexts and facts
+    without dimensions under a member of a segment axis.
+
+    :type document: bytes
+    :rtype: bytes
+    """
+    if not segments:
+        return document
+
+    root = etree.fromstring(document)
+    contexts = [context for context in root.iterfind('{%s}context' % XBRLI_NS)
+                if context.find('.//{%s}segment' % XBRLI_NS) is None]
+    context_ids = {context.get('id') for context in contexts}
+    facts = [fact for fact in root if fact.get('contextRef') in context_ids and fact.get('unitRef')]
+    duration_id = next(context.get('id') for context in contexts
+                       if context.find('.//{%s}startDate' % XBRLI_NS) is not None)
+    first_fact = facts[0]
+
+    nsmap = dict(root.nsmap)
+    nsmap.update({'xbrldi': XBRLDI_NS, 'seg': SEGMENT_NS})
+    segmented = etree.Element(root.tag, nsmap=nsmap)
+    segmented.extend(root)
+
+    for segment in range(segments):
+        member = 'seg:Segment{0}Member'.format(segment)
+        for context in contexts:
+            context = copy.deepcopy(context)
+            context.set('id', '{0}_S{1}'.format(context.get('id'), segment))
+            entity_segment = etree.SubElement(context.find('{%s}entity' % XBRLI_NS), '{%s}segment' % XBRLI_NS)
+            explicit_member = etree.SubElement(entity_segment, '{%s}explicitMember' % XBRLDI_NS)
+            explicit_member.set('dimension', 'seg:BusinessSegmentAxis')
+            explicit_member.text = member
+            first_fact.addprevious(context)
+
+        for fact in facts:
+            fact = copy.deepcopy(fact)
+            fact.set('contextRef', '{0}_S{1}'.format(fact.get('contextRef'), segment))
+            segmented.append(fact)
+
+        text_block = etree.SubElement(segmented, '{%s}SegmentReportingDisclosureTextBlock' % SEGMENT_NS)
+        text_block.set('contextRef', '{0}_S{1}'.format(duration_id, segment))
+        text_block.text = TEXT_BLOCK
+
+    return etree.tostring(segmented, xml_declaration=True, encoding='utf-8')
+
+
+def benchmark_document(name, size):
+    """Path of a benchmark document, made once and kept in the temporary directory."""
+    if not SIZES[size]:
+        return os.path.join(FIXTURES_DIR, name + '.xml')
+    fixture = read_fixture(name)
+    digest = hashlib.sha1(fixture).hexdigest()[:12]
+    path = os.path.join(CACHE_DIR, '{0}-{1}-{2}.xml'.format(name, size, digest))
+    if not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temporary = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(temporary, 'wb') as f:
+            f.write(add_segments(fixture, SIZES[size]))
+        os.replace(temporary, path)
+    return path
+
+
+def _max_rss_mb():
+    # The peak of the process' memory. ru_maxrss is not used on Linux: it is inherited from the parent
+    # process, which may already have parsed larger documents.
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024.0
+    except IOError:
+        pass
+
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss / (1024.0 * 1024.0) if sys.platform == 'darwin' else max_rss / 1024.0
+
+
+def _peak_memory(path, options, results):
+    with open(path, 'rb') as f:
+        document = f.read()
+    before = _max_rss_mb()
+    XBRL(document, **options)
+    results.put(_max_rss_mb() - before)
+
+
+def peak_memory_mb(path, **options):
+    """Growth of the peak resident memory of a new process while it constructs the XBRL of a document,
+    C allocations of lxml included.
+
+    :param options: Arguments of `XBRL`, e.g. numeric_only=True.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_peak_memory, args=(path, options, results))
+    process.start()
+    peak = results.get()
+    process.join()
+    return peak
+
+
+def _best(function, repeat, number=1):
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def measure(name, size, repeat=3):
+    """
+    :return: Seconds of the construction of `XBRL`, of `loadYear(0)` and of one `set_period`,
+        and peak memory of the construction in MB.
+    :rtype: dict[str, float]
+    """
+    path = benchmark_document(name, size)
+    with open(path, 'rb') as f:
+        document = f.read()
+
+    xbrl = XBRL(document)
+    if size != 'small':
+        reference = XBRL(read_fixture(name))
+        if any(str(xbrl.fields[field]) != str(reference.fields[field]) for field in reference.fields.fields):
+            raise AssertionError('The fields of {0} {1} differ from the fixture.'.format(name, size))
+
+    # Only the XBRL matters to set_period
+    filing = {'form': xbrl.fields['DocumentType'], 'period_of_report': None, 'filing_date': '2019-03-01',
+              'index_url': None}
+    form = EdgarForm(None, xbrl, xbrl.fields['EntityCentralIndexKey'], None, filing, [])
+    quarterly = xbrl.fields['DocumentFiscalPeriodFocus'] != 'FY'
+    toggle = iter(range(sys.maxsize))
+
+    def set_period():
+        # Quarterly filings switch between the quarter and the year to date, annual ones reload the year
+        if quarterly and next(toggle) % 2:
+            form.set_period(this_quarter=True)
+        else:
+            form.set_period(this_year=True)
+
+    return {
+        'size_mb': len(document) / (1024.0 * 1024.0),
+        'construct': _best(lambda: XBRL(document), repeat),
+        'load_year': _best(lambda: xbrl.loadYear(0), repeat),
+        'set_period': _best(set_period, repeat, number=10),
+        'peak_memory_mb': peak_memory_mb(path),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """
+    :return: Descriptions of the measures exceeding their baseline by more than `tolerance`.
+    :rtype: list[str]
+    """
+    found = []
+    for key, measures in sorted(results.items()):
+        for measure_name, value in sorted(measures.items()):
+            if measure_name == 'size_mb':
+                continue
+            reference = baseline.get(key, {}).get(measure_name)
+            if reference is None:
+                continue
+            minimum = MIN_MEMORY_MB if measure_name == 'peak_memory_mb' else MIN_SECONDS
+            if value > reference * (1 + tolerance) and value - reference > minimum:
+                found.append('{0} {1}: {2:.4f} (baseline {3:.4f}, +{4:.0%})'.format(
+                    key, measure_name, value, reference, value / reference - 1))
+    return found
+
+
+def machine():
+    return {'platform': platform.platform(), 'python': platform.python_version(), 'processor': platform.machine()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the XBRL parsing.')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--fixtures', nargs='+', choices=FIXTURES, default=FIXTURES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baselines file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the baselines.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative increase above which a measure is a regression. Defaults to 0.25.')
+    args = parser.parse_args(argv)
+
+    results = {}
+    print('{0:<24}{1:>10}{2:>14}{3:>14}{4:>14}{5:>12}'.format(
+        'document', 'MB', 'XBRL() s', 'loadYear s', 'set_period s', 'peak MB'))
+    for size in args.sizes:
+        for name in args.fixtures:
+            key = '{0}/{1}'.format(name, size)
+            results[key] = measures = measure(name, size, args.repeat)
+            print('{0:<24}{1:>10.2f}{2:>14.4f}{3:>14.4f}{4:>14.4f}{5:>12.1f}'.format(
+                key, measures['size_mb'], measures['construct'], measures['load_year'], measures['set_period'],
+                measures['peak_memory_mb']))
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    if args.save_baseline:
+        baseline = dict(stored.get('results', {}))
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': machine(), 'results': baseline}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Baselines saved to {0}'.format(args.baseline))
+        return 0
+
+    if not stored:
+        print('No baselines: run with --save-baseline to store them.')
+        return 0
+    if stored.get('machine') != machine():
+        print('Baselines were measured on another machine ({0}): differences are indicative only.'.format(
+            stored.get('machine', {}).get('platform')))
+
+    found = regressions(results, stored.get('results', {}), args.tolerance)
+    for regression in found:
+        print('REGRESSION ' + regression)
+    if not found:
+        print('No regression against the baselines.')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Scaling of the XBRL parsing and of the period resolution with the shape of the instance document.
+
+Runs offline, on synthetic 10-Q instances (edgar_data.synthetic). Each knob (contexts, facts, dimensions, units,
+text block size) is varied alone, doubling at each step, and the construction of `XBRL`,
+`GetCurrentPeriodAndContextInformation` for the year to date and for the quarter, and the peak memory of the
+construction are measured at each step:
+
+    python benchmarks/bench_xbrl_scaling.py [--knobs contexts facts] [--steps 6] [--plot DIRECTORY]
+
+The growth exponent of each measure is the slope of its log against the log of the knob, ignoring the smallest
+documents, dominated by fixed costs: 1 for linear growth, 2 for quadratic growth. The script exits with status 1
+when an exponent exceeds --max-exponent, e.g. when a lookup scans every context or fact for each context or fact.
+--plot needs matplotlib.
+"""
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from collections import OrderedDict
+
+from bench_xbrl import peak_memory_mb
+from edgar_data.synthetic import CURRENT_VALUES, synthetic_instance
+from edgar_data.xbrl import XBRL
+
+PERIOD_END = '2018-09-30'
+
+# Shape of the documents while another knob varies
+BASE = OrderedDict([('contexts', 100), ('facts', 4000), ('dimensions', 1), ('units', 2), ('text_blocks', 20),
+                    ('text_block_size', 1000)])
+# Knobs and their value at the first step
+KNOBS = OrderedDict([('contexts', 100), ('facts', 4000), ('dimensions', 1), ('units', 1), ('text_block_size', 1000)])
+
+MEASURES = ['construct', 'periods_year', 'periods_quarter', 'peak_memory_mb']
+
+
+def _best(function, repeat=3):
+    # Enough calls per timing for it to last 0.2 second
+    number, _ = timeit.Timer(function).autorange()
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def measure(document, directory):
+    """
+    :return: Seconds of the construction of `XBRL` and of the resolution of the periods, and peak memory of the
+        construction in MB.
+    :rtype: dict[str, float]
+    """
+    xbrl = XBRL(document)
+    if float(xbrl.fields['Revenues']) != CURRENT_VALUES['Revenues']:
+        raise AssertionError('The synthetic document was not read correctly.')
+
+    path = os.path.join(directory, 'instance.xml')
+    with open(path, 'wb') as f:
+        f.write(document)
+
+    return {
+        'construct': _best(lambda: XBRL(document)),
+        'periods_year': _best(lambda: xbrl.GetCurrentPeriodAndContextInformation(PERIOD_END)),
+        'periods_quarter': _best(lambda: xbrl.GetCurrentPeriodAndContextInformation(PERIOD_END, quarter=True)),
+        'peak_memory_mb': peak_memory_mb(path),
+    }
+
+
+def growth_exponent(values, measures):
+    """Slope of the least squares fit of log(measures) against log(values), over the larger two thirds
+    of the values.
+
+    :rtype: float
+    """
+    points = [(math.log(value), math.log(max(result, 1e-9))) for value, result in zip(values, measures)]
+    points = points[len(points) // 3:]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
+def scale(knob, steps, directory):
+    """
+    :return: Values of the knob, sizes of the documents in MB, and measures at each step.
+    :rtype: tuple[list[int], list[float], list[dict[str, float]]]
+    """
+    values, sizes, results = [], [], []
+    for step in range(steps):
+        shape = dict(BASE)
+        shape[knob] = KNOBS[knob] * 2 ** step
+        document = synthetic_instance(quarterly=True, period_end=PERIOD_END, **shape)
+        values.append(shape[knob])
+        sizes.append(len(document) / (1024.0 * 1024.0))
+        results.append(measure(document, directory))
+    return values, sizes, results
+
+
+def plot(knob, values, results, directory):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib import pyplot
+    except ImportError:
+        raise SystemExit('--plot needs matplotlib.')
+
+    figure, (times, memory) = pyplot.subplots(1, 2, figsize=(10, 4))
+    for measure_name in MEASURES[:-1]:
+        times.loglog(values, [result[measure_name] for result in results], marker='o', label=measure_name)
+    times.set_xlabel(knob)
+    times.set_ylabel('seconds')
+    times.legend()
+    memory.loglog(values, [result['peak_memory_mb'] for result in results], marker='o')
+    memory.set_xlabel(knob)
+    memory.set_ylabel('peak memory (MB)')
+    figure.tight_layout()
+    path = os.path.join(directory, 'xbrl_scaling_{0}.png'.format(knob))
+    figure.savefig(path)
+    pyplot.close(figure)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scaling of the XBRL parsing with the shape of the document.')
+    parser.add_argument('--knobs', nargs='+', choices=list(KNOBS), default=list(KNOBS))
+    parser.add_argument('--steps', type=int, default=6, help='Number of doublings of each knob. Defaults to 6.')
+    parser.add_argument('--max-exponent', type=float, default=1.5,
+                        help='Growth exponent above which a measure is reported as superlinear. Defaults to 1.5.')
+    parser.add_argument('--plot', metavar='DIRECTORY', help='Save a plot of each knob in the directory.')
+    args = parser.parse_args(argv)
+
+    superlinear = []
+    directory = tempfile.mkdtemp()
+    try:
+        for knob in args.knobs:
+            values, sizes, results = scale(knob, args.steps, directory)
+
+            print('{0:>16}{1:>10}{2:>14}{3:>16}{4:>18}{5:>12}'.format(
+                knob, 'MB', 'XBRL() s', 'periods year s', 'periods quarter s', 'peak MB'))
+            for value, size, result in zip(values, sizes, results):
+                print('{0:>16}{1:>10.2f}{2:>14.4f}{3:>16.6f}{4:>18.6f}{5:>12.1f}'.format(
+                    value, size, result['construct'], result['periods_year'], result['periods_quarter'],
+                    result['peak_memory_mb']))
+
+            exponents = []
+            for measure_name in MEASURES:
+                exponent = growth_exponent(values, [result[measure_name] for result in results])
+                if exponent is None:
+                    continue
+                exponents.append('{0} {1:.2f}'.format(measure_name, exponent))
+                if exponent > args.max_exponent:
+                    superlinear.append('{0} grows as {1}^{2:.2f}'.format(measure_name, knob, exponent))
+            print('{0:>16}  {1}'.format('exponents', ', '.join(exponents)))
+
+            if args.plot:
+                os.makedirs(args.plot, exist_ok=True)
+                print('{0:>16}  {1}'.format('plot', plot(knob, values, results, args.plot)))
+            print('')
+    finally:
+        shutil.rmtree(directory)
+
+    for description in superlinear:
+        print('SUPERLINEAR ' + description)
+    if not superlinear:
+        print('Every measure grows at most as the knobs to the power {0}.'.format(args.max_exponent))
+    return 1 if superlinear else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
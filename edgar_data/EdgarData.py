@@ -1,4 +1,7 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 import re
 from time import sleep
 from urllib.parse import urlencode, urlparse, urlunparse
@@ -6,9 +9,36 @@ from urllib.parse import urlencode, urlparse, urlunparse
 import requests
 from bs4 import BeautifulSoup
 from requests import RequestException
-from lxml import html
 
+from .daily_index import DailyIndexNotFound, daily_index_path, daily_index_url, parse_index, read_index_file
+from .filing_index import DATA_FILES_TABLE, DOCUMENTS_TABLE, FilingIndex
+from .html_cleaner import clean_html
+from .instrumentation import (CLEAN_HTML, DOCUMENT, HTML_DOWNLOAD, INDEX, LISTING, STORED, XBRL_DOWNLOAD,
+                              active_stage, for_filing, stage)
+from .metrics import (CACHE_REQUESTS, DOWNLOADED_BYTES, FILINGS, FILINGS_SKIPPED, RATE_LIMIT_WAIT, REQUESTS,
+                      RETRIES, XBRL_FAILURES, registry)
+from .sections import index_sections
+from .store import StoredDocument
 from .xbrl import XBRL
+from .xbrl_inline import InlineXBRL, is_inline_xbrl
+
+
+accession_number_re = re.compile(r'\d{10}-\d{2}-\d{6}')
+
+# An exhibit of a filing. `document` is str for HTML and text documents, and bytes for the others, e.g. images
+# and PDFs, which are not decoded.
+Exhibit = namedtuple('Exhibit', ['url', 'type', 'size', 'document'])
+# Extensions of the documents read as text
+TEXT_EXTENSIONS = ('.htm', '.html', '.txt', '.xml')
+
+# A filing of the EDGAR company listing. `filing_date` is 'YYYY-MM-DD', or None if not listed.
+ListedFiling = namedtuple('ListedFiling', ['index_url', 'form_type', 'filing_date'])
+
+
+def accession_number(index_url):
+    """Accession number of a filing, e.g. '0000320193-17-000070', from the URL of its index page."""
+    match = accession_number_re.search(index_url)
+    return match.group() if match else None
 
 
 class EDGARRequestError(Exception):
@@ -31,24 +61,72 @@ class Filing10KNotFound(FilingNotFound):
     """Could not find a 10-K filing with the given constraints."""
 
 
-def requests_get_retry(url):
+class XBRLNotLoaded(Exception):
+    """The filing's XBRL document is not loaded, e.g. when its fields come from the cache."""
+
+
+def _get(url, rate_limiter, metrics):
+    if rate_limiter is not None:
+        waited = rate_limiter.acquire()
+        if metrics is not None and waited:
+            metrics.inc(RATE_LIMIT_WAIT, waited)
+    if metrics is None:
+        return requests.get(url)
+
     try:
         resp = requests.get(url)
+    except Exception:
+        metrics.inc(REQUESTS, status_class='error')
+        raise
+    metrics.inc(REQUESTS, status_class='{0}xx'.format(resp.status_code // 100))
+    return resp
+
+
+def requests_get_retry(url, rate_limiter=None, metrics=None):
+    try:
+        resp = _get(url, rate_limiter, metrics)
         resp.raise_for_status()
     except Exception:
         sleep(1)
-        resp = requests.get(url)
+        if metrics is not None:
+            metrics.inc(RETRIES)
+        resp = _get(url, rate_limiter, metrics)
         resp.raise_for_status()
+
+    if metrics is not None:
+        metrics.inc(DOWNLOADED_BYTES, len(resp.content))
     return resp
 
 
 class EdgarData:
 
-    def __init__(self, clean_html=False):
+    def __init__(self, clean_html=False, cache=None, store=None, index=None, rate_limiter=None, on_stage=None,
+                 metrics=registry):
         """
         :param clean_html: Defines whether the retrieved HTML files should be cleaned.
+        :param cache: Optional. Store of computed fields. Filings found in it are neither downloaded nor parsed again.
+        :param store: Optional. Store of documents. Downloaded documents are kept in it and not downloaded again,
+            and the HTML of the filings is read from it when accessed instead of being held in memory.
+        :param index: Optional. Full-text index the HTML of the filings is added to as they are fetched.
+        :param rate_limiter: Optional. Limits the rate of the requests to the SEC, and can be shared by several
+            EdgarData objects.
+        :param on_stage: Optional. Function receiving an `edgar_data.instrumentation.StageEvent` for each stage of
+            the retrieval of each filing: listing, downloads, HTML cleaning and XBRL parsing. Stages are not timed
+            without it.
+        :param metrics: Defaults to the registry of `edgar_data.metrics`. Counters of the requests, downloads,
+            cache lookups and filings. None to count nothing.
+        :type cache: edgar_data.cache.FundamentalsCache
+        :type store: edgar_data.store.DocumentStore
+        :type index: edgar_data.search.FullTextIndex
+        :type rate_limiter: edgar_data.throttle.RateLimiter
         """
         self.should_clean_html = clean_html
+        self.cache = cache
+        self.store = store
+        self.index = index
+        self.rate_limiter = rate_limiter
+        self.on_stage = on_stage
+        self.metrics = metrics
         self.edgar_url = "https://www.sec.gov/cgi-bin/browse-edgar"
         self.current_date_str = datetime.now().strftime("%Y-%m-%d")
 
@@ -74,7 +152,7 @@ class EdgarData:
         kwargs_without_Nones = {k: v for k, v in kwargs.items() if v is not None}
         url = self._generate_edgar_url(**kwargs_without_Nones)
         try:
-            resp = requests_get_retry(url)
+            resp = requests_get_retry(url, self.rate_limiter, self.metrics)
             resp.raise_for_status()
         except RequestException:
             raise EDGARRequestError
@@ -162,16 +240,190 @@ class EdgarData:
         all_filings = []
 
         for filing in self._get_all_filings_index_pages(cik, form_types, date_start, date_end):
-            text_url, filing_html, xbrl = self.retrieve(
-                index_url=filing['index_url'], form=filing['form'], tree=filing['tree'],
-                fetch_html=fetch_html, fetch_xbrl=fetch_xbrl)
+            all_filings.append(self._edgar_form(cik, filing, fetch_html, fetch_xbrl))
 
-            supplemental_links = self._supplemental_links(filing['tree'])
+        return all_filings
 
-            all_filings.append(
-                EdgarForm(filing_html, xbrl, cik, text_url, filing, supplemental_links))
+    def list_filings(self, cik, form_type, date_start=None, date_end=None):
+        """Lists the index URLs of a company's filings, without downloading them.
 
-        return all_filings
+        :param cik: Company's CIK.
+        :param form_type: Form type.
+        :param date_start: Optional. Date from.
+        :param date_end: Optional. Date to.
+        :type date_start: datetime
+        :type date_end: datetime
+        :return: Index URLs, to be passed to `get_filing`.
+        :rtype: list[str]
+        """
+        datea = date_start.strftime("%Y-%m-%d") if date_start else None
+        dateb = date_end.strftime("%Y-%m-%d") if date_end else None
+
+        return [filing_url for filing_url, filing_type in
+                self._get_filings_index_urls(cik.rjust(10, '0'), form_type, datea, dateb)
+                if filing_type == form_type]
+
+    def get_filing(self, cik, form_type, index_url, fetch_html=True, fetch_xbrl=True):
+        """Retrieves a single filing, from the URL of its index page.
+
+        :param cik: Company's CIK.
+        :param form_type: Form type.
+        :param index_url: URL of the filing index page, e.g. as listed by `list_filings`.
+        :param fetch_html: Defaults to True.
+        :param fetch_xbrl: Defaults to True.
+        :rtype: EdgarForm
+        """
+        cik = cik.rjust(10, '0')
+        return self._edgar_form(cik, self._get_filing(cik, form_type, index_url), fetch_html, fetch_xbrl)
+
+    def get_daily_index(self, date, form_types=None, directory=None):
+        """Lists the filings of every company disseminated on a day, from the EDGAR daily index.
+        One download replaces the queries of each company.
+
+        :param date: Day of the index.
+        :param form_types: Optional. List of form types to keep. Defaults to all forms.
+        :param directory: Optional. Local directory holding the daily index files, read instead of the network.
+        :type date: datetime
+        :return: The filings, to be passed to `get_filing`.
+        :rtype: list[edgar_data.daily_index.IndexedFiling]
+        :raises DailyIndexNotFound: if there is no index for the date, e.g. on weekends and holidays.
+        """
+        if directory is not None:
+            return read_index_file(daily_index_path(directory, date), form_types)
+
+        url = daily_index_url(date)
+        content = self.store.get_url(url) if self.store is not None else None
+        if content is None:
+            try:
+                resp = requests_get_retry(url, self.rate_limiter, self.metrics)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    raise DailyIndexNotFound(url)
+                raise EDGARRequestError
+            except RequestException:
+                raise EDGARRequestError
+
+            content = resp.content.decode('latin-1')
+            if self.store is not None:
+                self.store.put_url(url, content)
+
+        return parse_index(content, form_types)
+
+    def get_daily_form_data(self, date, form_types=None, fetch_html=True, fetch_xbrl=True, directory=None,
+                            failures=None):
+        """Retrieves the filings of every company disseminated on a day. Filings of other form types are not fetched.
+        A filing that can't be retrieved (`EDGARRequestError`, `ReportError` or `FilingNotFound`) is skipped and
+        counted in FILINGS_SKIPPED, so one failure doesn't lose the rest of the day. Other errors are raised.
+
+        :Example:
+
+        >>> failures = []
+        >>> filings = edgar.get_daily_form_data(datetime(2018, 2, 8), form_types=['10-K', '10-Q'], failures=failures)
+        >>> for filing, error in failures:  # e.g. to retry them later with get_filing
+        ...     print(filing.index_url, error)
+
+        :param date: Day of the filings.
+        :param form_types: Optional. List of form types to be downloaded. Defaults to all forms.
+        :param fetch_html: Defaults to True.
+        :param fetch_xbrl: Defaults to True.
+        :param directory: Optional. Local directory holding the daily index files, read instead of the network.
+        :param failures: Optional. List to which the filings skipped are appended, as tuples (IndexedFiling, exception).
+        :type date: datetime
+        :rtype: list(EdgarForm)
+        :raises DailyIndexNotFound: if there is no index for the date, e.g. on weekends and holidays.
+        """
+        if form_types is None:
+            form_types = ['10-K', '10-Q', '8-K', '20-F', '40-F', '6-K', 'S-1']
+
+        forms = []
+        for filing in self.get_daily_index(date, form_types, directory):
+            try:
+                forms.append(self.get_filing(filing.cik, filing.form_type, filing.index_url, fetch_html=fetch_html,
+                                             fetch_xbrl=fetch_xbrl))
+            except (EDGARRequestError, ReportError, FilingNotFound) as e:
+                if self.metrics is not None:
+                    self.metrics.inc(FILINGS_SKIPPED, error=type(e).__name__)
+                if failures is not None:
+                    failures.append((filing, e))
+
+        return forms
+
+    def sync(self, cik, state, form_types=None, date_start=None, fetch_html=True, fetch_xbrl=True):
+        """Retrieves the filings of a company newer than the ones synced before, and moves its watermarks forward.
+        Only the filings at or after the watermark date are listed, so the cost of a sync is proportional to the
+        number of new filings.
+
+        :Example:
+
+        >>> state = SyncState('sync.db')
+        >>> new_filings = edgar.sync('0000320193', state, form_types=['10-K', '10-Q'], date_start=datetime(2015, 1, 1))
+
+        :param cik: Company's CIK.
+        :param state: Watermarks of the filings already synced.
+        :param form_types: Optional. List of form types to be synced. Defaults to all forms.
+        :param date_start: Optional. Date from, for the form types never synced before. Required if there are any.
+        :param fetch_html: Defaults to True.
+        :param fetch_xbrl: Defaults to True.
+        :type state: edgar_data.sync.SyncState
+        :type date_start: datetime
+        :return: The new filings, oldest first.
+        :rtype: list(EdgarForm)
+        """
+        if form_types is None:
+            form_types = ['10-K', '10-Q', '8-K', '20-F', '40-F', '6-K', 'S-1']
+
+        cik = cik.rjust(10, '0')
+
+        new_filings = []
+        for form_type in form_types:
+            watermark = state.get(cik, form_type)
+            if watermark is not None:
+                datea = watermark.filing_date
+            elif date_start is not None:
+                datea = date_start.strftime("%Y-%m-%d")
+            else:
+                raise ValueError('Please provide a date_start to sync {0} {1} filings for the first time.'.format(
+                    cik, form_type))
+
+            # Listed newest first: fetched oldest first, so the watermark only moves forward
+            listed = [filing for filing in self._list_company_filings(cik, form_type, datea, None)
+                      if filing.form_type == form_type and state.is_new(cik, form_type, filing.filing_date,
+                                                                        accession_number(filing.index_url))]
+            for filing in reversed(listed):
+                form = self._edgar_form(cik, self._get_filing(cik, form_type, filing.index_url), fetch_html,
+                                        fetch_xbrl)
+                state.advance(cik, form_type, form.filing_date.strftime("%Y-%m-%d"), form.accession_number)
+                new_filings.append(form)
+
+        return new_filings
+
+    def _edgar_form(self, cik, filing, fetch_html, fetch_xbrl):
+        cached_fields = None
+        if self.cache is not None and fetch_xbrl:
+            cached_fields = self.cache.get(filing['accession_number'])
+            if self.metrics is not None:
+                self.metrics.inc(CACHE_REQUESTS, cache='fundamentals', result='miss' if cached_fields is None else 'hit')
+
+        text_url, filing_html, xbrl = self.retrieve(
+            index_url=filing['index_url'], form=filing['form'], filing_index=filing['index'],
+            fetch_html=fetch_html, fetch_xbrl=fetch_xbrl and cached_fields is None)
+
+        if self.cache is not None and xbrl is not None:
+            self.cache.put(filing['accession_number'], xbrl.fields, cik=cik, form=filing['form'],
+                           period_of_report=filing['period_of_report'], filing_date=filing['filing_date'])
+
+        if self.store is not None and filing_html is not None:
+            filing_html = StoredDocument(self.store, self.store.put(filing_html))
+
+        supplemental_links = self._supplemental_links(filing['index'])
+
+        form = EdgarForm(filing_html, xbrl, cik, text_url, filing, supplemental_links, fields=cached_fields)
+        if self.index is not None:
+            self.index.add(form)
+        if self.metrics is not None:
+            self.metrics.inc(FILINGS, form_type=filing['form'])
+
+        return form
 
     def _get_all_filings_index_pages(self, cik, form_types, datea, dateb):
         if datea:
@@ -183,7 +435,14 @@ class EdgarData:
             yield from self._get_filing_index_page(cik, form, datea, dateb)
 
     def _get_filings_index_urls(self, cik, filing_type, datea, dateb):
-        resp = self._request_edgar(CIK=cik, type=filing_type, datea=datea, dateb=dateb)
+        for filing in self._list_company_filings(cik, filing_type, datea, dateb):
+            yield filing.index_url, filing.form_type
+
+    def _list_company_filings(self, cik, filing_type, datea, dateb):
+        with stage(self.on_stage, LISTING) as listing:
+            resp = self._request_edgar(CIK=cik, type=filing_type, datea=datea, dateb=dateb)
+            listing.url = resp.url
+            listing.bytes = len(resp.content)
         soup = BeautifulSoup(resp.content, 'lxml-xml')
 
         if soup.findAll(text=re.compile("No matching", re.IGNORECASE)):
@@ -201,7 +460,8 @@ class EdgarData:
         for filing_link in filing_links:
             url = filing_link.string
             form_type = filing_link.parent.type.string
-            yield url, form_type
+            date_filed = filing_link.parent.dateFiled
+            yield ListedFiling(url, form_type, date_filed.string if date_filed is not None else None)
 
     def _get_filing_index_page(self, cik, form, datea, dateb):
 
@@ -209,58 +469,139 @@ class EdgarData:
             if filing_type != form:
                 continue
 
-            r = requests_get_retry(filing_url)
-
-            tree = html.fromstring(r.content)
+            yield self._get_filing(cik, form, filing_url)
 
-            period_of_report = tree.xpath("//*[contains(text(),'Period of Report')]/following-sibling::div/text()")
-            if period_of_report:
-                period_of_report = period_of_report[0]
+    def _get_filing(self, cik, form, filing_url):
+        with stage(self.on_stage, INDEX, accession_number(filing_url), filing_url) as download:
+            r = requests_get_retry(filing_url, self.rate_limiter, self.metrics)
+            download.bytes = len(r.content)
 
-            filing_date = tree.xpath("//*[contains(text(),'Filing Date')]/following-sibling::div[1]/text()")
-            if filing_date:
-                filing_date = filing_date[0]
+        filing_index = FilingIndex.from_html(r.content, filing_url)
+        period_of_report = filing_index.period_of_report
+        filing_date = filing_index.filing_date
 
-            if (not period_of_report and form != 'S-1') or not filing_date:
-                raise ReportError('Something wrong happened when fetching {0} {1} filing.'.format(cik, form))
+        if (not period_of_report and form != 'S-1') or not filing_date:
+            raise ReportError('Something wrong happened when fetching {0} {1} filing.'.format(cik, form))
 
-            yield {'form': form, 'index_url': filing_url, 'tree': tree,
-                   'period_of_report': period_of_report, 'filing_date': filing_date}
+        return {'form': form, 'index_url': filing_url, 'index': filing_index,
+                'period_of_report': period_of_report, 'filing_date': filing_date,
+                'accession_number': accession_number(filing_url)}
 
     def _retrieve_document(self, url):
+        if self.store is not None:
+            document = self.store.get_url(url)
+            if self.metrics is not None:
+                self.metrics.inc(CACHE_REQUESTS, cache='documents', result='miss' if document is None else 'hit')
+            if document is not None:
+                if self.on_stage is not None:
+                    download = active_stage()
+                    download.outcome = STORED
+                    download.bytes = 0
+                return document
+
         try:
-            resp = requests_get_retry(url)
+            resp = requests_get_retry(url, self.rate_limiter, self.metrics)
             resp.raise_for_status()
         except RequestException:
             raise EDGARRequestError
+        if self.on_stage is not None:
+            active_stage().bytes = len(resp.content)
+
+        if self.store is not None:
+            self.store.put_url(url, resp.text)
 
         return resp.text
 
-    def retrieve(self, index_url, form, tree, fetch_html, fetch_xbrl):
+    def retrieve(self, index_url, form, filing_index, fetch_html, fetch_xbrl):
         filing = None
         xbrl = None
+        full_filing_doc = None
 
-        text_url = self._html_url(form, tree, index_url)
+        number = accession_number(index_url)
+        text_url = self._html_url(form, filing_index, index_url)
         if fetch_html:
-            full_filing_doc = self._retrieve_document(text_url)
-            filing = self._clean_html(full_filing_doc)
+            with stage(self.on_stage, HTML_DOWNLOAD, number, text_url):
+                full_filing_doc = self._retrieve_document(text_url)
+            with stage(self.on_stage, CLEAN_HTML, number, text_url) as cleaning:
+                cleaning.bytes = len(full_filing_doc)
+                filing = self._clean_html(full_filing_doc)
 
         if fetch_xbrl and form in ('10-K', '10-Q', '20-F', '40-F'):
+            if full_filing_doc is not None and is_inline_xbrl(full_filing_doc):
+                # The facts are tagged in the primary document, which has already been downloaded
+                return text_url, filing, InlineXBRL(full_filing_doc.encode(), metrics=self.metrics,
+                                                    on_stage=for_filing(self.on_stage, number, text_url))
+
             try:
-                xbrl_url = self._xbrl_url(tree, index_url)
-                xbrl_doc = self._retrieve_document(xbrl_url)
+                xbrl_url = self._xbrl_url(filing_index, index_url)
+                with stage(self.on_stage, XBRL_DOWNLOAD, number, xbrl_url):
+                    xbrl_doc = self._retrieve_document(xbrl_url)
 
                 # If using the python-xbrl library (this actually doesn't work, as every info is filled as 0.0):
                 #xbrl_parser = XBRLParser(precision=0)
                 #xbrl = xbrl_parser.parse(io.StringIO(xbrl_doc))
                 #gaap = xbrl_parser.parseGAAP(xbrl, ...)
 
-                xbrl = XBRL(xbrl_doc.encode())
+                xbrl = XBRL(xbrl_doc.encode(), metrics=self.metrics,
+                            on_stage=for_filing(self.on_stage, number, xbrl_url))
             except FilingNotFound:
-                xbrl = None
+                # No instance document: the facts may only be tagged inline, and the index then still lists
+                # the other XBRL files, e.g. the schema (EX-101.SCH). Filings without any, e.g. those filed
+                # before XBRL, are not downloaded only to find no tags.
+                if filing_index.data_files:
+                    if full_filing_doc is None:
+                        with stage(self.on_stage, HTML_DOWNLOAD, number, text_url):
+                            full_filing_doc = self._retrieve_document(text_url)
+                    if is_inline_xbrl(full_filing_doc):
+                        xbrl = InlineXBRL(full_filing_doc.encode(), metrics=self.metrics,
+                                          on_stage=for_filing(self.on_stage, number, text_url))
+                if xbrl is None and self.metrics is not None:
+                    self.metrics.inc(XBRL_FAILURES, error='FilingNotFound')
 
         return text_url, filing, xbrl
 
+    def get_exhibits(self, filing, exhibit_types, max_size=None, max_workers=4):
+        """Downloads the exhibits of a filing concurrently, e.g. the subsidiaries list (EX-21) of a 10-K.
+
+        :Example:
+
+        >>> for exhibit in edgar.get_exhibits(filing, ['EX-21', 'EX-99'], max_size=1000000):
+        ...     print(exhibit.type, len(exhibit.document))
+
+        :param filing: The filing.
+        :param exhibit_types: Exhibit types, e.g. ['EX-21']. 'EX-99' also selects 'EX-99.1', 'EX-99.2', etc.
+        :param max_size: Optional. Size in bytes above which documents are skipped, as listed in the filing index.
+        :param max_workers: Defaults to 4. Number of concurrent downloads.
+        :type filing: EdgarForm
+        :return: The exhibits, in the order of the filing index. HTML and text documents are given as str,
+            the others, e.g. images and PDFs, as bytes.
+        :rtype: list[Exhibit]
+        """
+        links = filing.exhibit_links(exhibit_types, max_size)
+        if not links:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(links))) as executor:
+            documents = list(executor.map(partial(self._retrieve_exhibit, filing.accession_number),
+                                          [url for url, _, _ in links]))
+
+        return [Exhibit(url, exhibit_type, size, document)
+                for (url, exhibit_type, size), document in zip(links, documents)]
+
+    def _retrieve_exhibit(self, number, url):
+        with stage(self.on_stage, DOCUMENT, number, url) as download:
+            if urlparse(url).path.lower().endswith(TEXT_EXTENSIONS):
+                return self._retrieve_document(url)
+
+            # Binary documents are neither decoded nor kept in the document store, which only holds text
+            try:
+                resp = requests_get_retry(url, self.rate_limiter, self.metrics)
+                resp.raise_for_status()
+            except RequestException:
+                raise EDGARRequestError
+            download.bytes = len(resp.content)
+            return resp.content
+
     def get_supplemental_links_from_html_url(self, url):
         """Retrieves all supplemental links. The url passed can be any document url. The convention followed
         to retrieve the index url is detailed on: https://www.sec.gov/edgar/searchedgar/accessing-edgar-data.htm
@@ -288,92 +629,35 @@ class EdgarData:
         url_parts[2] = '/'.join(path)
         url = urlunparse(url_parts)
 
-        r = requests_get_retry(url)
-        tree = html.fromstring(r.content)
-
-        return self._supplemental_links(tree)
-
-    def _insert_sec_url(self, relative_url):
-        url_parts = list(urlparse(relative_url))
-        url_parts[0] = 'https'
-        url_parts[1] = 'www.sec.gov'
-        url = urlunparse(url_parts)
-
-        return url
+        r = requests_get_retry(url, self.rate_limiter, self.metrics)
 
-    def _supplemental_links(self, tree):
-        documents = tree.xpath('//*[@id="formDiv"]//table[@summary="Document Format Files"]//tr')
+        return self._supplemental_links(FilingIndex.from_html(r.content, url))
 
-        try:
-            docs = []
-            types = []
-            sizes = []
-
-            for idx, col in enumerate(documents[0].getchildren()):
-                col_text = col.text
-
-                if col_text == 'Document':
-                    docs = [self._insert_sec_url(doc.find('a').attrib['href'])
-                            for doc in (line.getchildren()[idx] for line in documents[1:])]
-                elif col_text == 'Type':
-                    types = [typ.text
-                             for typ in (line.getchildren()[idx] for line in documents[1:])]
-                elif col_text == 'Size':
-                    sizes = [siz.text
-                             for siz in (line.getchildren()[idx] for line in documents[1:])]
-
-            links = list(zip(docs, types, sizes))
-        except:
-            links = []
+    def _supplemental_links(self, filing_index):
+        return filing_index.supplemental_links
 
-        return links
-
-    def _document_url(self, table_summary, file_description, tree, index_url):
-        # link is relative (i.e. /Archives/edgar/data/... )
-        link = tree.xpath('//*[@id="formDiv"]//table[@summary="{0}"]'
-                               '//*[contains(text(),"{1}")]/..//a/@href'.format(table_summary, file_description))
-        if not link:
+    def _document_url(self, table_summary, file_description, filing_index, index_url):
+        document = filing_index.find(file_description, table_summary)
+        if document is None:
             raise FilingNotFound('Could not find the file (type: {0}) at {1}'.format(file_description, index_url))
 
-        # Safely insert https://www.sec.gov in the link
-        url_parts = list(urlparse(link[0]))
-        url_parts[0] = 'https'
-        url_parts[1] = 'www.sec.gov'
-        url = urlunparse(url_parts)
-
-        return url
+        return document.url
 
-    def _html_url(self, form, tree, index_url):
-        return self._document_url(table_summary="Document Format Files",
+    def _html_url(self, form, filing_index, index_url):
+        return self._document_url(table_summary=DOCUMENTS_TABLE,
                                   file_description=form,
-                                  tree=tree,
+                                  filing_index=filing_index,
                                   index_url=index_url)
 
-    def _xbrl_url(self, tree, index_url):
-        return self._document_url(table_summary="Data Files",
+    def _xbrl_url(self, filing_index, index_url):
+        return self._document_url(table_summary=DATA_FILES_TABLE,
                                   file_description="EX-101.INS",
-                                  tree=tree,
+                                  filing_index=filing_index,
                                   index_url=index_url)
 
     def _clean_html(self, content):
         if self.should_clean_html:
-            font_tags = re.compile(r'(<(font|FONT).*?>|</(font|FONT)>)')
-            style_attrs = re.compile(r'('
-                                     r'((style|STYLE)=\".*?\")|'
-                                     r'((valign|VALIGN)=\".*?\")|'
-                                     r'((align|ALIGN)=\".*?\")|'
-                                     r'((width|WIDTH)=\".*?\")|'
-                                     r'((height|HEIGHT)=\".*?\")|'
-                                     r'((border|BORDER)=\".*?\")|'
-                                     r'((cellpadding|CELLPADDING)=\".*?\")|'
-                                     r'((cellspacing|CELLSPACING)=\".*?\")|'
-                                     r'((size|SIZE)=\".*?\")|'
-                                     r'((colspan|COLSPAN)=\".*?\")'
-                                     r')')
-            no_font = re.sub(font_tags, '', content)
-            no_style = re.sub(style_attrs, '', no_font)
-
-            return no_style
+            return clean_html(content)
         else:
             return content
 
@@ -384,7 +668,7 @@ class UnknownFilingType(Exception):
 
 class EdgarForm:
     """
-    :ivar html: Filing cleaned HTML.
+    :ivar html: Filing cleaned HTML. Read from the document store on each access when the filing was stored.
     :ivar xbrl: Filing XBRL object.
     :ivar fields: XBRL fields dictionary.
     :ivar ticker: Company ticker.
@@ -394,26 +678,32 @@ class EdgarForm:
     :ivar period_end_date: Period of report end date.
     :ivar filing_date: Filing date.
     :ivar index_url: URL for the filing index.
+    :ivar accession_number: Filing accession number.
     :ivar text_url: URL for the filing HTML file.
+    :ivar sections: Item sections of the HTML, indexed on first access. Only their offsets are kept: when the HTML is
+        stored, `section` reads it once per call and slices it.
     """
 
-    def __init__(self, html, xbrl, cik, text_url, filing, supplemental_links):
+    def __init__(self, html, xbrl, cik, text_url, filing, supplemental_links, fields=None):
         """Filing class. Access XBRL data through the `xbrl` attribute.
         See pysec XBRL class for more details on how to get DEI or GAAP data.
+        When the fields come from a cache, they are passed as `fields` and `xbrl` is None: test `fields` rather
+        than `xbrl` to know whether a filing has fundamentals.
 
         :Example:
 
         >>> filing = EdgarForm(...)
         >>> filing.fields['TradingSymbol']  # returns the ticker
         """
-        self.html = html  # type: str
+        self.html = html  # type: str | StoredDocument
         self.xbrl = xbrl  # type: XBRL
 
-        self.fields = None  # type: dict
+        self.fields = fields  # type: dict
         self.ticker = None  # type: str
         self.fiscal_period_focus = None
         if xbrl:
             self.fields = xbrl.fields
+        if self.fields is not None:
             self.ticker = self.fields['TradingSymbol']
             self.fiscal_period_focus = self.fields['DocumentFiscalPeriodFocus']
             self.fiscal_year_focus = self.fields['DocumentFiscalYearFocus']
@@ -430,11 +720,80 @@ class EdgarForm:
         self.filing_date = datetime.strptime(filing['filing_date'],
                                              "%Y-%m-%d")  # type: datetime
         self.index_url = filing['index_url']  # type: str
+        self.accession_number = filing.get('accession_number')  # type: str
         self.text_url = text_url  # type: str
 
+    @property
+    def html(self):
+        if isinstance(self._html, StoredDocument):
+            return self._html.read()
+        return self._html
+
+    @html.setter
+    def html(self, html):
+        self._html = html
+        self._sections = None
+
+    @property
+    def sections(self):
+        """
+        :rtype: list[edgar_data.sections.Section]
+        """
+        if self._sections is None:
+            html = self.html
+            self._sections = index_sections(html) if html else []
+        return self._sections
+
+    def section(self, item, part=None):
+        """HTML of an Item section, e.g. '1A' for the risk factors of a 10-K or '7' for the MD&A.
+
+        :param item: Item, e.g. '1A'.
+        :param part: Optional. Part, as a roman numeral. Needed for the items of a 10-Q, numbered again in each part.
+        :return: The section, or None if the HTML has no such section.
+        :rtype: str
+        """
+        item = item.upper()
+        for section in self.sections:
+            if section.item == item and (part is None or section.part == part.upper()):
+                return self.html[section.start:section.end]
+        return None
+
+    def exhibit_links(self, exhibit_types, max_size=None):
+        """Selects exhibits among the supplemental links, without downloading anything.
+
+        :param exhibit_types: Exhibit types, e.g. ['EX-21']. 'EX-99' also selects 'EX-99.1', 'EX-99.2', etc.
+        :param max_size: Optional. Size in bytes above which documents are skipped. Documents of unknown size are kept.
+        :return: List of tuples (link, type, size), size in bytes or None.
+        """
+        exhibit_types = {exhibit_type.upper() for exhibit_type in exhibit_types}
+
+        links = []
+        for link, link_type, size in self.supplemental_links or []:
+            link_type = (link_type or '').strip().upper()
+            if link_type not in exhibit_types and link_type.partition('.')[0] not in exhibit_types:
+                continue
+
+            size = re.sub(r'\D', '', size or '')
+            size = int(size) if size else None
+            if max_size is not None and size is not None and size > max_size:
+                continue
+
+            links.append((link, link_type, size))
+
+        return links
+
     def set_period(self, this_year=False, this_quarter=False):
+        """Loads the fields of the year or of the quarter (to date) from the XBRL.
+
+        :raises XBRLNotLoaded: if the filing has no XBRL, e.g. when its fields were read from the cache.
+        """
         if not (this_year != this_quarter):
             raise ValueError("Set either this_year or this_quarter.")
+        if self.xbrl is None:
+            if self.fields is not None:
+                raise XBRLNotLoaded('The fields of {0} were read from the cache, without the XBRL needed to change '
+                                    'their period: retrieve it with an EdgarData without cache.'.format(self))
+            raise XBRLNotLoaded('{0} has no XBRL.'.format(self))
 
         if this_year:
             self.xbrl.loadYear(0, quarter=False)
@@ -1,3 +1,5 @@
+__version__ = '0.2.10'
+
 from .EdgarData import EdgarData
 
 __all__ = [EdgarData]
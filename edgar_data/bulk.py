@@ -0,0 +1,500 @@
+"""Resumable bulk download of the filings of many companies.
+
+The job keeps a manifest (a SQLite database in the output directory) of the companies listed and of every filing,
+pending, done or failed. Running the job again resumes it: companies already listed are not listed again, and
+filings already done are not downloaded again.
+
+    $ edgar-data-bulk filings/ --ciks 320193 789019 --tickers IBM --forms 10-K 10-Q --date-start 2015-01-01
+
+Large jobs can be split into shards, each one a deterministic subset of the companies with its own manifest, and run
+by several processes or machines writing to the same output directory. All the processes of a host share one request
+budget through a lock file. The number of shards is recorded in `job.json`: every run of the job must split it
+the same way. The results of the shards are merged into `filings.jsonl`.
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from .EdgarData import EdgarData, accession_number
+from .throttle import DEFAULT_LOCK_PATH, SEC_MAX_REQUESTS_PER_SECOND, RateLimiter, SharedRateLimiter
+from .xbrl import Field
+
+PENDING = 'pending'
+LISTED = 'listed'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_FORM_TYPES = ['10-K', '10-Q']
+
+MERGED_FILE = 'filings.jsonl'
+LAYOUT_FILE = 'job.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS companies (
+    identifier TEXT PRIMARY KEY,
+    cik TEXT,
+    status TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS filings (
+    accession_number TEXT PRIMARY KEY,
+    cik TEXT NOT NULL,
+    form TEXT NOT NULL,
+    index_url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    output TEXT
+);
+CREATE INDEX IF NOT EXISTS filings_status ON filings (status);
+"""
+
+
+class BulkJobError(Exception):
+    """The job can't be run, e.g. its output directory holds a job with other settings."""
+
+
+def filing_record(form):
+    """JSON-serializable summary of a filing and its fields.
+
+    :type form: edgar_data.EdgarData.EdgarForm
+    :rtype: dict
+    """
+    fields = {}
+    currencies = {}
+    if form.fields is not None:
+        for name, value in form.fields.fields.items():
+            if isinstance(value, Field):
+                fields[name] = value.value
+                currency = value.currency
+                if currency is not None:
+                    currencies[name] = currency.code
+            else:
+                fields[name] = value
+
+    return {
+        'accession_number': form.accession_number,
+        'cik': form.cik,
+        'form_type': form.form_type,
+        'period_end_date': form.period_end_date.strftime('%Y-%m-%d') if form.period_end_date else None,
+        'filing_date': form.filing_date.strftime('%Y-%m-%d') if form.filing_date else None,
+        'index_url': form.index_url,
+        'text_url': form.text_url,
+        'fields': fields,
+        'currencies': currencies,
+    }
+
+
+def shard_of(identifier, shard_count):
+    """Shard of a company, the same in every process and on every machine.
+
+    :param identifier: CIK, with or without leading zeros, or ticker.
+    :rtype: int
+    """
+    key = identifier.lstrip('0') if identifier.isdigit() else identifier.upper()
+    return zlib.crc32(key.encode('utf-8')) % shard_count
+
+
+def manifest_path(output_dir, shard=None):
+    if shard is None:
+        return os.path.join(output_dir, 'manifest.db')
+    return os.path.join(output_dir, 'manifest-{0}-of-{1}.db'.format(*shard))
+
+
+def manifest_paths(output_dir, shard_count):
+    """Manifests of every shard of a job split into `shard_count` shards."""
+    if shard_count == 1:
+        return [manifest_path(output_dir)]
+    return [manifest_path(output_dir, (index, shard_count)) for index in range(shard_count)]
+
+
+def read_layout(output_dir):
+    """
+    :return: Number of shards of the job of the directory, or None if no job has been run in it.
+    :rtype: int
+    """
+    try:
+        with open(os.path.join(output_dir, LAYOUT_FILE)) as f:
+            return json.load(f)['shard_count']
+    except FileNotFoundError:
+        return None
+
+
+def check_layout(output_dir, shard_count):
+    """Records the number of shards of the job of the directory, or checks it against the one recorded,
+    so that a job is never resumed with another split, which would list and download every filing again.
+
+    :raises BulkJobError: if the job of the directory is split into another number of shards.
+    """
+    recorded = read_layout(output_dir)
+    if recorded is None:
+        expected = set(manifest_paths(output_dir, shard_count))
+        others = [path for path in glob.glob(os.path.join(output_dir, 'manifest*.db')) if path not in expected]
+        if others:
+            raise BulkJobError('{0} holds the manifests of a job split in another way: {1}'.format(
+                output_dir, ', '.join(sorted(os.path.basename(path) for path in others))))
+
+        # Linked into place, so that of the processes starting the job at once, only one records the layout
+        descriptor, temporary = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                json.dump({'shard_count': shard_count}, f)
+            os.link(temporary, os.path.join(output_dir, LAYOUT_FILE))
+            recorded = shard_count
+        except FileExistsError:
+            recorded = read_layout(output_dir)
+        finally:
+            os.remove(temporary)
+
+    if recorded != shard_count:
+        raise BulkJobError('{0} holds a job split into {1} shards, not {2}: run it with --shard-count times '
+                           '--processes equal to {1}.'.format(output_dir, recorded, shard_count))
+
+
+def _write(path, data):
+    # Own temporary file per write, as filings are written from several threads
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+class BulkJob:
+    """Downloads the filings of many companies into a directory, keeping track of what has been done.
+
+    Each filing is written to `<output_dir>/<cik>/<accession number>.json`, with its HTML next to it
+    as `<accession number>.htm` when fetched.
+
+    :Example:
+
+    >>> job = BulkJob('filings', ['320193', 'IBM'], date_start=datetime(2015, 1, 1), form_types=['10-K'])
+    >>> job.run()
+    {'pending': 0, 'done': 12, 'failed': 0}
+    """
+
+    def __init__(self, output_dir, identifiers, date_start=None, date_end=None, form_types=None, fetch_html=True,
+                 fetch_xbrl=True, workers=4, rate=SEC_MAX_REQUESTS_PER_SECOND, rate_limiter=None, shard=None,
+                 edgar=None):
+        """
+        :param output_dir: Directory of the results and of the manifest. Created if it doesn't exist.
+        :param identifiers: CIKs or tickers of the companies.
+        :param date_start: Optional. Filing date from.
+        :param date_end: Optional. Filing date to.
+        :param form_types: Optional. Defaults to ['10-K', '10-Q'].
+        :param fetch_html: Defaults to True.
+        :param fetch_xbrl: Defaults to True.
+        :param workers: Defaults to 4. Number of concurrent downloads.
+        :param rate: Defaults to 10. Maximum number of requests per second.
+        :param rate_limiter: Optional. Limiter shared with other jobs, bypassing `rate`.
+        :param shard: Optional. Tuple (index, count): only the companies of shard `index` out of `count` are
+            downloaded, and the job has a manifest of its own.
+        :param edgar: Optional. EdgarData used for the requests, bypassing `rate` and `rate_limiter`.
+        :type date_start: datetime
+        :type date_end: datetime
+        :type rate_limiter: RateLimiter | SharedRateLimiter
+        :type edgar: EdgarData
+        """
+        if date_start is None and date_end is None:
+            raise ValueError('Provide either a date_start or a date_end.')
+        if shard is not None and not 0 <= shard[0] < shard[1]:
+            raise ValueError('Invalid shard {0} of {1}.'.format(*shard))
+
+        self.output_dir = output_dir
+        self.shard = shard
+        self.identifiers = [identifier for identifier in identifiers
+                            if shard is None or shard_of(identifier, shard[1]) == shard[0]]
+        self.date_start = date_start
+        self.date_end = date_end
+        self.form_types = list(form_types or DEFAULT_FORM_TYPES)
+        self.fetch_html = fetch_html
+        self.fetch_xbrl = fetch_xbrl
+        self.workers = workers
+        self.edgar = edgar or EdgarData(rate_limiter=rate_limiter or RateLimiter(rate))
+
+        os.makedirs(output_dir, exist_ok=True)
+        check_layout(output_dir, 1 if shard is None else shard[1])
+        self.connection = sqlite3.connect(manifest_path(output_dir, shard))
+        self.connection.executescript(SCHEMA)
+        self._check_settings()
+
+        with self.connection:
+            self.connection.executemany('INSERT OR IGNORE INTO companies (identifier, status) VALUES (?, ?)',
+                                        [(identifier, PENDING) for identifier in self.identifiers])
+
+    def run(self, retry_failed=False):
+        """Lists the filings of the companies not listed yet, then downloads the pending filings.
+
+        :param retry_failed: Defaults to False. Whether to retry the companies and filings that failed before.
+        :return: Number of filings by status.
+        :rtype: dict[str, int]
+        """
+        self.list_filings(retry_failed)
+        self.fetch_filings(retry_failed)
+        return self.status()
+
+    def list_filings(self, retry_failed=False):
+        statuses = (PENDING, FAILED) if retry_failed else (PENDING,)
+        identifiers = [row[0] for row in self.connection.execute(
+            'SELECT identifier FROM companies WHERE status IN ({0}) ORDER BY identifier'.format(
+                ', '.join('?' * len(statuses))), statuses)]
+
+        for identifier, outcome in self._map(self._list_company, identifiers):
+            with self.connection:
+                if isinstance(outcome, Exception):
+                    self.connection.execute('UPDATE companies SET status = ?, error = ? WHERE identifier = ?',
+                                            (FAILED, repr(outcome), identifier))
+                    continue
+
+                cik, index_urls = outcome
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO filings (accession_number, cik, form, index_url, status) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(accession_number, cik, form, index_url, PENDING) for accession_number, form, index_url
+                     in index_urls])
+                self.connection.execute('UPDATE companies SET cik = ?, status = ?, error = NULL WHERE identifier = ?',
+                                        (cik, LISTED, identifier))
+
+    def fetch_filings(self, retry_failed=False):
+        statuses = (PENDING, FAILED) if retry_failed else (PENDING,)
+        filings = self.connection.execute(
+            'SELECT accession_number, cik, form, index_url FROM filings WHERE status IN ({0}) '
+            'ORDER BY accession_number'.format(', '.join('?' * len(statuses))), statuses).fetchall()
+
+        for filing, outcome in self._map(self._fetch_filing, filings):
+            with self.connection:
+                if isinstance(outcome, Exception):
+                    self.connection.execute(
+                        'UPDATE filings SET status = ?, attempts = attempts + 1, error = ? '
+                        'WHERE accession_number = ?', (FAILED, repr(outcome), filing[0]))
+                else:
+                    self.connection.execute(
+                        'UPDATE filings SET status = ?, attempts = attempts + 1, error = NULL, output = ? '
+                        'WHERE accession_number = ?', (DONE, outcome, filing[0]))
+
+    def status(self):
+        """
+        :return: Number of filings by status.
+        :rtype: dict[str, int]
+        """
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        counts.update(self.connection.execute('SELECT status, COUNT(*) FROM filings GROUP BY status'))
+        return counts
+
+    def close(self):
+        self.connection.close()
+
+    def _check_settings(self):
+        settings = {
+            'date_start': self.date_start.strftime('%Y-%m-%d') if self.date_start else None,
+            'date_end': self.date_end.strftime('%Y-%m-%d') if self.date_end else None,
+            'form_types': ','.join(self.form_types),
+            'fetch_html': str(self.fetch_html),
+            'fetch_xbrl': str(self.fetch_xbrl),
+        }
+        stored = dict(self.connection.execute('SELECT name, value FROM settings'))
+        if not stored:
+            with self.connection:
+                self.connection.executemany('INSERT INTO settings (name, value) VALUES (?, ?)', settings.items())
+        elif stored != settings:
+            raise BulkJobError('{0} holds a job with other settings: {1}'.format(self.output_dir, stored))
+
+    def _map(self, function, items):
+        """Applies `function` to the items on the workers, yielding (item, result or exception) as they complete."""
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(function, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = e
+                yield futures[future], outcome
+
+    def _list_company(self, identifier):
+        if identifier.isdigit():
+            cik = identifier.rjust(10, '0')
+        else:
+            cik = self.edgar.get_cik(ticker=identifier)
+
+        index_urls = []
+        for form in self.form_types:
+            for index_url in self.edgar.list_filings(cik, form, self.date_start, self.date_end):
+                index_urls.append((accession_number(index_url) or index_url, form, index_url))
+        return cik, index_urls
+
+    def _fetch_filing(self, filing):
+        accession_number, cik, form_type, index_url = filing
+        form = self.edgar.get_filing(cik, form_type, index_url, fetch_html=self.fetch_html,
+                                     fetch_xbrl=self.fetch_xbrl)
+
+        directory = os.path.join(self.output_dir, cik)
+        os.makedirs(directory, exist_ok=True)
+        if form.html is not None:
+            _write(os.path.join(directory, accession_number + '.htm'), form.html.encode('utf-8'))
+
+        path = os.path.join(directory, accession_number + '.json')
+        _write(path, json.dumps(filing_record(form), sort_keys=True).encode('utf-8'))
+        return os.path.relpath(path, self.output_dir)
+
+
+def run_shard(shard, output_dir, identifiers, lock_path=DEFAULT_LOCK_PATH, rate=SEC_MAX_REQUESTS_PER_SECOND,
+              retry_failed=False, **kwargs):
+    """Runs one shard of a job, drawing from the request budget of the host. Used as the target of worker processes.
+
+    :param shard: Tuple (index, count), or None for the whole job.
+    :param lock_path: Lock file of the host's request budget.
+    :param rate: Maximum number of requests per second, for the whole host.
+    :param kwargs: Other arguments of BulkJob.
+    :return: Number of filings of the shard by status.
+    :rtype: dict[str, int]
+    """
+    job = BulkJob(output_dir, identifiers, rate_limiter=SharedRateLimiter(lock_path, rate), shard=shard, **kwargs)
+    try:
+        return job.run(retry_failed=retry_failed)
+    finally:
+        job.close()
+
+
+def merge(output_dir):
+    """Merges the filings downloaded by every shard of a job into `<output_dir>/filings.jsonl`, one JSON record
+    per line, ordered by CIK and accession number. Only the manifests of the shards recorded in `job.json` are read.
+
+    :return: Number of filings by status, over all the shards. Shards not run yet have no filings.
+    :rtype: dict[str, int]
+    :raises BulkJobError: if no job has been run in the directory.
+    """
+    shard_count = read_layout(output_dir)
+    if shard_count is None:
+        raise BulkJobError('{0} holds no job.'.format(output_dir))
+
+    counts = {PENDING: 0, DONE: 0, FAILED: 0}
+    outputs = {}
+    for path in manifest_paths(output_dir, shard_count):
+        if not os.path.exists(path):
+            continue
+        connection = sqlite3.connect(path)
+        try:
+            for status, count in connection.execute('SELECT status, COUNT(*) FROM filings GROUP BY status'):
+                counts[status] += count
+            outputs.update(((cik, number), output) for cik, number, output in connection.execute(
+                'SELECT cik, accession_number, output FROM filings WHERE status = ?', (DONE,)))
+        finally:
+            connection.close()
+
+    path = os.path.join(output_dir, MERGED_FILE)
+    temporary = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as merged:
+        for key in sorted(outputs):
+            with open(os.path.join(output_dir, outputs[key]), 'rb') as f:
+                merged.write(f.read().rstrip(b'\n') + b'\n')
+    os.replace(temporary, path)
+
+    return counts
+
+
+def _date(text):
+    return datetime.strptime(text, '%Y-%m-%d')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Downloads the filings of many companies, resuming where a '
+                                                 'previous run stopped.')
+    parser.add_argument('output_dir', help='Directory of the results and of the job manifest.')
+    parser.add_argument('--ciks', nargs='+', default=[], help='CIKs of the companies.')
+    parser.add_argument('--tickers', nargs='+', default=[], help='Tickers of the companies.')
+    parser.add_argument('--companies-file', help='File listing CIKs or tickers, one per line.')
+    parser.add_argument('--date-start', type=_date, help='Filing date from, as YYYY-MM-DD.')
+    parser.add_argument('--date-end', type=_date, help='Filing date to, as YYYY-MM-DD.')
+    parser.add_argument('--forms', nargs='+', default=DEFAULT_FORM_TYPES, help='Form types. Defaults to 10-K 10-Q.')
+    parser.add_argument('--no-html', action='store_true', help="Don't download the HTML of the filings.")
+    parser.add_argument('--no-xbrl', action='store_true', help="Don't download the XBRL of the filings.")
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent downloads. Defaults to 4.')
+    parser.add_argument('--rate', type=float, default=SEC_MAX_REQUESTS_PER_SECOND,
+                        help='Maximum requests per second. Defaults to 10.')
+    parser.add_argument('--retry-failed', action='store_true', help='Retry the companies and filings that failed.')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes, each one running a shard of the job. Defaults to 1.')
+    parser.add_argument('--shard-count', type=int, default=1,
+                        help='Number of machines the job is split across. Defaults to 1.')
+    parser.add_argument('--shard-index', type=int, default=0,
+                        help='Shard of this machine, from 0 to --shard-count - 1. Defaults to 0.')
+    parser.add_argument('--rate-lock', default=DEFAULT_LOCK_PATH,
+                        help='Lock file of the request budget shared by the processes of the host.')
+    parser.add_argument('--merge', action='store_true',
+                        help='Only merge the results of the shards found in the output directory.')
+
+    args = parser.parse_args(argv)
+    if not args.merge and args.date_start is None and args.date_end is None:
+        parser.error('provide either --date-start or --date-end')
+    if args.processes < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error('invalid --processes, --shard-count or --shard-index')
+
+    args.identifiers = list(args.ciks) + list(args.tickers)
+    if args.companies_file:
+        with open(args.companies_file) as f:
+            args.identifiers.extend(line.strip() for line in f if line.strip())
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.merge:
+            counts = merge(args.output_dir)
+            print('done: {0}, failed: {1}, pending: {2}'.format(counts[DONE], counts[FAILED], counts[PENDING]))
+            return 1 if counts[FAILED] or counts[PENDING] else 0
+
+        # Each machine's shard is split again between its processes
+        shard_count = args.shard_count * args.processes
+        os.makedirs(args.output_dir, exist_ok=True)
+        check_layout(args.output_dir, shard_count)
+    except BulkJobError as e:
+        print('error: {0}'.format(e), file=sys.stderr)
+        return 2
+
+    shards = [(args.shard_index * args.processes + process, shard_count) for process in range(args.processes)]
+    if shard_count == 1:
+        shards = [None]
+
+    options = dict(output_dir=args.output_dir, identifiers=args.identifiers, lock_path=args.rate_lock,
+                   rate=args.rate, retry_failed=args.retry_failed, date_start=args.date_start,
+                   date_end=args.date_end, form_types=args.forms, fetch_html=not args.no_html,
+                   fetch_xbrl=not args.no_xbrl, workers=args.workers)
+    if len(shards) == 1:
+        results = [run_shard(shards[0], **options)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            results = list(executor.map(_run_shard, [dict(options, shard=shard) for shard in shards]))
+
+    counts = {status: sum(result[status] for result in results) for status in (PENDING, DONE, FAILED)}
+    if args.shard_count == 1:
+        merge(args.output_dir)
+
+    print('done: {0}, failed: {1}, pending: {2}'.format(counts[DONE], counts[FAILED], counts[PENDING]))
+    return 1 if counts[FAILED] else 0
+
+
+def _run_shard(options):
+    return run_shard(**options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
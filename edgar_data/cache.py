@@ -0,0 +1,192 @@
+"""Local SQLite store of computed fundamentals, keyed by accession number, period selection and extraction version.
+
+The extraction version combines the library version with a digest of the modules computing the fields,
+so entries computed by another version of the extraction logic are never returned.
+"""
+import hashlib
+import sqlite3
+import threading
+from collections import namedtuple
+
+from . import __version__, xbrl, xbrl_fundamentals, xbrl_inline
+from .xbrl import Field, FieldsDataset
+
+# Named as the attributes of EdgarForm
+CachedFundamentals = namedtuple('CachedFundamentals', ['accession_number', 'cik', 'form_type', 'period_end_date',
+                                                       'filing_date', 'fields'])
+
+_extraction_version = None
+
+
+def extraction_version():
+    """Version of the extraction logic, changing whenever the library or its XBRL modules do.
+
+    :rtype: str
+    """
+    global _extraction_version
+    if _extraction_version is None:
+        digest = hashlib.sha1()
+        for module in (xbrl, xbrl_fundamentals, xbrl_inline):
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        _extraction_version = '{0}-{1}'.format(__version__, digest.hexdigest()[:12])
+
+    return _extraction_version
+
+
+def selection_key(yearminus=0, quarter=False):
+    """Key of a period selection, as made with `XBRL.loadYear(yearminus, quarter)`.
+
+    :rtype: str
+    """
+    return '{0}:{1}'.format('quarter' if quarter else 'year', yearminus)
+
+
+CURRENT_PERIOD = selection_key()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    id INTEGER PRIMARY KEY,
+    accession_number TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    version TEXT NOT NULL,
+    cik TEXT,
+    form TEXT,
+    period_of_report TEXT,
+    filing_date TEXT,
+    UNIQUE (accession_number, selection, version)
+);
+CREATE INDEX IF NOT EXISTS filings_cik ON filings (cik, filing_date);
+CREATE TABLE IF NOT EXISTS fields (
+    filing_id INTEGER NOT NULL REFERENCES filings (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    is_field INTEGER NOT NULL,
+    value,
+    unit_ref TEXT,
+    currency TEXT,
+    PRIMARY KEY (filing_id, name)
+);
+"""
+
+
+class FundamentalsCache:
+    """Computed fields of filings, stored in a local SQLite database.
+
+    :Example:
+
+    >>> cache = FundamentalsCache('fundamentals.db')
+    >>> edgar = EdgarData(cache=cache)
+    >>> edgar.get_form_data(cik, date_start, fetch_html=False)  # downloads and parses the instance documents
+    >>> edgar.get_form_data(cik, date_start, fetch_html=False)  # reads the fields from the cache
+    >>> cache.find(cik, date_start)  # no network at all
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Database file. Created if it doesn't exist.
+        """
+        self.path = path
+        self.version = extraction_version()
+        # Shared by the threads fetching filings, e.g. the workers of a BulkJob, one at a time
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def get(self, accession_number, selection=CURRENT_PERIOD):
+        """Fields stored for a filing.
+
+        :param accession_number: e.g. '0000320193-17-000070'.
+        :param selection: Defaults to the current period. Key of the period selection, see `selection_key`.
+        :return: The fields, or None if they are not stored for the current extraction version.
+        :rtype: FieldsDataset
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT id FROM filings WHERE accession_number = ? AND selection = ? AND version = ?',
+                (accession_number, selection, self.version)).fetchone()
+            if row is None:
+                return None
+
+            return self._read_fields(row[0])
+
+    def put(self, accession_number, fields, selection=CURRENT_PERIOD, cik=None, form=None, period_of_report=None,
+            filing_date=None):
+        """Stores the fields of a filing, replacing any previously stored for the same key.
+
+        :param accession_number: e.g. '0000320193-17-000070'.
+        :param fields: Computed fields.
+        :param selection: Defaults to the current period. Key of the period selection, see `selection_key`.
+        :param cik: Optional. Company's CIK, allows finding the filing with `find`.
+        :param form: Optional. Form type.
+        :param period_of_report: Optional. Period of report, as 'YYYY-MM-DD'.
+        :param filing_date: Optional. Filing date, as 'YYYY-MM-DD'.
+        :type fields: FieldsDataset
+        """
+        rows = []
+        for name, value in fields.fields.items():
+            if isinstance(value, Field):
+                currency = value.currency
+                rows.append((name, 1, value.value, value.unit_ref, currency.code if currency else None))
+            else:
+                rows.append((name, 0, value, None, None))
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                'DELETE FROM filings WHERE accession_number = ? AND selection = ? AND version = ?',
+                (accession_number, selection, self.version))
+            cursor = self.connection.execute(
+                'INSERT INTO filings (accession_number, selection, version, cik, form, period_of_report, filing_date) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (accession_number, selection, self.version, cik, form, period_of_report, filing_date))
+            self.connection.executemany(
+                'INSERT INTO fields (filing_id, name, is_field, value, unit_ref, currency) VALUES (?, ?, ?, ?, ?, ?)',
+                [(cursor.lastrowid,) + row for row in rows])
+
+    def find(self, cik, date_start=None, date_end=None, form_types=None, selection=CURRENT_PERIOD):
+        """Stored fields of a company's filings, answered without any network access.
+
+        :param cik: Company's CIK.
+        :param date_start: Optional. Filing date from.
+        :param date_end: Optional. Filing date to.
+        :param form_types: Optional. List of form types. Defaults to all forms.
+        :param selection: Defaults to the current period. Key of the period selection, see `selection_key`.
+        :type date_start: datetime
+        :type date_end: datetime
+        :return: Stored filings, ordered by filing date.
+        :rtype: list[CachedFundamentals]
+        """
+        query = 'SELECT id, accession_number, cik, form, period_of_report, filing_date FROM filings ' \
+                'WHERE cik = ? AND selection = ? AND version = ?'
+        parameters = [cik.rjust(10, '0'), selection, self.version]
+        if date_start is not None:
+            query += ' AND filing_date >= ?'
+            parameters.append(date_start.strftime('%Y-%m-%d'))
+        if date_end is not None:
+            query += ' AND filing_date <= ?'
+            parameters.append(date_end.strftime('%Y-%m-%d'))
+        if form_types is not None:
+            query += ' AND form IN ({0})'.format(', '.join('?' * len(form_types)))
+            parameters.extend(form_types)
+        query += ' ORDER BY filing_date'
+
+        with self.lock:
+            return [CachedFundamentals(*row[1:], fields=self._read_fields(row[0]))
+                    for row in self.connection.execute(query, parameters).fetchall()]
+
+    def purge(self):
+        """Deletes the entries computed by other versions of the extraction logic."""
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM filings WHERE version != ?', (self.version,))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _read_fields(self, filing_id):
+        fields = FieldsDataset()
+        for name, is_field, value, unit_ref in self.connection.execute(
+                'SELECT name, is_field, value, unit_ref FROM fields WHERE filing_id = ?', (filing_id,)):
+            fields[name] = Field(value, unit_ref) if is_field else value
+
+        return fields
@@ -0,0 +1,93 @@
+"""EDGAR daily index files, listing every filing disseminated on a day, e.g.
+https://www.sec.gov/Archives/edgar/daily-index/2018/QTR1/master.20180208.idx
+
+    CIK|Company Name|Form Type|Date Filed|File Name
+    --------------------------------------------------------------------------------
+    1000045|NICHOLAS FINANCIAL INC|10-Q|20180208|edgar/data/1000045/0001193125-18-037381.txt
+
+The quarterly master.idx files of the full index have the same layout, with dates as 'YYYY-MM-DD'.
+"""
+import gzip
+import os
+from collections import namedtuple
+
+DAILY_INDEX_URL = 'https://www.sec.gov/Archives/edgar/daily-index/{0}/QTR{1}/master.{2}.idx'
+ARCHIVES_URL = 'https://www.sec.gov/Archives/'
+
+# A filing of an index. `cik` has 10 digits, `filing_date` is 'YYYY-MM-DD' and `index_url` is the URL of the
+# filing index page, as passed to EdgarData.get_filing.
+IndexedFiling = namedtuple('IndexedFiling', ['cik', 'company_name', 'form_type', 'filing_date', 'accession_number',
+                                             'index_url'])
+
+
+class DailyIndexNotFound(Exception):
+    """There is no daily index for the date, e.g. on weekends and holidays."""
+
+
+def daily_index_url(date):
+    """
+    :type date: datetime
+    :rtype: str
+    """
+    return DAILY_INDEX_URL.format(date.year, (date.month - 1) // 3 + 1, date.strftime('%Y%m%d'))
+
+
+def daily_index_path(directory, date):
+    """Path of the daily index of `date` in a local directory, e.g. a mirror of the daily-index files,
+    either as `master.YYYYMMDD.idx` or compressed as `master.YYYYMMDD.idx.gz`.
+
+    :raises DailyIndexNotFound: if the directory doesn't hold the index.
+    """
+    path = os.path.join(directory, 'master.{0}.idx'.format(date.strftime('%Y%m%d')))
+    for candidate in (path, path + '.gz'):
+        if os.path.exists(candidate):
+            return candidate
+    raise DailyIndexNotFound(path)
+
+
+def read_index_file(path, form_types=None):
+    """
+    :param path: Index file, compressed with gzip if its name ends with '.gz'.
+    :param form_types: Optional. List of form types to keep. Defaults to all forms.
+    :rtype: list[IndexedFiling]
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return parse_index(f.read(), form_types)
+
+
+def parse_index(content, form_types=None):
+    """Filings of a master index file.
+
+    :param content: Index file, as bytes or str.
+    :param form_types: Optional. List of form types to keep. Defaults to all forms.
+    :rtype: list[IndexedFiling]
+    """
+    if isinstance(content, bytes):
+        content = content.decode('latin-1')
+    form_types = set(form_types) if form_types is not None else None
+
+    filings = []
+    in_header = True
+    for line in content.splitlines():
+        if in_header:
+            # The rows follow the line of dashes under the column names
+            in_header = not line.startswith('-----')
+            continue
+
+        values = line.split('|')
+        if len(values) != 5:
+            continue
+        cik, company_name, form_type, filing_date, file_name = values
+        if form_types is not None and form_type not in form_types:
+            continue
+
+        if len(filing_date) == 8:
+            filing_date = '{0}-{1}-{2}'.format(filing_date[:4], filing_date[4:6], filing_date[6:])
+        number = os.path.splitext(os.path.basename(file_name))[0]
+        index_url = '{0}{1}/{2}/{3}-index.htm'.format(ARCHIVES_URL, os.path.dirname(file_name),
+                                                      number.replace('-', ''), number)
+
+        filings.append(IndexedFiling(cik.rjust(10, '0'), company_name, form_type, filing_date, number, index_url))
+
+    return filings
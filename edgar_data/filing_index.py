@@ -0,0 +1,121 @@
+"""Index pages of filings, e.g. https://www.sec.gov/Archives/edgar/data/320193/000032019317000070/0000320193-17-000070-index.htm
+
+Each page is parsed once into a `FilingIndex`, and its lxml tree is released right away.
+"""
+from collections import namedtuple
+from urllib.parse import urlparse, urlunparse
+
+from lxml import html
+
+DOCUMENTS_TABLE = 'Document Format Files'
+DATA_FILES_TABLE = 'Data Files'
+
+# A row of the documents or data files table. `name` is the file name and `url` its absolute URL.
+IndexDocument = namedtuple('IndexDocument', ['sequence', 'description', 'name', 'url', 'type', 'size'])
+
+
+def sec_url(relative_url):
+    """Absolute URL of a link of www.sec.gov, e.g. '/Archives/edgar/data/...'."""
+    url_parts = list(urlparse(relative_url))
+    url_parts[0] = 'https'
+    url_parts[1] = 'www.sec.gov'
+    return urlunparse(url_parts)
+
+
+def _text(element):
+    text = element.text_content().strip()
+    return text or None
+
+
+def _read_table(table):
+    rows = table.findall('.//tr')
+    if not rows:
+        return []
+
+    columns = [_text(cell) for cell in rows[0]]
+    documents = []
+    for row in rows[1:]:
+        values = {}
+        for column, cell in zip(columns, row):
+            values[column] = cell
+            if column == 'Document':
+                link = cell.find('.//a')
+                values['name'] = _text(link) if link is not None else None
+                values['url'] = sec_url(link.get('href')) if link is not None and link.get('href') else None
+
+        documents.append(IndexDocument(
+            sequence=_text(values['Seq']) if 'Seq' in values else None,
+            description=_text(values['Description']) if 'Description' in values else None,
+            name=values.get('name'), url=values.get('url'),
+            type=_text(values['Type']) if 'Type' in values else None,
+            size=_text(values['Size']) if 'Size' in values else None))
+
+    return documents
+
+
+class FilingIndex:
+    """
+    :ivar url: URL of the index page.
+    :ivar filing_date: Filing date, as 'YYYY-MM-DD'. None if not found.
+    :ivar period_of_report: Period of report, as 'YYYY-MM-DD'. None if not found.
+    :ivar documents: Rows of the documents table.
+    :ivar data_files: Rows of the data files table, e.g. the XBRL instance document.
+    """
+
+    def __init__(self, url, filing_date, period_of_report, documents, data_files):
+        self.url = url  # type: str
+        self.filing_date = filing_date  # type: str
+        self.period_of_report = period_of_report  # type: str
+        self.documents = documents  # type: list[IndexDocument]
+        self.data_files = data_files  # type: list[IndexDocument]
+
+    @classmethod
+    def from_html(cls, content, url=None):
+        """Parses an index page.
+
+        :param content: Page, as bytes or str.
+        :param url: Optional. URL of the page.
+        :rtype: FilingIndex
+        """
+        tree = html.fromstring(content)
+
+        info = {}
+        tables = {}
+        for form_div in tree.iterfind('.//div[@id="formDiv"]'):
+            for element in form_div.iter('div', 'table'):
+                if element.tag == 'table':
+                    tables.setdefault(element.get('summary'), element)
+                elif element.get('class') == 'infoHead':
+                    value = element.getnext()
+                    if value is not None and value.tag == 'div':
+                        info.setdefault(_text(element), value.text.strip() if value.text else None)
+
+        return cls(url, info.get('Filing Date'), info.get('Period of Report'),
+                   _read_table(tables[DOCUMENTS_TABLE]) if DOCUMENTS_TABLE in tables else [],
+                   _read_table(tables[DATA_FILES_TABLE]) if DATA_FILES_TABLE in tables else [])
+
+    def find(self, description, table=DOCUMENTS_TABLE):
+        """First document whose description, file name or type contains `description`.
+
+        :param description: e.g. '10-K', or 'EX-101.INS' for the XBRL instance document.
+        :param table: Defaults to the documents table. Either DOCUMENTS_TABLE or DATA_FILES_TABLE.
+        :return: The document, or None if no document matches.
+        :rtype: IndexDocument
+        """
+        documents = self.documents if table == DOCUMENTS_TABLE else self.data_files
+        for document in documents:
+            if document.url is None:
+                continue
+            if any(description in text for text in (document.description, document.name, document.type) if text):
+                return document
+        return None
+
+    @property
+    def supplemental_links(self):
+        """
+        :return: List of tuples (link, type, size) of the documents table.
+        """
+        return [(document.url, document.type, document.size) for document in self.documents]
+
+    def __repr__(self):
+        return 'FilingIndex({0!r})'.format(self.url)
@@ -0,0 +1,149 @@
+"""Conversion of fundamentals to a common currency, with exchange rates read from local files.
+
+Requires NumPy.
+"""
+import csv
+from collections import defaultdict
+
+from .xbrl_fundamentals import FUNDAMENTALS_PLAN, KEY_RATIOS
+
+# Fields in the currency of the filing. Ratios have none.
+MONETARY_FIELDS = [name for name in FUNDAMENTALS_PLAN.fields if name not in {step.field for step in KEY_RATIOS.steps}]
+
+
+class UnknownCurrencyError(Exception):
+    """The rate table has no rates for the currency."""
+
+
+class FXRates:
+    """Exchange rates by currency and date, quoted as units of the currency for one unit of `base`.
+    Values are converted with the rate of the last date on or before their own date.
+
+    :Example:
+
+    >>> rates = FXRates.from_csv(['rates.csv'])
+    >>> usd = rates.convert_panel(build_panel(filings), 'USD')
+    """
+
+    def __init__(self, base='USD'):
+        self.base = base
+        self.tables = {}  # type: dict[str, tuple]
+
+    @classmethod
+    def from_csv(cls, paths, base='USD'):
+        """Reads rates from CSV files, with `date` (as 'YYYY-MM-DD'), `currency` and `rate` columns.
+
+        :param paths: Paths of the CSV files.
+        :param base: Defaults to 'USD'. Currency the rates are quoted against.
+        :rtype: FXRates
+        """
+        rows = defaultdict(list)
+        for path in paths:
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    rows[row['currency'].strip().upper()].append((row['date'].strip(), float(row['rate'])))
+
+        rates = cls(base)
+        for currency, quotes in rows.items():
+            dates, values = zip(*quotes)
+            rates.add(currency, dates, values)
+        return rates
+
+    def add(self, currency, dates, rates):
+        """Adds rates of a currency, merged with those already known.
+
+        :param currency: Currency code, e.g. 'JPY'.
+        :param dates: Dates, as 'YYYY-MM-DD', datetime or datetime64.
+        :param rates: Units of the currency for one unit of the base currency, at each date.
+        """
+        import numpy
+
+        dates = numpy.asarray(dates, dtype='datetime64[D]')
+        rates = numpy.asarray(rates, dtype=float)
+        if currency in self.tables:
+            known_dates, known_rates = self.tables[currency]
+            dates = numpy.concatenate([known_dates, dates])
+            rates = numpy.concatenate([known_rates, rates])
+
+        order = numpy.argsort(dates, kind='mergesort')
+        self.tables[currency] = (dates[order], rates[order])
+
+    def rates(self, currency, dates):
+        """Rates of a currency at each date, found by binary search in its table.
+
+        :param dates: Array of datetime64 dates.
+        :return: Rates, NaN for dates before the first rate, missing dates and unknown currencies.
+        :rtype: numpy.ndarray
+        """
+        import numpy
+
+        dates = numpy.asarray(dates, dtype='datetime64[D]')
+        if currency == self.base:
+            rates = numpy.ones(len(dates))
+        elif currency in self.tables:
+            table_dates, table_rates = self.tables[currency]
+            positions = numpy.searchsorted(table_dates, dates, side='right') - 1
+            rates = table_rates[numpy.maximum(positions, 0)]
+            rates[positions < 0] = numpy.nan
+        else:
+            return numpy.full(len(dates), numpy.nan)
+
+        rates[numpy.isnat(dates)] = numpy.nan
+        return rates
+
+    def convert(self, values, currencies, dates, target=None):
+        """Converts values in several currencies to `target`, one batch per currency.
+
+        :param values: Values to convert.
+        :param currencies: Currency code of each value. None for values without one.
+        :param dates: Date of each value, usually the period end date.
+        :param target: Optional. Currency code to convert to. Defaults to the base currency.
+        :return: Converted values. NaN where no rate is known.
+        :rtype: numpy.ndarray
+        """
+        import numpy
+
+        target = target or self.base
+        if target != self.base and target not in self.tables:
+            raise UnknownCurrencyError(target)
+
+        values = numpy.asarray(values, dtype=float)
+        currencies = numpy.asarray(currencies, dtype=object)
+        dates = numpy.asarray(dates, dtype='datetime64[D]')
+
+        factors = numpy.full(len(values), numpy.nan)
+        for currency in set(currencies.tolist()):
+            if currency is None:
+                continue
+            rows = currencies == currency
+            if currency == target:
+                factors[rows] = 1
+            else:
+                factors[rows] = self.rates(target, dates[rows]) / self.rates(currency, dates[rows])
+
+        return values * factors
+
+    def convert_panel(self, panel, target=None, fields=None):
+        """Converts the fields of a panel made by `edgar_data.panel.build_panel` to `target`,
+        with the rates at the period end date of each filing.
+
+        :param panel: Columns of the panel.
+        :param target: Optional. Currency code to convert to. Defaults to the base currency.
+        :param fields: Optional. Names of the columns to convert. Defaults to the monetary fields of the panel.
+        :return: A new panel, with the converted columns and `currency` set to `target`.
+        :rtype: dict[str, numpy.ndarray]
+        """
+        import numpy
+
+        target = target or self.base
+        if fields is None:
+            fields = [name for name in MONETARY_FIELDS if name in panel]
+
+        converted = dict(panel)
+        factors = self.convert(numpy.ones(len(panel['currency'])), panel['currency'], panel['period_end_date'],
+                               target)
+        for name in fields:
+            converted[name] = panel[name] * factors
+        converted['currency'] = numpy.array([target] * len(factors), dtype=object)
+
+        return converted
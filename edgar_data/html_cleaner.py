@@ -0,0 +1,60 @@
+"""Removal of font tags and layout attributes from filing HTML, in a single pass over the document.
+
+None of the patterns span several lines, so documents can also be cleaned line by line as they are
+downloaded, see `HTMLCleaner`.
+"""
+import re
+
+LAYOUT_ATTRIBUTES = ['style', 'valign', 'align', 'width', 'height', 'border', 'cellpadding', 'cellspacing', 'size',
+                     'colspan']
+
+# Font tags, or layout attributes in lower or upper case, e.g. 'align="left"'
+clean_re = re.compile(r'<(?:font|FONT)[^>\n]*>|</(?:font|FONT)>|(?:{0}|{1})="[^"\n]*"'.format(
+    '|'.join(LAYOUT_ATTRIBUTES), '|'.join(name.upper() for name in LAYOUT_ATTRIBUTES)))
+
+
+def clean_html(content):
+    """Removes the font tags and layout attributes of an HTML document.
+
+    :param content: Document.
+    :rtype: str
+    """
+    return clean_re.sub('', content)
+
+
+class HTMLCleaner:
+    """Cleans a document given in chunks, e.g. as it is downloaded.
+    The last line of what was fed is held back until it is complete.
+
+    :Example:
+
+    >>> cleaner = HTMLCleaner()
+    >>> cleaned = ''.join(cleaner.feed(chunk) for chunk in resp.iter_content(decode_unicode=True))
+    >>> cleaned += cleaner.close()
+    """
+
+    def __init__(self):
+        self.pending = ''
+
+    def feed(self, chunk):
+        """
+        :param chunk: Next part of the document.
+        :return: The cleaned lines completed by `chunk`.
+        :rtype: str
+        """
+        end = chunk.rfind('\n')
+        if end < 0:
+            self.pending += chunk
+            return ''
+
+        lines = self.pending + chunk[:end + 1]
+        self.pending = chunk[end + 1:]
+        return clean_re.sub('', lines)
+
+    def close(self):
+        """
+        :return: The cleaned last line of the document.
+        :rtype: str
+        """
+        rest, self.pending = self.pending, ''
+        return clean_re.sub('', rest)
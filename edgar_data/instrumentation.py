@@ -0,0 +1,149 @@
+"""Timing of the stages of the retrieval of filings, reported to a callback as one `StageEvent` per stage.
+
+Stages are only timed when a callback is given: otherwise `stage` returns a shared object that does nothing.
+"""
+import threading
+import time
+from collections import namedtuple
+
+# Stages, in the order they run for a filing
+LISTING = 'listing'  # browse-edgar query listing a company's filings
+INDEX = 'index'  # download of the filing index page
+HTML_DOWNLOAD = 'html_download'
+CLEAN_HTML = 'clean_html'
+XBRL_DOWNLOAD = 'xbrl_download'
+XBRL_PARSE = 'xbrl_parse'  # parsing and indexing of the facts
+PERIODS = 'periods'  # resolution of the current period and contexts
+FUNDAMENTALS = 'fundamentals'  # FundamentantalAccountingConcepts
+DOCUMENT = 'document'  # download of other documents, e.g. exhibits
+
+# Outcomes
+OK = 'ok'
+STORED = 'stored'  # read from the document store instead of downloaded
+ERROR = 'error'
+
+# `start` and `end` are timestamps (time.time()), `bytes` the size of the data downloaded or parsed, if any,
+# and `error` the repr of the exception raised by a stage ending with ERROR.
+StageEvent = namedtuple('StageEvent', ['stage', 'accession_number', 'url', 'start', 'end', 'bytes', 'outcome',
+                                       'error'])
+
+
+_active = threading.local()
+
+
+class Stage:
+    """Context manager timing a stage. `url`, `bytes` and `outcome` can be set while the stage runs,
+    by the code running it or by the functions it calls, through `active_stage`."""
+
+    __slots__ = ['callback', 'stage', 'accession_number', 'url', 'bytes', 'outcome', 'start', 'parent']
+
+    def __init__(self, callback, stage, accession_number=None, url=None):
+        self.callback = callback
+        self.stage = stage
+        self.accession_number = accession_number
+        self.url = url
+        self.bytes = None
+        self.outcome = OK
+        self.start = None
+        self.parent = None
+
+    def __enter__(self):
+        self.parent = active_stage()
+        _active.stage = self
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.time()
+        _active.stage = self.parent
+        if exc_type is None:
+            outcome, error = self.outcome, None
+        else:
+            outcome, error = ERROR, repr(exc_value)
+        self.callback(StageEvent(self.stage, self.accession_number, self.url, self.start, end, self.bytes, outcome,
+                                 error))
+        return False
+
+
+class _NullStage:
+    """Stage of a disabled callback: attributes set on it are ignored."""
+
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+def active_stage():
+    """Stage running on the current thread, or a stage doing nothing if there is none.
+
+    :rtype: Stage
+    """
+    return getattr(_active, 'stage', NULL_STAGE)
+
+
+def stage(callback, name, accession_number=None, url=None):
+    """
+    :param callback: Function receiving the StageEvent, or None to disable the timing.
+    :param name: Stage, e.g. HTML_DOWNLOAD.
+    :rtype: Stage
+    """
+    if callback is None:
+        return NULL_STAGE
+    return Stage(callback, name, accession_number, url)
+
+
+def for_filing(callback, accession_number, url=None):
+    """Callback filling in the accession number and URL of the events of code unaware of the filing, e.g. `XBRL`.
+
+    :return: The callback, or None if `callback` is None.
+    """
+    if callback is None:
+        return None
+
+    def on_stage(event):
+        callback(event._replace(accession_number=accession_number, url=event.url or url))
+
+    return on_stage
+
+
+class StageRecorder:
+    """Callback keeping every event, from any thread.
+
+    :Example:
+
+    >>> recorder = StageRecorder()
+    >>> edgar = EdgarData(on_stage=recorder)
+    >>> edgar.get_form_data(cik, date_start)
+    >>> recorder.summary()['html_download']
+    """
+
+    def __init__(self):
+        self.events = []  # type: list[StageEvent]
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def summary(self):
+        """
+        :return: Per stage: number of events, total seconds and total bytes.
+        :rtype: dict[str, tuple[int, float, int]]
+        """
+        totals = {}
+        with self.lock:
+            events = list(self.events)
+        for event in events:
+            count, seconds, size = totals.get(event.stage, (0, 0.0, 0))
+            totals[event.stage] = (count + 1, seconds + event.end - event.start, size + (event.bytes or 0))
+        return totals
@@ -0,0 +1,122 @@
+"""Counters of the work done by the library, for the monitoring of long-running programs.
+
+`EdgarData` and `XBRL` update the module's `registry` unless given another one. Counters are kept per process:
+the XBRL documents parsed by the workers of `xbrl_pool` are counted in the workers.
+
+:Example:
+
+>>> from edgar_data.metrics import registry
+>>> registry.snapshot()['edgar_requests_total{status_class="2xx"}']
+>>> print(registry.prometheus())  # e.g. served on /metrics
+"""
+import threading
+from collections import OrderedDict
+
+REQUESTS = 'edgar_requests_total'
+RETRIES = 'edgar_request_retries_total'
+DOWNLOADED_BYTES = 'edgar_downloaded_bytes_total'
+RATE_LIMIT_WAIT = 'edgar_rate_limit_wait_seconds_total'
+CACHE_REQUESTS = 'edgar_cache_requests_total'
+FILINGS = 'edgar_filings_retrieved_total'
+XBRL_PARSED = 'edgar_xbrl_parsed_total'
+XBRL_FAILURES = 'edgar_xbrl_failures_total'
+FILINGS_SKIPPED = 'edgar_filings_skipped_total'
+
+COUNTERS = OrderedDict([
+    (REQUESTS, 'HTTP requests sent to the SEC, by status class (2xx, 4xx, 5xx, or error without response).'),
+    (RETRIES, 'HTTP requests sent again after a failure.'),
+    (DOWNLOADED_BYTES, 'Bytes downloaded from the SEC.'),
+    (RATE_LIMIT_WAIT, 'Seconds spent waiting for the rate limiter.'),
+    (CACHE_REQUESTS, 'Lookups of the fundamentals cache and of the document store, by cache and result.'),
+    (FILINGS, 'Filings retrieved, by form type.'),
+    (XBRL_PARSED, 'XBRL and inline XBRL documents parsed.'),
+    (XBRL_FAILURES, 'Filings whose XBRL could not be read, by error.'),
+    (FILINGS_SKIPPED, 'Filings of the daily feed skipped because they could not be retrieved, by error.'),
+])
+
+# Counters with labels, which have no value until incremented
+LABELED_COUNTERS = {REQUESTS, CACHE_REQUESTS, FILINGS, XBRL_FAILURES, FILINGS_SKIPPED}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name, labels):
+    if not labels:
+        return name
+    return '{0}{{{1}}}'.format(name, ','.join('{0}="{1}"'.format(label, _escape(value)) for label, value in labels))
+
+
+def _format_value(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsRegistry:
+    """Counters, optionally labeled, updated from any thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}  # type: dict[tuple[str, tuple], float]
+
+    def inc(self, name, value=1, **labels):
+        """Adds `value` to a counter.
+
+        :param name: Counter, e.g. REQUESTS.
+        :param labels: Labels of the counter, e.g. status_class='2xx'.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def get(self, name, **labels):
+        """
+        :return: Value of a counter, 0 if it has never been incremented.
+        """
+        with self.lock:
+            return self.values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self):
+        """
+        :return: Value of every counter, keyed by its name and labels as in the Prometheus format,
+            e.g. 'edgar_requests_total{status_class="2xx"}'. Counters without labels are always included.
+        :rtype: dict[str, float]
+        """
+        with self.lock:
+            values = dict(self.values)
+        snapshot = OrderedDict((name, 0) for name in COUNTERS if name not in LABELED_COUNTERS)
+        for (name, labels), value in sorted(values.items()):
+            snapshot[_sample(name, labels)] = value
+        return snapshot
+
+    def prometheus(self):
+        """
+        :return: Every counter, in the Prometheus text exposition format.
+        :rtype: str
+        """
+        with self.lock:
+            values = dict(self.values)
+
+        samples = OrderedDict((name, []) for name in COUNTERS)
+        for (name, labels), value in sorted(values.items()):
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, counter_samples in samples.items():
+            lines.append('# HELP {0} {1}'.format(name, COUNTERS.get(name, name)))
+            lines.append('# TYPE {0} counter'.format(name))
+            if not counter_samples and name not in LABELED_COUNTERS:
+                counter_samples = [((), 0)]
+            for labels, value in counter_samples:
+                lines.append('{0} {1}'.format(_sample(name, labels), _format_value(value)))
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,90 @@
+"""Columnar panels of many filings, one array per column, ready for NumPy or pandas.
+
+Requires NumPy.
+"""
+from array import array
+
+from .currency import find_currency
+from .xbrl import Field
+from .xbrl_fundamentals import FUNDAMENTALS_PLAN
+
+# Columns describing each filing, besides its fields
+INFORMATION_COLUMNS = ['accession_number', 'cik', 'form_type', 'period_end_date', 'filing_date',
+                       'fiscal_year_focus', 'fiscal_period_focus', 'currency']
+
+NAN = float('nan')
+
+
+def _date(value):
+    # datetime or 'YYYY-MM-DD', as made by EdgarForm and FundamentalsCache
+    if not value:
+        return 'NaT'
+    return str(value)[:10]
+
+
+def _number(value):
+    # Most fields are missing, so they skip the exception handling
+    if value is None:
+        return NAN
+    if isinstance(value, Field):
+        value = value.value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def build_panel(filings, fields=None):
+    """Builds the columns of a panel of filings, reading each filing once.
+
+    :Example:
+
+    >>> panel = build_panel(edgar.get_form_data(cik, date_start, fetch_html=False))
+    >>> panel['Revenues'] / panel['Assets']
+    >>> pandas.DataFrame(panel)
+
+    :param filings: Iterable of EdgarForm, or of CachedFundamentals from `FundamentalsCache.find`.
+    :param fields: Optional. Names of the field columns. Defaults to the fields of the fundamental accounting concepts.
+    :return: Columns of equal length, with a row per filing: one float array per field, NaN where the filing
+        has no value, then object arrays for the information columns, the period end and filing dates being
+        datetime64 arrays. `currency` is the currency code of the first field of the row that has one.
+    :rtype: dict[str, numpy.ndarray]
+    """
+    import numpy
+
+    fields = list(FUNDAMENTALS_PLAN.fields if fields is None else fields)
+    values = [array('d') for _ in fields]
+    information = {column: [] for column in INFORMATION_COLUMNS}
+    # Filings of a company mostly share their units, so each one is resolved once
+    currencies = {}
+
+    for filing in filings:
+        dataset = filing.fields.fields if filing.fields is not None else {}
+
+        currency = None
+        for column, name in zip(values, fields):
+            value = dataset.get(name)
+            column.append(_number(value))
+            if currency is None and isinstance(value, Field) and value.unit_ref is not None:
+                if value.unit_ref not in currencies:
+                    found = find_currency(value.unit_ref)
+                    currencies[value.unit_ref] = found.code if found else None
+                currency = currencies[value.unit_ref]
+
+        information['accession_number'].append(filing.accession_number)
+        information['cik'].append(filing.cik)
+        information['form_type'].append(filing.form_type)
+        information['period_end_date'].append(_date(filing.period_end_date))
+        information['filing_date'].append(_date(filing.filing_date))
+        information['fiscal_year_focus'].append(dataset.get('DocumentFiscalYearFocus'))
+        information['fiscal_period_focus'].append(dataset.get('DocumentFiscalPeriodFocus'))
+        information['currency'].append(currency)
+
+    panel = {name: numpy.frombuffer(column, dtype=float) for name, column in zip(fields, values)}
+    for column in INFORMATION_COLUMNS:
+        if column in ('period_end_date', 'filing_date'):
+            panel[column] = numpy.array(information[column], dtype='datetime64[D]')
+        else:
+            panel[column] = numpy.array(information[column], dtype=object)
+
+    return panel
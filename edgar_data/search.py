@@ -0,0 +1,286 @@
+"""Full-text index of filings, stored in a local SQLite database.
+
+Each term is mapped to the filings using it, with the positions (for phrase queries) and offsets in the HTML
+(to point at each occurrence) of every use. Filings are added one at a time, e.g. as they are fetched, and queries
+never read the documents again.
+"""
+import re
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+from .sections import index_sections
+
+# Words outside of tags and entities
+token_re = re.compile(r'<[^>]*>|&#?\w+;|(\w+)')
+query_re = re.compile(r'"([^"]*)"|(\S+)')
+
+SearchHit = namedtuple('SearchHit', ['accession_number', 'section', 'offset'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    accession_number TEXT NOT NULL UNIQUE,
+    cik TEXT,
+    form TEXT,
+    filing_date TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    item TEXT NOT NULL,
+    start INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_document ON sections (document_id);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL REFERENCES terms (id),
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    positions BLOB NOT NULL,
+    offsets BLOB NOT NULL,
+    PRIMARY KEY (term_id, document_id)
+);
+"""
+
+# SQLite limits the number of parameters of a statement
+MAX_PARAMETERS = 500
+
+
+def tokenize(document):
+    """Terms of a document, lower case, with their offsets in the document.
+
+    :rtype: collections.Iterable[tuple[str, int]]
+    """
+    for match in token_re.finditer(document):
+        if match.group(1):
+            yield match.group(1).lower(), match.start()
+
+
+def _section_name(section):
+    if section.part is None:
+        return section.item
+    return '{0}.{1}'.format(section.part, section.item)
+
+
+def _unpack(data):
+    values = array('I')
+    values.frombytes(data)
+    return values
+
+
+class FullTextIndex:
+    """Inverted index of the text of filings.
+
+    :Example:
+
+    >>> index = FullTextIndex('search.db')
+    >>> edgar = EdgarData(index=index)
+    >>> edgar.get_form_data(cik, date_start, form_types=['8-K'])  # indexes the filings as they are fetched
+    >>> index.search('"going concern" AND NOT bankruptcy', form_types=['8-K'])
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Database file. Created if it doesn't exist.
+        """
+        self.path = path
+        # Shared by the threads fetching filings, e.g. the workers of a BulkJob, one at a time
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def __contains__(self, accession_number):
+        with self.lock:
+            return self.connection.execute('SELECT 1 FROM documents WHERE accession_number = ?',
+                                           (accession_number,)).fetchone() is not None
+
+    def add(self, form):
+        """Indexes the HTML of a filing, unless it is already indexed.
+
+        :type form: edgar_data.EdgarData.EdgarForm
+        :return: Whether the filing has been indexed.
+        :rtype: bool
+        """
+        html = form.html
+        if not html or not form.accession_number:
+            return False
+
+        filing_date = form.filing_date.strftime('%Y-%m-%d') if form.filing_date else None
+        return self.add_document(form.accession_number, html, cik=form.cik, form=form.form_type,
+                                 filing_date=filing_date)
+
+    def add_document(self, accession_number, document, cik=None, form=None, filing_date=None):
+        """Indexes a document, unless a document with the same accession number is already indexed.
+
+        :param accession_number: e.g. '0000320193-17-000070'.
+        :param document: HTML or text of the filing.
+        :param cik: Optional. Company's CIK.
+        :param form: Optional. Form type.
+        :param filing_date: Optional. Filing date, as 'YYYY-MM-DD'.
+        :return: Whether the document has been indexed.
+        :rtype: bool
+        """
+        if accession_number in self:
+            return False
+
+        postings = {}
+        for position, (term, offset) in enumerate(tokenize(document)):
+            if term not in postings:
+                postings[term] = (array('I'), array('I'))
+            positions, offsets = postings[term]
+            positions.append(position)
+            offsets.append(offset)
+
+        with self.lock, self.connection:
+            # Another thread may have indexed the document meanwhile
+            if accession_number in self:
+                return False
+
+            cursor = self.connection.execute(
+                'INSERT INTO documents (accession_number, cik, form, filing_date) VALUES (?, ?, ?, ?)',
+                (accession_number, cik, form, filing_date))
+            document_id = cursor.lastrowid
+
+            self.connection.executemany(
+                'INSERT INTO sections (document_id, item, start) VALUES (?, ?, ?)',
+                [(document_id, _section_name(section), section.start) for section in index_sections(document)])
+
+            self.connection.executemany('INSERT OR IGNORE INTO terms (term) VALUES (?)',
+                                        [(term,) for term in postings])
+            term_ids = self._term_ids(list(postings))
+            self.connection.executemany(
+                'INSERT INTO postings (term_id, document_id, positions, offsets) VALUES (?, ?, ?, ?)',
+                [(term_ids[term], document_id, positions.tobytes(), offsets.tobytes())
+                 for term, (positions, offsets) in postings.items()])
+
+        return True
+
+    def search(self, query, form_types=None):
+        """Finds the filings matching a query.
+
+        Terms and "quoted phrases" must all be found, unless separated by OR. Terms or phrases preceded by NOT
+        must not be found. Matching is case insensitive.
+
+        :param query: e.g. '"going concern" OR "substantial doubt"'.
+        :param form_types: Optional. List of form types. Defaults to all forms.
+        :return: Occurrences of the terms and phrases searched for, in the matching filings.
+            Sections are given as item, e.g. '1A', or as part and item, e.g. 'II.1A'.
+        :rtype: list[SearchHit]
+        """
+        with self.lock:
+            return self._search(query, form_types)
+
+    def _search(self, query, form_types):
+        matches = {}  # type: dict[int, list[int]]
+        for clause in self._parse(query):
+            documents = None
+            offsets = {}
+            for negated, terms in clause:
+                if negated:
+                    continue
+                found = self._find(terms)
+                documents = set(found) if documents is None else documents & set(found)
+                for document_id, document_offsets in found.items():
+                    offsets.setdefault(document_id, []).extend(document_offsets)
+
+            if not documents:
+                continue
+            for negated, terms in clause:
+                if negated:
+                    documents -= set(self._find(terms))
+            for document_id in documents:
+                matches.setdefault(document_id, []).extend(offsets[document_id])
+
+        if not matches:
+            return []
+
+        hits = []
+        for document_id, accession_number, form in self._documents(list(matches)):
+            if form_types is not None and form not in form_types:
+                continue
+            sections = self.connection.execute(
+                'SELECT item, start FROM sections WHERE document_id = ? ORDER BY start', (document_id,)).fetchall()
+            starts = [start for _, start in sections]
+            for offset in sorted(set(matches[document_id])):
+                position = bisect_right(starts, offset)
+                hits.append(SearchHit(accession_number, sections[position - 1][0] if position else None, offset))
+
+        return hits
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def _parse(query):
+        """Clauses of a query, each one a list of (negated, terms) to match together."""
+        clauses = [[]]
+        negated = False
+        for match in query_re.finditer(query):
+            phrase, word = match.groups()
+            if word == 'OR':
+                clauses.append([])
+                continue
+            if word == 'AND':
+                continue
+            if word == 'NOT':
+                negated = True
+                continue
+
+            terms = [term for term, _ in tokenize(phrase if phrase is not None else word)]
+            if terms:
+                clauses[-1].append((negated, terms))
+            negated = False
+
+        return [clause for clause in clauses if any(not negated for negated, _ in clause)]
+
+    def _find(self, terms):
+        """Offsets of a term, or of the first term of a phrase, in each document using it."""
+        term_ids = self._term_ids(terms)
+        if len(term_ids) < len(set(terms)):
+            return {}
+
+        postings = []
+        for term in terms:
+            postings.append({document_id: (positions, offsets) for document_id, positions, offsets in
+                             self.connection.execute(
+                                 'SELECT document_id, positions, offsets FROM postings WHERE term_id = ?',
+                                 (term_ids[term],))})
+
+        found = {}
+        for document_id in set.intersection(*[set(documents) for documents in postings]):
+            positions, offsets = (_unpack(data) for data in postings[0][document_id])
+            if len(terms) == 1:
+                found[document_id] = list(offsets)
+                continue
+
+            following = [set(_unpack(posting[document_id][0])) for posting in postings[1:]]
+            phrase_offsets = [offset for position, offset in zip(positions, offsets)
+                              if all(position + distance in next_positions
+                                     for distance, next_positions in enumerate(following, 1))]
+            if phrase_offsets:
+                found[document_id] = phrase_offsets
+
+        return found
+
+    def _term_ids(self, terms):
+        term_ids = {}
+        for start in range(0, len(terms), MAX_PARAMETERS):
+            chunk = terms[start:start + MAX_PARAMETERS]
+            term_ids.update((term, term_id) for term_id, term in self.connection.execute(
+                'SELECT id, term FROM terms WHERE term IN ({0})'.format(', '.join('?' * len(chunk))), chunk))
+        return term_ids
+
+    def _documents(self, document_ids):
+        rows = []
+        for start in range(0, len(document_ids), MAX_PARAMETERS):
+            chunk = document_ids[start:start + MAX_PARAMETERS]
+            rows.extend(self.connection.execute(
+                'SELECT id, accession_number, form FROM documents WHERE id IN ({0}) ORDER BY filing_date'.format(
+                    ', '.join('?' * len(chunk))), chunk))
+        return rows
@@ -0,0 +1,58 @@
+"""Index of the standard sections of a filing document, e.g. Item 1A (Risk Factors) or Item 7 (MD&A).
+
+Headings are found in a single scan of the document: an "Item" or "Part" heading starts a line or the text of
+an element, unlike cross references such as "see Item 7". The table of contents lists the same headings as the
+body, so the last heading of each item is the one kept.
+"""
+import re
+from collections import namedtuple
+from html import unescape
+
+# Start and end are offsets in the document, so a section is the slice document[start:end]
+Section = namedtuple('Section', ['part', 'item', 'title', 'start', 'end'])
+
+_space = r'(?:\s|&nbsp;|&#160;|&#xa0;)'
+heading_re = re.compile(r'(?:^|>)[ \t]*{0}*(?:(part){0}+(IV|I{{1,3}})\b|(item){0}+(\d{{1,2}}[A-C]?)\b[.:\s\-]*([^<\n]*))'
+                        .format(_space), re.IGNORECASE | re.MULTILINE)
+
+LAST_ITEM = 16
+
+
+def _title(text):
+    title = ' '.join(unescape(text).split()).strip('.:-\u2013\u2014 ')
+    return title or None
+
+
+def index_sections(document):
+    """Finds the Item sections of a 10-K, 10-Q or 20-F document.
+
+    :param document: HTML or text of the filing.
+    :return: Sections in document order, each one ending where the next one starts.
+        Items are given as written in the headings but upper case, e.g. '1A', and parts as roman numerals.
+    :rtype: list[Section]
+    """
+    part = None
+    headings = {}
+    for match in heading_re.finditer(document):
+        if match.group(1):
+            part = match.group(2).upper()
+            continue
+
+        item = match.group(4).upper()
+        if not 1 <= int(item.rstrip('ABC')) <= LAST_ITEM:
+            continue
+
+        start = match.start()
+        if document[start] == '>':
+            # Starts at the element holding the heading
+            start = document.rfind('<', 0, start)
+        # Later headings of an item replace those of the table of contents
+        headings[(part, item)] = (start, _title(match.group(5)))
+
+    # Headings of the table of contents may precede the first Part heading
+    parted = {item for part, item in headings if part is not None}
+    starts = sorted((start, part, item, title) for (part, item), (start, title) in headings.items()
+                    if part is not None or item not in parted)
+    ends = [start for start, _, _, _ in starts[1:]] + [len(document)]
+
+    return [Section(part, item, title, start, end) for (start, part, item, title), end in zip(starts, ends)]
@@ -0,0 +1,128 @@
+"""Compressed, content-addressed store of filing documents on the local disk.
+
+Each document is compressed once and stored under the SHA-256 digest of its content, so identical documents are
+stored once. Documents are also recorded under the URL they were downloaded from, which makes the store a cache of
+downloads.
+"""
+import hashlib
+import os
+import tempfile
+import zlib
+
+
+class DocumentNotStored(Exception):
+    """The document is not in the store."""
+
+
+class StoredDocument:
+    """Handle of a stored document, read from the disk on each access.
+
+    :ivar digest: SHA-256 digest of the document.
+    """
+
+    def __init__(self, store, digest):
+        self.store = store
+        self.digest = digest
+
+    def read(self):
+        """
+        :rtype: str
+        """
+        return self.store.get(self.digest)
+
+    def __repr__(self):
+        return 'StoredDocument({0!r})'.format(self.digest)
+
+
+class DocumentStore:
+    """Documents stored in a directory: `objects/` holds the compressed documents,
+    and `urls/` the digests of the documents downloaded from each URL.
+
+    :Example:
+
+    >>> store = DocumentStore('documents')
+    >>> edgar = EdgarData(store=store)
+    >>> filings = edgar.get_form_data(cik, date_start)  # the HTML of the filings is only read when accessed
+    """
+
+    def __init__(self, path, level=6):
+        """
+        :param path: Directory. Created if it doesn't exist.
+        :param level: Defaults to 6. zlib compression level.
+        """
+        self.path = path
+        self.level = level
+        for directory in ('objects', 'urls'):
+            os.makedirs(os.path.join(path, directory), exist_ok=True)
+
+    def put(self, document):
+        """Stores a document, unless it is already stored.
+
+        :param document: Document, as str.
+        :return: Digest of the document.
+        :rtype: str
+        """
+        data = document.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write(path, zlib.compress(data, self.level))
+
+        return digest
+
+    def get(self, digest):
+        """
+        :param digest: Digest of the document, as returned by `put`.
+        :rtype: str
+        """
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return zlib.decompress(f.read()).decode('utf-8')
+        except FileNotFoundError:
+            raise DocumentNotStored(digest)
+
+    def __contains__(self, digest):
+        return os.path.exists(self._object_path(digest))
+
+    def put_url(self, url, document):
+        """Stores a document downloaded from `url`.
+
+        :return: Digest of the document.
+        :rtype: str
+        """
+        digest = self.put(document)
+        self._write(self._url_path(url), digest.encode('ascii'))
+        return digest
+
+    def get_url(self, url):
+        """
+        :return: The document downloaded from `url`, or None if it is not stored.
+        :rtype: str
+        """
+        try:
+            with open(self._url_path(url), 'rb') as f:
+                digest = f.read().decode('ascii')
+            return self.get(digest)
+        except (FileNotFoundError, DocumentNotStored):
+            return None
+
+    def _object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest[2:])
+
+    def _url_path(self, url):
+        return os.path.join(self.path, 'urls', hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _write(path, data):
+        # Written whole or not at all, even with several threads or processes sharing the store:
+        # each write goes to its own temporary file
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
@@ -0,0 +1,110 @@
+"""Watermarks of the filings already synced, per company and form type, stored in a local SQLite database.
+
+The watermark of a company's form type is the filing date and accession number of the latest filing synced.
+Several filings can share a filing date, so the accession numbers of all the filings synced at the watermark date
+are kept too, telling which filings of that date are new.
+"""
+import sqlite3
+import threading
+from collections import namedtuple
+
+Watermark = namedtuple('Watermark', ['cik', 'form_type', 'filing_date', 'accession_number'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    cik TEXT NOT NULL,
+    form_type TEXT NOT NULL,
+    filing_date TEXT NOT NULL,
+    accession_number TEXT,
+    PRIMARY KEY (cik, form_type)
+);
+CREATE TABLE IF NOT EXISTS watermark_filings (
+    cik TEXT NOT NULL,
+    form_type TEXT NOT NULL,
+    accession_number TEXT NOT NULL,
+    PRIMARY KEY (cik, form_type, accession_number)
+);
+"""
+
+
+class SyncState:
+    """
+    :Example:
+
+    >>> state = SyncState('sync.db')
+    >>> edgar.sync(cik, state, form_types=['10-K'], date_start=datetime(2015, 1, 1))  # every 10-K since 2015
+    >>> edgar.sync(cik, state, form_types=['10-K'])  # only the 10-Ks filed since
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Database file. Created if it doesn't exist.
+        """
+        self.path = path
+        # Usable from several threads, one at a time
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def get(self, cik, form_type):
+        """
+        :return: The watermark, or None if the form type of the company has never been synced.
+        :rtype: Watermark
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT cik, form_type, filing_date, accession_number FROM watermarks WHERE cik = ? AND form_type = ?',
+                (cik, form_type)).fetchone()
+        return Watermark(*row) if row is not None else None
+
+    def watermarks(self):
+        """
+        :return: The watermarks of every company and form type synced.
+        :rtype: list[Watermark]
+        """
+        with self.lock:
+            return [Watermark(*row) for row in self.connection.execute(
+                'SELECT cik, form_type, filing_date, accession_number FROM watermarks ORDER BY cik, form_type')]
+
+    def is_new(self, cik, form_type, filing_date, accession_number):
+        """Whether a filing is newer than the watermark.
+
+        :param filing_date: Filing date, as 'YYYY-MM-DD'. None if unknown, in which case only filings synced at the
+            watermark date are known not to be new.
+        :rtype: bool
+        """
+        watermark = self.get(cik, form_type)
+        if watermark is None:
+            return True
+        if filing_date is not None and filing_date != watermark.filing_date:
+            return filing_date > watermark.filing_date
+
+        with self.lock:
+            return self.connection.execute(
+                'SELECT 1 FROM watermark_filings WHERE cik = ? AND form_type = ? AND accession_number = ?',
+                (cik, form_type, accession_number)).fetchone() is None
+
+    def advance(self, cik, form_type, filing_date, accession_number):
+        """Records a filing as synced, moving the watermark to it unless it is older.
+
+        :param filing_date: Filing date, as 'YYYY-MM-DD'.
+        """
+        with self.lock:
+            watermark = self.get(cik, form_type)
+            if watermark is not None and filing_date < watermark.filing_date:
+                return
+
+            with self.connection:
+                if watermark is None or filing_date > watermark.filing_date:
+                    self.connection.execute('DELETE FROM watermark_filings WHERE cik = ? AND form_type = ?',
+                                            (cik, form_type))
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO watermarks (cik, form_type, filing_date, accession_number) '
+                    'VALUES (?, ?, ?, ?)', (cik, form_type, filing_date, accession_number))
+                self.connection.execute(
+                    'INSERT OR IGNORE INTO watermark_filings (cik, form_type, accession_number) VALUES (?, ?, ?)',
+                    (cik, form_type, accession_number))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,181 @@
+"""Synthetic XBRL instance documents, with controlled numbers of contexts, facts, dimensions, units and text blocks,
+for tests and scaling benchmarks.
+
+Every document holds the facts `XBRL` needs to resolve its current period, with the values of `CURRENT_VALUES`
+for the current period and `PRIOR_RATIO` times them for the prior one. The other facts are of synthetic concepts,
+spread over every context.
+
+:Example:
+
+>>> document = synthetic_instance(contexts=1000, facts=20000, dimensions=2, units=3)
+>>> XBRL(document).fields['Revenues']
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+SYNTHETIC_NS = 'http://synthetic.edgar-data/2018'
+
+# Values of the current period, in USD
+INSTANT_VALUES = OrderedDict([
+    ('Assets', 5000000000),
+    ('AssetsCurrent', 2000000000),
+    ('Liabilities', 3000000000),
+    ('LiabilitiesCurrent', 1000000000),
+    ('StockholdersEquity', 2000000000),
+    ('LiabilitiesAndStockholdersEquity', 5000000000),
+])
+DURATION_VALUES = OrderedDict([
+    ('Revenues', 3000000000),
+    ('CostOfRevenue', 1800000000),
+    ('OperatingExpenses', 600000000),
+    ('OperatingIncomeLoss', 600000000),
+    ('IncomeTaxExpenseBenefit', 150000000),
+    ('NetIncomeLoss', 450000000),
+    ('CashAndCashEquivalentsPeriodIncreaseDecrease', 200000000),
+])
+CURRENT_VALUES = OrderedDict(list(INSTANT_VALUES.items()) + list(DURATION_VALUES.items()))
+PRIOR_RATIO = 0.9
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD', 'CNY']
+
+HEADER = ('<?xml version="1.0" encoding="utf-8"?>\n'
+          '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:xbrldi="http://xbrl.org/2006/xbrldi"'
+          ' xmlns:dei="http://xbrl.sec.gov/dei/2018-01-31" xmlns:us-gaap="http://fasb.org/us-gaap/2018-01-31"'
+          ' xmlns:iso4217="http://www.xbrl.org/2003/iso4217" xmlns:syn="{0}">\n'.format(SYNTHETIC_NS))
+CONTEXT = ('<xbrli:context id="{0}"><xbrli:entity><xbrli:identifier scheme="http://www.sec.gov/CIK">{1}'
+           '</xbrli:identifier>{2}</xbrli:entity><xbrli:period>{3}</xbrli:period></xbrli:context>\n')
+MEMBER = '<xbrldi:explicitMember dimension="syn:Axis{0}">syn:Axis{0}Member{1}</xbrldi:explicitMember>'
+DURATION = '<xbrli:startDate>{0}</xbrli:startDate><xbrli:endDate>{1}</xbrli:endDate>'
+INSTANT = '<xbrli:instant>{0}</xbrli:instant>'
+UNIT = '<xbrli:unit id="{0}"><xbrli:measure>{1}</xbrli:measure></xbrli:unit>\n'
+FACT = '<{0} contextRef="{1}" unitRef="{2}" decimals="-3">{3}</{0}>\n'
+TEXT_FACT = '<{0} contextRef="{1}">{2}</{0}>\n'
+PARAGRAPH = '<p>Synthetic disclosure of the notes to the financial statements.</p>'
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def _date(date):
+    return date.strftime(DATE_FORMAT)
+
+
+def _months_before(date, months):
+    """First day of the month `months` months before the month following `date`."""
+    month = date.year * 12 + date.month - months
+    return datetime(month // 12, month % 12 + 1, 1)
+
+
+def base_contexts(quarterly=False):
+    """Number of contexts without dimensions needed to resolve the periods."""
+    return 5 if quarterly else 4
+
+
+def base_facts(quarterly=False):
+    """Number of numeric facts holding the values of `CURRENT_VALUES`, for the current and prior periods."""
+    durations = 3 if quarterly else 2
+    return len(INSTANT_VALUES) * 2 + len(DURATION_VALUES) * durations
+
+
+def synthetic_instance(contexts=None, facts=None, dimensions=0, units=1, text_blocks=0, text_block_size=1000,
+                       quarterly=False, period_end='2018-12-31', cik='0000000001'):
+    """Valid XBRL instance document of a 10-K, or of a 10-Q.
+
+    :param contexts: Optional. Number of contexts, at least `base_contexts(quarterly)`, which it defaults to.
+        The contexts added to those of the periods have `dimensions` explicit members, or are the fiscal years
+        ending on the days before the prior period if `dimensions` is 0.
+    :param facts: Optional. Number of numeric facts, at least `base_facts(quarterly)`, which it defaults to.
+    :param dimensions: Defaults to 0. Number of axes qualifying each added context.
+    :param units: Defaults to 1. Number of units. The first is USD, the others are other currencies
+        then synthetic units, used by the added facts in turn.
+    :param text_blocks: Defaults to 0. Number of text block facts, of the current period.
+    :param text_block_size: Defaults to 1000. Size of the HTML of each text block, in characters, before escaping.
+    :param quarterly: Defaults to False. Whether the document is a 10-Q, with year-to-date and quarter contexts.
+    :param period_end: Defaults to '2018-12-31'. Document period end date, the last day of a month.
+    :type period_end: str
+    :rtype: bytes
+    """
+    minimum_contexts = base_contexts(quarterly)
+    minimum_facts = base_facts(quarterly)
+    contexts = minimum_contexts if contexts is None else contexts
+    facts = minimum_facts if facts is None else facts
+    if contexts < minimum_contexts:
+        raise ValueError('At least {0} contexts are needed.'.format(minimum_contexts))
+    if facts < minimum_facts:
+        raise ValueError('At least {0} facts are needed.'.format(minimum_facts))
+    if units < 1:
+        raise ValueError('At least 1 unit is needed.')
+
+    end = datetime.strptime(period_end, DATE_FORMAT)
+    prior_end = _months_before(end, 12) - timedelta(days=1)
+    if quarterly:
+        # Fiscal years are calendar years
+        year_start, prior_year_start = datetime(end.year, 1, 1), datetime(prior_end.year, 1, 1)
+    else:
+        year_start, prior_year_start = prior_end + timedelta(days=1), _months_before(prior_end, 12)
+
+    # Contexts of the current and prior periods, without dimensions: (id, period)
+    durations = [('D_CURRENT', (_date(year_start), _date(end))),
+                 ('D_PRIOR', (_date(prior_year_start), _date(prior_end)))]
+    if quarterly:
+        durations.append(('Q_CURRENT', (_date(_months_before(end, 3)), _date(end))))
+    instants = [('I_CURRENT', _date(end)), ('I_PRIOR', _date(prior_end))]
+    periods = [(context_id, DURATION.format(*dates)) for context_id, dates in durations]
+    periods += [(context_id, INSTANT.format(date)) for context_id, date in instants]
+
+    context_ids = []
+    parts = [HEADER]
+    for context_id, period in periods:
+        context_ids.append(context_id)
+        parts.append(CONTEXT.format(context_id, cik, '', period))
+    for number in range(contexts - minimum_contexts):
+        if dimensions:
+            _, period = periods[number % len(periods)]
+            members = ''.join(MEMBER.format(axis, number // len(periods)) for axis in range(dimensions))
+            segment = '<xbrli:segment>{0}</xbrli:segment>'.format(members)
+        else:
+            day = prior_end - timedelta(days=number + 1)
+            period = DURATION.format(_date(day - timedelta(days=364)), _date(day))
+            segment = ''
+        context_id = 'C{0}'.format(number)
+        context_ids.append(context_id)
+        parts.append(CONTEXT.format(context_id, cik, segment, period))
+
+    unit_ids = []
+    for number in range(units):
+        if number < len(CURRENCIES):
+            unit_id, measure = CURRENCIES[number], 'iso4217:' + CURRENCIES[number]
+        else:
+            unit_id, measure = 'U{0}'.format(number), 'syn:Unit{0}'.format(number)
+        unit_ids.append(unit_id)
+        parts.append(UNIT.format(unit_id, measure))
+
+    dei = [('DocumentType', '10-Q' if quarterly else '10-K'), ('DocumentPeriodEndDate', period_end),
+           ('DocumentFiscalYearFocus', str(end.year)),
+           ('DocumentFiscalPeriodFocus', 'Q{0}'.format((end.month - 1) // 3 + 1) if quarterly else 'FY'),
+           ('EntityRegistrantName', 'Synthetic Corp'), ('EntityCentralIndexKey', cik),
+           ('TradingSymbol', 'SYN')]
+    for name, value in dei:
+        parts.append(TEXT_FACT.format('dei:' + name, 'D_CURRENT', value))
+
+    for name, value in INSTANT_VALUES.items():
+        parts.append(FACT.format('us-gaap:' + name, 'I_CURRENT', 'USD', value))
+        parts.append(FACT.format('us-gaap:' + name, 'I_PRIOR', 'USD', int(value * PRIOR_RATIO)))
+    for name, value in DURATION_VALUES.items():
+        parts.append(FACT.format('us-gaap:' + name, 'D_CURRENT', 'USD', value))
+        parts.append(FACT.format('us-gaap:' + name, 'D_PRIOR', 'USD', int(value * PRIOR_RATIO)))
+        if quarterly:
+            parts.append(FACT.format('us-gaap:' + name, 'Q_CURRENT', 'USD', value // 3))
+
+    for number in range(facts - minimum_facts):
+        # Each concept has a fact in every context, so no context holds two facts of a concept
+        concept = 'syn:Concept{0}'.format(number // len(context_ids))
+        parts.append(FACT.format(concept, context_ids[number % len(context_ids)], unit_ids[number % units],
+                                 (number + 1) * 1000))
+
+    html = (PARAGRAPH * (text_block_size // len(PARAGRAPH) + 1))[:text_block_size]
+    for number in range(text_blocks):
+        parts.append(TEXT_FACT.format('syn:Disclosure{0}TextBlock'.format(number), 'D_CURRENT', escape(html)))
+
+    parts.append('</xbrli:xbrl>\n')
+    return ''.join(parts).encode('utf-8')
@@ -0,0 +1,99 @@
+"""Limits on the rate of the requests sent to the SEC, which bans clients sending more than 10 requests per second."""
+import os
+import tempfile
+import threading
+import time
+
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+
+class RateLimiter:
+    """Spaces requests evenly, at most `rate` per second, across all the threads sharing it.
+
+    :Example:
+
+    >>> limiter = RateLimiter(5)
+    >>> edgar = EdgarData(rate_limiter=limiter)
+    """
+
+    def __init__(self, rate=SEC_MAX_REQUESTS_PER_SECOND):
+        """
+        :param rate: Defaults to 10. Requests per second.
+        """
+        if rate <= 0:
+            raise ValueError('The rate must be positive.')
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def acquire(self):
+        """Waits until the next request can be sent.
+
+        :return: Seconds waited.
+        :rtype: float
+        """
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+            return wait
+        return 0.0
+
+
+DEFAULT_LOCK_PATH = os.path.join(tempfile.gettempdir(), 'edgar-data-requests.lock')
+
+
+class SharedRateLimiter:
+    """Spaces requests evenly, at most `rate` per second, across all the processes of the host using the same
+    lock file. The time of the next request is kept in the file, which is locked while it is updated.
+
+    Only available on Unix systems.
+
+    :Example:
+
+    >>> edgar = EdgarData(rate_limiter=SharedRateLimiter())  # in each process
+    """
+
+    def __init__(self, path=DEFAULT_LOCK_PATH, rate=SEC_MAX_REQUESTS_PER_SECOND):
+        """
+        :param path: Defaults to a file in the temporary directory. Lock file shared by the processes.
+        :param rate: Defaults to 10. Requests per second, for all the processes together.
+        """
+        if rate <= 0:
+            raise ValueError('The rate must be positive.')
+        self.path = path
+        self.interval = 1.0 / rate
+
+    def acquire(self):
+        """Waits until the next request can be sent.
+
+        :return: Seconds waited.
+        :rtype: float
+        """
+        import fcntl
+
+        with open(self.path, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    next_time = float(f.read())
+                except ValueError:
+                    next_time = 0.0
+
+                now = time.time()
+                wait = next_time - now
+                f.seek(0)
+                f.truncate()
+                f.write(repr(max(now, next_time) + self.interval).encode('ascii'))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        if wait > 0:
+            time.sleep(wait)
+            return wait
+        return 0.0
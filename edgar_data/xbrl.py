@@ -5,20 +5,57 @@
 #
 # The GAAP and IFRS data are changed to be None if missing, instead of 0
 
+import json
 import re
+import struct
+import zlib
+from collections import Counter, OrderedDict, namedtuple
+from io import BytesIO
 from datetime import datetime
 
 from lxml import etree
 from lxml.etree import XPathEvalError, XMLParser
 
 from edgar_data.currency import find_currency
+from .instrumentation import FUNDAMENTALS, PERIODS, XBRL_PARSE, stage
+from .metrics import XBRL_FAILURES, XBRL_PARSED, registry
 from .xbrl_fundamentals import FundamentantalAccountingConcepts
 
 
+XBRLI_NS = 'http://www.xbrl.org/2003/instance'
+XBRLDI_NS = 'http://xbrl.org/2006/xbrldi'
+# Namespaces of the Document and Entity Information taxonomies, e.g. 'http://xbrl.sec.gov/dei/2014-01-31'
+DEI_NS_PREFIX = 'http://xbrl.sec.gov/dei/'
+
+# Header of the serialized format: magic bytes and format version
+SERIALIZED_MAGIC = b'EDGX'
+SERIALIZED_VERSION = 1
+SERIALIZED_HEADER = struct.Struct('>4sH')
+
+BASE_INFORMATION = ['EntityRegistrantName', 'FiscalYear', 'EntityCentralIndexKey', 'EntityFilerCategory',
+                    'TradingSymbol', 'DocumentFiscalYearFocus', 'DocumentFiscalPeriodFocus', 'DocumentType']
+
+Context = namedtuple('Context', ['id', 'start_date', 'end_date', 'instant', 'dimensions'])
+Fact = namedtuple('Fact', ['concept', 'context_ref', 'unit_ref', 'text', 'nil'])
+Period = namedtuple('Period', ['start_date', 'end_date'])
+# Picklable outcome of parsing an instance, without any lxml tree
+ParsedXBRL = namedtuple('ParsedXBRL', ['fields', 'periods', 'contexts', 'currencies'])
+
+
 class EDGARPeriodError(Exception):
     """A period could not be found."""
 
 
+class XBRLFormatError(Exception):
+    """Serialized XBRL data is invalid, or of an unsupported version."""
+
+
+def _element_text(element):
+    if element is None or element.text is None:
+        return None
+    return element.text.strip()
+
+
 class Field:
     def __init__(self, value, unit_ref):
         self.value = value
@@ -37,6 +74,13 @@ class Field:
     def __sub__(self, other):
         return Field(self.value - other.value, self.unit_ref)
 
+    def __truediv__(self, other):
+        # Ratios are not bound to any unit
+        return self.value / float(other)
+
+    def __rtruediv__(self, other):
+        return other / self.value
+
     def __float__(self):
         return float(self.value)
 
@@ -68,32 +112,252 @@ class FieldsDataset:
 
 
 class XBRL:
-
-    def __init__(self, xbrl_doc):
+    # Whether to parse malformed documents as far as possible
+    recover = False
+    # Function receiving the timing of the parsing stages, see edgar_data.instrumentation
+    on_stage = None
+    # Counters of the documents parsed and of the failures, see edgar_data.metrics
+    metrics = registry
+
+    def __init__(self, xbrl_doc, concepts=None, numeric_only=False, on_stage=None, metrics=registry):
+        """
+        :param xbrl_doc: Instance document, as bytes.
+        :param concepts: Optional. Concepts whose values are read, e.g. ['us-gaap:Revenues'].
+        :param numeric_only: Defaults to False. Only read the values of numeric facts.
+            With `concepts` or `numeric_only`, the values of the other facts are discarded while parsing,
+            besides those of the dei taxonomy. The facts themselves are kept, without value,
+            so the periods are resolved as when reading every fact. The elements are freed once indexed:
+            `oInstance` only holds the root element, and `getNode` finds nothing.
+        :param on_stage: Optional. Function receiving a StageEvent for the parsing, the resolution of the periods
+            and the computation of the fundamentals.
+        :param metrics: Defaults to the registry of `edgar_data.metrics`. None to count nothing.
+        """
 
         self.fields = FieldsDataset()
+        if on_stage is not None:
+            self.on_stage = on_stage
+        self.metrics = metrics
 
         self.EntireInstanceDocument = xbrl_doc
-        p = XMLParser(huge_tree=True)
-        self.oInstance = etree.fromstring(self.EntireInstanceDocument, parser=p)
-        self.ns = {}
-        for k in list(self.oInstance.nsmap.keys()):
-            if k != None:
-                self.ns[k] = self.oInstance.nsmap[k]
-        self.ns['xbrli'] = 'http://www.xbrl.org/2003/instance'
-        self.ns['xlmns'] = 'http://www.xbrl.org/2003/instance'
-
-        self.GetBaseInformation()
+        with stage(self.on_stage, XBRL_PARSE) as parsing:
+            parsing.bytes = len(xbrl_doc)
+            if concepts is None and not numeric_only:
+                p = XMLParser(huge_tree=True, recover=self.recover)
+                self.oInstance = etree.fromstring(self.EntireInstanceDocument, parser=p)
+                self.IndexInstance()
+            else:
+                # Indexed while parsing
+                self.oInstance = self._parse_selected(concepts, numeric_only)
+            self.ns = {}
+            for k in list(self.oInstance.nsmap.keys()):
+                if k != None:
+                    self.ns[k] = self.oInstance.nsmap[k]
+            self.ns['xbrli'] = XBRLI_NS
+            self.ns['xlmns'] = XBRLI_NS
+
+            self.GetBaseInformation()
         self.loadYear(0)
+        if self.metrics is not None:
+            self.metrics.inc(XBRL_PARSED)
+
+    def _parse_selected(self, concepts, numeric_only):
+        """Parses and indexes the document as a stream, dropping the content of the facts not selected as soon as
+        each one is read, and freeing every element once indexed. Neither the large disclosures (e.g. the HTML
+        notes of `*TextBlock` facts) nor the tree of the document are ever held all at once.
+
+        :return: Root element, emptied.
+        """
+        context_tag = '{%s}context' % XBRLI_NS
+        unit_tag = '{%s}unit' % XBRLI_NS
+        namespaces = {}
+        selected = None
+
+        self.contexts = {}  # type: dict[str, Context]
+        self.units = {}  # type: dict[str, str]
+        self.facts = []  # type: list[Fact]
+        # Positions in self.facts of the facts being read, reserved at their start to keep the document order
+        positions = []
+        # Number of contexts, units and facts being read, whose elements can't be freed before their end
+        open_items = 0
+
+        events = etree.iterparse(BytesIO(self.EntireInstanceDocument), events=('start-ns', 'start', 'end'),
+                                 huge_tree=True, recover=self.recover)
+        for event, item in events:
+            if event == 'start-ns':
+                namespaces.setdefault(*item)
+                continue
+
+            tag = item.tag
+            if event == 'start':
+                if tag == context_tag or tag == unit_tag:
+                    open_items += 1
+                elif item.get('contextRef') is not None:
+                    open_items += 1
+                    positions.append(len(self.facts))
+                    self.facts.append(None)
+                continue
+
+            if tag == context_tag:
+                open_items -= 1
+                context = self._read_context(item)
+                self.contexts.setdefault(context.id, context)
+            elif tag == unit_tag:
+                open_items -= 1
+                measure = item.find('.//{%s}measure' % XBRLI_NS)
+                self.units.setdefault(item.get('id'), measure.text if measure is not None else None)
+            elif item.get('contextRef') is not None:
+                open_items -= 1
+                if concepts is not None and selected is None:
+                    # Prefixes are declared on the root, before any fact
+                    selected = set()
+                    for name in concepts:
+                        prefix, _, local_name = name.partition(':')
+                        if prefix in namespaces:
+                            selected.add('{%s}%s' % (namespaces[prefix], local_name))
+                # Facts with nested elements, which may be facts themselves, are read whole
+                if not len(item) and self._discard_value(item, selected, numeric_only):
+                    item.text = None
+                self.facts[positions.pop()] = self._read_fact(item)
+
+            if open_items or item.getparent() is None:
+                continue
+            # Indexed, as are the elements before it
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+
+        self.facts = [fact for fact in self.facts if fact is not None]
+        self._index_facts()
+        return events.root
+
+    def _discard_value(self, element, selected, numeric_only):
+        """Whether the value of a fact is discarded, as not selected."""
+        if numeric_only and element.get('unitRef') is not None:
+            return False
+        concept = self._concept(element)
+        if concept is None or concept.startswith('{' + DEI_NS_PREFIX):
+            return False
+        return selected is None or concept not in selected
+
+    def _concept(self, element):
+        """Concept of a fact element, in Clark notation."""
+        return element.tag
+
+    def IndexInstance(self):
+        """Walks the instance document once, indexing its contexts, units and facts.
+        Every later lookup (period resolution, fact values, segment breakdowns) is answered from these indexes.
+        """
+        context_tag = '{%s}context' % XBRLI_NS
+        unit_tag = '{%s}unit' % XBRLI_NS
+
+        self.contexts = {}  # type: dict[str, Context]
+        self.units = {}  # type: dict[str, str]
+        self.facts = []  # type: list[Fact]
+
+        for element in self.oInstance.iter():
+            tag = element.tag
+            if not isinstance(tag, str):
+                # Comments and processing instructions
+                continue
+
+            if tag == context_tag:
+                context = self._read_context(element)
+                self.contexts.setdefault(context.id, context)
+            elif tag == unit_tag:
+                measure = element.find('.//{%s}measure' % XBRLI_NS)
+                self.units.setdefault(element.get('id'), measure.text if measure is not None else None)
+            else:
+                fact = self._read_fact(element)
+                if fact is None:
+                    continue
+
+                self.facts.append(fact)
+
+        self._index_facts()
+
+    def _index_facts(self):
+        self._facts_by_concept = {}
+        self._fact_index = {}
+        self._dimensional_index = {}
+
+        for fact in self.facts:
+            self._facts_by_concept.setdefault(fact.concept, []).append(fact)
+            # Only the first fact in document order is used for a given concept and context
+            self._fact_index.setdefault((fact.concept, fact.context_ref), fact)
+
+            # Facts of contexts qualified by a single axis, by (concept, axis, period), then member in document order
+            context = self.contexts.get(fact.context_ref)
+            if context is None or len(context.dimensions) != 1:
+                continue
+
+            axis, member = context.dimensions[0]
+            members = self._dimensional_index.setdefault((fact.concept, axis, self._period(context)), OrderedDict())
+            members.setdefault(member, fact)
+
+    def _read_fact(self, element):
+        context_ref = element.get('contextRef')
+        if context_ref is None:
+            return None
+
+        return Fact(concept=element.tag, context_ref=context_ref, unit_ref=element.get('unitRef'),
+                    text=element.text, nil=element.get('nil') == 'true')
+
+    def _read_context(self, element):
+        period = element.find('{%s}period' % XBRLI_NS)
+        if period is None:
+            start_date = end_date = instant = None
+        else:
+            start_date = _element_text(period.find('{%s}startDate' % XBRLI_NS))
+            end_date = _element_text(period.find('{%s}endDate' % XBRLI_NS))
+            instant = _element_text(period.find('{%s}instant' % XBRLI_NS))
+
+        members = element.iterfind('{0}entity/{0}segment/{1}explicitMember'.format('{%s}' % XBRLI_NS,
+                                                                                    '{%s}' % XBRLDI_NS))
+        dimensions = tuple((member.get('dimension'), _element_text(member)) for member in members)
+
+        return Context(id=element.get('id'), start_date=start_date, end_date=end_date, instant=instant,
+                       dimensions=dimensions)
+
+    @staticmethod
+    def _period(context):
+        if context.instant is not None:
+            return Period(None, context.instant)
+        return Period(context.start_date, context.end_date)
+
+    def _clark(self, concept):
+        prefix, _, name = concept.partition(':')
+        if prefix not in self.ns:
+            return None
+        return '{%s}%s' % (self.ns[prefix], name)
+
+    def _facts_for(self, *concepts):
+        """All the facts of the given concepts, in document order."""
+        tags = {self._clark(concept) for concept in concepts}
+        if len(tags) == 1:
+            return list(self._facts_by_concept.get(tags.pop(), []))
+        return [fact for fact in self.facts if fact.concept in tags]
+
+    def _first_fact(self, *concepts):
+        facts = self._facts_for(*concepts)
+        if facts:
+            return facts[0]
+        return None
 
     def loadYear(self, yearminus=0, quarter=False):
-        currentEnd = self.getNode("//dei:DocumentPeriodEndDate").text
+        currentEnd = self._first_fact("dei:DocumentPeriodEndDate").text
         asdate = re.match('\s*(\d{4})-(\d{2})-(\d{2})\s*', currentEnd)
         if asdate:
             year = int(asdate.groups()[0]) - yearminus
             thisend = '%s-%s-%s' % (year, asdate.groups()[1], asdate.groups()[2])
-            self.GetCurrentPeriodAndContextInformation(thisend, quarter)
-            FundamentantalAccountingConcepts(self)
+            with stage(self.on_stage, PERIODS):
+                try:
+                    self.GetCurrentPeriodAndContextInformation(thisend, quarter)
+                except EDGARPeriodError:
+                    if self.metrics is not None:
+                        self.metrics.inc(XBRL_FAILURES, error='EDGARPeriodError')
+                    raise
+            with stage(self.on_stage, FUNDAMENTALS):
+                FundamentantalAccountingConcepts(self)
             return True
         else:
             #print(currentEnd, ' is not a date')
@@ -113,15 +377,17 @@ class XBRL:
             return oNodelist[0]
         return None
 
-    def GetFactValue(self, SeekConcept, ConceptPeriodType):
+    def GetFactValue(self, SeekConcept, ConceptPeriodType, fields=None):
+        if fields is None:
+            fields = self.fields
 
         factValue = None
         field = None
 
         if ConceptPeriodType == "Instant":
-            ContextReference = self.fields['ContextForInstants']
+            ContextReference = fields['ContextForInstants']
         elif ConceptPeriodType == "Duration":
-            ContextReference = self.fields['ContextForDurations']
+            ContextReference = fields['ContextForDurations']
         else:
             # An error occured
             return "CONTEXT ERROR"
@@ -129,86 +395,75 @@ class XBRL:
         if not ContextReference:
             return None
 
-        oNode = self.getNode("//" + SeekConcept + "[@contextRef='" + ContextReference + "']")
-        if oNode is not None:
-            factValue = oNode.text
-            if 'nil' in list(oNode.keys()) and oNode.get('nil') == 'true':
-                factValue = 0
-                # set the value to ZERO if it is nil
-            # if type(factValue)==str:
-            try:
-                factValue = float(factValue)
-            except:
-                #print('couldnt convert %s=%s to string' % (SeekConcept, factValue))
-                factValue = None
-                pass
-
-        if factValue is not None:
-            unit = self.getNode("//xbrli:unit[@id='" + oNode.attrib['unitRef'] + "']//xbrli:measure")
-            if unit is not None:
-                field = Field(value=factValue, unit_ref=unit.text)
-            else:
-                field = Field(value=factValue, unit_ref=None)
+        return self._field(self._fact_index.get((self._clark(SeekConcept), ContextReference)))
 
-        return field
+    def _field(self, fact):
+        if fact is None:
+            return None
 
-    def GetBaseInformation(self):
+        factValue = fact.text
+        if fact.nil:
+            factValue = 0
+            # set the value to ZERO if it is nil
+        try:
+            factValue = float(factValue)
+        except (TypeError, ValueError):
+            return None
 
-        # Registered Name
-        oNode = self.getNode("//dei:EntityRegistrantName[@contextRef]")
-        if oNode is not None:
-            self.fields['EntityRegistrantName'] = oNode.text
-        else:
-            self.fields['EntityRegistrantName'] = None
+        return Field(value=factValue, unit_ref=self.units.get(fact.unit_ref))
 
-        # Fiscal year
-        oNode = self.getNode("//dei:CurrentFiscalYearEndDate[@contextRef]")
-        if oNode is not None:
-            self.fields['FiscalYear'] = oNode.text
-        else:
-            self.fields['FiscalYear'] = None
+    def GetMemberValues(self, SeekConcept, Axis, period=None, fields=None):
+        """Values of a concept for every member of an axis, e.g. the revenues of each business segment.
+        Only the facts of contexts qualified by that axis alone are considered.
+        Answered from the indexes built when parsing, the instance document isn't walked again.
 
-        # EntityCentralIndexKey
-        oNode = self.getNode("//dei:EntityCentralIndexKey[@contextRef]")
-        if oNode is not None:
-            self.fields['EntityCentralIndexKey'] = oNode.text
-        else:
-            self.fields['EntityCentralIndexKey'] = None
+        :Example:
 
-        # EntityFilerCategory
-        oNode = self.getNode("//dei:EntityFilerCategory[@contextRef]")
-        if oNode is not None:
-            self.fields['EntityFilerCategory'] = oNode.text
-        else:
-            self.fields['EntityFilerCategory'] = None
+        >>> for member, field in xbrl.GetMemberValues('us-gaap:Revenues', 'us-gaap:StatementBusinessSegmentsAxis').items():
+        ...     print(member, field.value)
 
-        # TradingSymbol
-        oNode = self.getNode("//dei:TradingSymbol[@contextRef]")
-        if oNode is not None:
-            self.fields['TradingSymbol'] = oNode.text
-        else:
-            self.fields['TradingSymbol'] = None
+        :param SeekConcept: Concept, e.g. 'us-gaap:Revenues'.
+        :param Axis: Axis, as written in the contexts, e.g. 'us-gaap:StatementBusinessSegmentsAxis'.
+        :param period: Optional. `Period` of the facts, with a `start_date` of None for instants.
+                       Defaults to the period of the current contexts in `fields`.
+        :param fields: Optional. FieldsDataset holding the current contexts. Defaults to `self.fields`.
+        :return: Value of each member, in document order. Members with no numeric value are left out.
+        :rtype: OrderedDict[str, Field]
+        """
+        concept = self._clark(SeekConcept)
 
-        # DocumentFiscalYearFocus
-        oNode = self.getNode("//dei:DocumentFiscalYearFocus[@contextRef]")
-        if oNode is not None:
-            self.fields['DocumentFiscalYearFocus'] = oNode.text
+        if period is not None:
+            periods = [period]
         else:
-            self.fields['DocumentFiscalYearFocus'] = None
+            if fields is None:
+                fields = self.fields
+            periods = [self._period(self.contexts[fields[name]])
+                       for name in ('ContextForDurations', 'ContextForInstants') if fields[name] in self.contexts]
+
+        values = OrderedDict()
+        for period in periods:
+            members = self._dimensional_index.get((concept, Axis, period))
+            if members:
+                for member, fact in members.items():
+                    field = self._field(fact)
+                    if field is not None:
+                        values[member] = field
+                break
+
+        return values
 
-        # DocumentFiscalPeriodFocus
-        oNode = self.getNode("//dei:DocumentFiscalPeriodFocus[@contextRef]")	
-        if oNode is not None:
-            self.fields['DocumentFiscalPeriodFocus'] = oNode.text
-        else:
-            self.fields['DocumentFiscalPeriodFocus'] = None
+    def GetBaseInformation(self):
+        # Registered name, fiscal year, CIK, filer category, trading symbol, fiscal focus and document type
+        for name in BASE_INFORMATION:
+            if name == 'FiscalYear':
+                fact = self._first_fact("dei:CurrentFiscalYearEndDate")
+            else:
+                fact = self._first_fact("dei:" + name)
 
-        # DocumentType
-        oNode = self.getNode("//dei:DocumentType[@contextRef]")
-        if oNode is not None:
-            self.fields['DocumentType'] = oNode.text
-        else:
-            self.fields['DocumentType'] = None
+            if fact is not None:
+                self.fields[name] = fact.text
+            else:
+                self.fields[name] = None
 
     def GetCurrentPeriodAndContextInformation(self, EndDate, quarter=False):
         # Figures out the current period and contexts for the current period instance/duration contexts
@@ -221,74 +476,30 @@ class XBRL:
 
         # This finds the period end date for the database table, and instant date (for balance sheet):
         UseContext = "ERROR"
-        # EndDate = self.getNode("//dei:DocumentPeriodEndDate").text
-        # This is the <instant> or the <endDate>
 
         # Uses the concept ASSETS to find the correct instance context
         # This finds the Context ID for that end date (has correct <instant> date plus has no dimensions):
-        oNodelist2 = self.getNodeList(
-            "//us-gaap:Assets | //us-gaap:AssetsCurrent | //us-gaap:LiabilitiesAndStockholdersEquity")
-        # Nodelist of all the facts which are us-gaap:Assets
-        for i in oNodelist2:
-            # #print i.XML
-
-            ContextID = i.get('contextRef')
-            ContextPeriod = self.getNode("//xbrli:context[@id='" + ContextID + "']/xbrli:period/xbrli:instant").text
-            #print(ContextPeriod)
-
-            # Nodelist of all the contexts of the fact us-gaap:Assets
-            oNodelist3 = self.getNodeList("//xbrli:context[@id='" + ContextID + "']")
-            for j in oNodelist3:
+        for fact in self._facts_for("us-gaap:Assets", "us-gaap:AssetsCurrent",
+                                    "us-gaap:LiabilitiesAndStockholdersEquity"):
+            context = self.contexts.get(fact.context_ref)
+            if context is not None and context.instant == EndDate and not context.dimensions:
+                UseContext = fact.context_ref
 
-                # Nodes with the right period
-                if self.getNode("xbrli:period/xbrli:instant", j) is not None and self.getNode(
-                        "xbrli:period/xbrli:instant", j).text == EndDate:
-
-                    oNode4 = self.getNodeList("xbrli:entity/xbrli:segment/xbrldi:explicitMember", j)
-
-                    if not len(oNode4):
-                        UseContext = ContextID
-                        #print(UseContext)
+        #NOTE: if the DocumentPeriodEndDate is incorrect, this attempts to fix it by looking for a few commonly occuring concepts for the current period...
+        if UseContext == "ERROR":
+            fact = self._first_fact("dei:DocumentPeriodEndDate")
+            if fact is None:
+                fact = self._first_fact("us-gaap:OrganizationConsolidationAndPresentationOfFinancialStatementsDisclosureTextBlock",
+                                        "us-gaap:SignificantAccountingPoliciesTextBlock")
 
+            context = self.contexts.get(fact.context_ref) if fact is not None else None
+            ContextPeriod = context.end_date if context is not None else None
 
-        #NOTE: if the DocumentPeriodEndDate is incorrect, this attempts to fix it by looking for a few commonly occuring concepts for the current period...
-        if UseContext=="ERROR":
-            #print 'if the DocumentPeriodEndDate is incorrect, this attempts to fix it by looking for a few commonly occuring concepts for the current period...'                    
-            oNodelist_Error = self.getNode("//dei:DocumentPeriodEndDate")
-            if oNodelist_Error is None:
-                oNodelist_Error = self.getNode("//us-gaap:OrganizationConsolidationAndPresentationOfFinancialStatementsDisclosureTextBlock | //us-gaap:SignificantAccountingPoliciesTextBlock")
-            ##print "Nodelist, trying to find alternative: " + oNodelist_Error.length
-            
-            ContextID = oNodelist_Error.get('contextRef')
-            ContextPeriod = self.getNode("//xbrli:context[@id='" + ContextID + "']/xbrli:period/xbrli:endDate").text
-
-            #print "Found Alternative: " + ContextPeriod
-            
-            oNodelist3 = self.getNodeList("//xbrli:context[xbrli:period/xbrli:instant='" + ContextPeriod + "']")
-            ##print "Found alternative contexts:" + oNodelist3.length
-            
-            for j in oNodelist3:
-                ##print j.XML
-                
-                #Nodes with the right period
-                if self.getNode("xbrli:period/xbrli:instant",j).text==ContextPeriod:
-                    oNode4 = self.getNodeList("xbrli:entity/xbrli:segment/xbrldi:explicitMember",j)
-                    ##print "Found dimension: " + oNode4.XML
-                    #WHATS GOING ON HERE                
-                    
-                    if len(oNode4):
-                        #Not the right context
-                        #print "Note4: " + oNode4[0].text
-                        pass
-                    else:
-                        ##print "SELECTED CONTEXT: " + oNodelist3.Item(j).selectSingleNode("./@id").text 'oNodelist3(j).XML
-                        ContextID = j.get("id")
-                        UseContext = ContextID
-                        ##print UseContext
-                                        
-                    ##print j.XML
-                                    
-            #EndDate = ContextPeriod
+            if ContextPeriod is not None:
+                for context in self.contexts.values():
+                    # Nodes with the right period, and no dimensions
+                    if context.instant == ContextPeriod and not context.dimensions:
+                        UseContext = context.id
 
         ContextForInstants = UseContext
         self.fields['ContextForInstants'] = ContextForInstants
@@ -303,26 +514,20 @@ class XBRL:
         date_format = "%Y-%m-%d"
 
         if quarter:
-            all_contexts = self.getNodeList("//xbrli:context")
-
-            for context in all_contexts:
-                context_end_date = self.getNode("xbrli:period/xbrli:endDate", context)
+            for context in self.contexts.values():
                 # Nodes with the right period
-                if context_end_date is not None and context_end_date.text == EndDate:
+                if context.end_date == EndDate and not context.dimensions:
+                    StartDate = context.start_date
+                    end = datetime.strptime(EndDate, date_format)
+                    start = datetime.strptime(StartDate, date_format)
+                    old_start = datetime.strptime(StartDateYTD, date_format)
 
-                    has_dimensions = self.getNodeList("xbrli:entity/xbrli:segment/xbrldi:explicitMember", context)
-                    if not len(has_dimensions):
-                        StartDate = self.getNode("xbrli:period/xbrli:startDate", context).text
-                        end = datetime.strptime(EndDate, date_format)
-                        start = datetime.strptime(StartDate, date_format)
-                        old_start = datetime.strptime(StartDateYTD, date_format)
+                    delta = abs(end - start).days
+                    old_delta = abs(end - old_start).days
 
-                        delta = abs(end - start).days
-                        old_delta = abs(end - old_start).days
-
-                        if abs(delta - 90) < abs(old_delta - 90):
-                            StartDateYTD = StartDate
-                            UseContext = context.get('id')
+                    if abs(delta - 90) < abs(old_delta - 90):
+                        StartDateYTD = StartDate
+                        UseContext = context.id
 
             start = datetime.strptime(StartDateYTD, date_format)
             end = datetime.strptime(EndDate, date_format)
@@ -332,61 +537,23 @@ class XBRL:
                 raise EDGARPeriodError("Could not find a valid period QTD period.")
 
         else:
-            oNodelist2 = self.getNodeList("//us-gaap:CashAndCashEquivalentsPeriodIncreaseDecrease")
-            if not oNodelist2:
-                oNodelist2 = self.getNodeList("//us-gaap:CashPeriodIncreaseDecrease")
-                if not oNodelist2:
-                    oNodelist2 = self.getNodeList("//us-gaap:NetIncomeLoss")
-                    if not oNodelist2:
-                        oNodelist2 = self.getNodeList("//dei:DocumentPeriodEndDate")
-
-            for i in oNodelist2:
-                # #print i.XML
-
-                ContextID = i.get('contextRef')
-                ContextPeriod = self.getNode("//xbrli:context[@id='" + ContextID + "']/xbrli:period/xbrli:endDate")
-                # Usecontext = ContextID
-                # #print ContextPeriod
-
-                # Nodelist of all the contexts of the fact us-gaap:Assets
-                oNodelist3 = self.getNodeList("//xbrli:context[@id='" + ContextID + "']")
-                for j in oNodelist3:
-
-                    # Nodes with the right period
-                    if self.getNode("xbrli:period/xbrli:endDate", j).text == EndDate:
-
-                        oNode4 = self.getNodeList("xbrli:entity/xbrli:segment/xbrldi:explicitMember", j)
-
-                        if not len(oNode4):  # Making sure there are no dimensions. Is this the right way to do it?
-
-                            # Get the year-to-date context, not the current period
-                            StartDate = self.getNode("xbrli:period/xbrli:startDate", j).text
-                            #print("Context start date: " + StartDate)
-                            #print("YTD start date: " + StartDateYTD)
-
-                            if StartDate <= StartDateYTD:
-                                # MsgBox "YTD is greater"
-                                # Start date is for quarter
-                                #print("Context start date is less than current year to date, replace")
-                                #print("Context start date: " + StartDate)
-                                #print("Current min: " + StartDateYTD)
-
-                                StartDateYTD = StartDate
-                                UseContext = j.get('id')
-                                # MsgBox j.selectSingleNode("@id").text
-                            else:
-                                # MsgBox "Context is greater"
-                                # Start date is for year
-                                #print("Context start date is greater than YTD, keep current YTD")
-                                #print("Context start date: " + StartDate)
-
-                                StartDateYTD = StartDateYTD
-
-                            #print("Use context ID: " + UseContext)
-                            #print("Current min: " + StartDateYTD)
-                            #print(" ")
-
-                            #print("Use context: " + UseContext)
+            facts = (self._facts_for("us-gaap:CashAndCashEquivalentsPeriodIncreaseDecrease")
+                     or self._facts_for("us-gaap:CashPeriodIncreaseDecrease")
+                     or self._facts_for("us-gaap:NetIncomeLoss")
+                     or self._facts_for("dei:DocumentPeriodEndDate"))
+
+            for fact in facts:
+                context = self.contexts.get(fact.context_ref)
+
+                # Making sure there are no dimensions. Is this the right way to do it?
+                if context is not None and context.end_date == EndDate and not context.dimensions:
+
+                    # Get the year-to-date context, not the current period
+                    StartDate = context.start_date
+                    if StartDate <= StartDateYTD:
+                        # Start date is for quarter
+                        StartDateYTD = StartDate
+                        UseContext = context.id
 
         if StartDate == "ERROR" or StartDateYTD == "2099-01-01" or UseContext == "ERROR":
             raise EDGARPeriodError("Could not find a valid context.")
@@ -394,10 +561,7 @@ class XBRL:
         # Balance sheet date of current period
         self.fields['BalanceSheetDate'] = EndDate
 
-        # MsgBox "Instant context is: " + ContextForInstants
         if ContextForInstants == "ERROR":
-            # MsgBox "Looking for alternative instance context"
-
             ContextForInstants = self.LookForAlternativeInstanceContext()
             self.fields['ContextForInstants'] = ContextForInstants
 
@@ -411,17 +575,156 @@ class XBRL:
         # This deals with the situation where no instance context has no dimensions
         # Finds something
 
-        something = None
+        assets = self._clark("us-gaap:Assets")
 
         # See if there are any nodes with the document period focus date
-        oNodeList_Alt = self.getNodeList(
-            "//xbrli:context[xbrli:period/xbrli:instant='" + self.fields['BalanceSheetDate'] + "']")
-
-        # MsgBox "Node list length: " + oNodeList_Alt.length
-        for oNode_Alt in oNodeList_Alt:
-            # Found possible contexts
-            # MsgBox oNode_Alt.selectSingleNode("@id").text
-            something = self.getNode("//us-gaap:Assets[@contextRef='" + oNode_Alt.get("id") + "']")
-            if something:
-                # MsgBox "Use this context: " + oNode_Alt.selectSingleNode("@id").text
-                return oNode_Alt.get("id")
+        for context in self.contexts.values():
+            if context.instant == self.fields['BalanceSheetDate'] and (assets, context.id) in self._fact_index:
+                # Found possible contexts
+                return context.id
+
+    def GetAllPeriods(self):
+        """Computes the fundamentals for every non-dimensional period reported in the instance document,
+        e.g. the current and prior years of a 10-K, or the QTD and YTD periods of a 10-Q.
+        The instance is not walked again: all periods are resolved from the contexts and facts indexed when parsing.
+        `self.fields` is left untouched.
+
+        :Example:
+
+        >>> xbrl = XBRL(xbrl_doc)
+        >>> for period, fields in xbrl.GetAllPeriods().items():
+        ...     print(period.start_date, period.end_date, fields['Revenues'])
+
+        :return: Fields of each period, most recent first, keyed by `Period(start_date, end_date)`.
+                 Balance sheet dates with no duration ending on them have a `start_date` of None.
+        :rtype: OrderedDict[Period, FieldsDataset]
+        """
+        facts_per_context = Counter(fact.context_ref for fact in self.facts)
+
+        # For each period, the non-dimensional context holding the most facts
+        duration_contexts = {}
+        instant_contexts = {}
+        for context in self.contexts.values():
+            if context.dimensions or not facts_per_context[context.id]:
+                continue
+
+            if context.instant is not None:
+                contexts, key = instant_contexts, context.instant
+            elif context.start_date is not None and context.end_date is not None:
+                contexts, key = duration_contexts, Period(context.start_date, context.end_date)
+            else:
+                continue
+
+            if key not in contexts or facts_per_context[context.id] > facts_per_context[contexts[key]]:
+                contexts[key] = context.id
+
+        periods = list(duration_contexts)
+        duration_ends = {period.end_date for period in periods}
+        periods.extend(Period(None, instant) for instant in instant_contexts if instant not in duration_ends)
+        periods.sort(key=lambda period: (period.end_date, period.start_date or ''), reverse=True)
+
+        all_periods = OrderedDict()
+        for period in periods:
+            fields = FieldsDataset()
+            for name in BASE_INFORMATION:
+                fields[name] = self.fields[name]
+
+            fields['BalanceSheetDate'] = period.end_date
+            fields['IncomeStatementPeriodYTD'] = period.start_date
+            fields['ContextForInstants'] = instant_contexts.get(period.end_date)
+            fields['ContextForDurations'] = duration_contexts.get(period)
+
+            FundamentantalAccountingConcepts(self, fields=fields)
+            all_periods[period] = fields
+
+        return all_periods
+
+    def GetSummary(self, all_periods=False):
+        """Compact, picklable outcome of the parsing, e.g. to send it across processes.
+
+        :param all_periods: Defaults to False. Whether to compute the fields of every period, as in `GetAllPeriods`.
+        :return: Fields of the current period, fields of every period (None unless `all_periods`),
+                 contexts by id and currency by unit id (None for units that are not currencies).
+        :rtype: ParsedXBRL
+        """
+        currencies = {unit_id: find_currency(measure) if measure else None for unit_id, measure in self.units.items()}
+        periods = self.GetAllPeriods() if all_periods else None
+        return ParsedXBRL(self.fields, periods, dict(self.contexts), currencies)
+
+    def to_bytes(self):
+        """Serializes the parsed facts, contexts, units and current fields in a compact, versioned binary format.
+        The instance document itself is not kept.
+
+        :Example:
+
+        >>> data = XBRL(xbrl_doc).to_bytes()
+        >>> xbrl = XBRL.from_bytes(data)
+
+        :rtype: bytes
+        """
+        concepts = list(self._facts_by_concept)
+        concept_ids = {concept: i for i, concept in enumerate(concepts)}
+
+        fields = {}
+        for name, value in self.fields.fields.items():
+            # Fields are stored as [value, unit_ref], other values as they are
+            fields[name] = [value.value, value.unit_ref] if isinstance(value, Field) else value
+
+        payload = {
+            'ns': self.ns,
+            'contexts': [[context.id, context.start_date, context.end_date, context.instant, context.dimensions]
+                         for context in self.contexts.values()],
+            'units': self.units,
+            'concepts': concepts,
+            'facts': [[concept_ids[fact.concept], fact.context_ref, fact.unit_ref, fact.text, fact.nil]
+                      for fact in self.facts],
+            'fields': fields,
+        }
+        body = zlib.compress(json.dumps(payload, separators=(',', ':')).encode())
+
+        return SERIALIZED_HEADER.pack(SERIALIZED_MAGIC, SERIALIZED_VERSION) + body
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Loads an instance serialized with `to_bytes`, without parsing any XML.
+        Everything is available but the lxml tree (`oInstance`, `getNode`).
+
+        :param data: Serialized instance.
+        :raises XBRLFormatError: If `data` is not a serialized instance, or its version is not supported.
+        :rtype: XBRL
+        """
+        try:
+            magic, version = SERIALIZED_HEADER.unpack_from(data)
+        except struct.error:
+            raise XBRLFormatError('Not a serialized XBRL instance')
+        if magic != SERIALIZED_MAGIC:
+            raise XBRLFormatError('Not a serialized XBRL instance')
+        if version != SERIALIZED_VERSION:
+            raise XBRLFormatError('Unsupported serialization version: {0}'.format(version))
+
+        try:
+            payload = json.loads(zlib.decompress(data[SERIALIZED_HEADER.size:]).decode())
+        except (zlib.error, ValueError):
+            raise XBRLFormatError('Corrupted serialized XBRL instance')
+
+        xbrl = cls.__new__(cls)
+        xbrl.EntireInstanceDocument = None
+        xbrl.oInstance = None
+        xbrl.ns = payload['ns']
+
+        xbrl.contexts = OrderedDict()
+        for context_id, start_date, end_date, instant, dimensions in payload['contexts']:
+            xbrl.contexts[context_id] = Context(context_id, start_date, end_date, instant,
+                                                tuple(tuple(dimension) for dimension in dimensions))
+        xbrl.units = payload['units']
+
+        concepts = payload['concepts']
+        xbrl.facts = [Fact(concepts[concept_id], context_ref, unit_ref, text, nil)
+                      for concept_id, context_ref, unit_ref, text, nil in payload['facts']]
+        xbrl._index_facts()
+
+        xbrl.fields = FieldsDataset()
+        for name, value in payload['fields'].items():
+            xbrl.fields[name] = Field(*value) if isinstance(value, list) else value
+
+        return xbrl
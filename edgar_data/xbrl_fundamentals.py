@@ -2,893 +2,649 @@
 # This module uses Open Source components. You can find the source code
 # for the full project in the url below:
 # https://github.com/lukerosiak/pysec
+#
+# The fallback chains and imputations of pysec are expressed as data (see FUNDAMENTALS_PLAN below),
+# and evaluated in the order they are declared, either for one period of a filing or, on NumPy arrays,
+# for a batch of filings at once.
 
-class FundamentantalAccountingConcepts:
-
-    def __init__(self, xbrl, no_output=True):
-
-        self.xbrl = xbrl
+from operator import add, sub
 
-        if not no_output:
-            print(" ")
-            print("FUNDAMENTAL ACCOUNTING CONCEPTS CHECK REPORT:")
+INSTANT = "Instant"
+DURATION = "Duration"
 
-            print("Entity regiant name: %s" % self.xbrl.fields['EntityRegistrantName'])
-            print("CIK: %s" % self.xbrl.fields['EntityCentralIndexKey'])
-            print("Entity filer category: %s" % self.xbrl.fields['EntityFilerCategory'])
-            print("Trading symbol: %s" % self.xbrl.fields['TradingSymbol'])
-            print("Fiscal year: %s" % self.xbrl.fields['DocumentFiscalYearFocus'])
-            print("Fiscal period: %s" % self.xbrl.fields['DocumentFiscalPeriodFocus'])
-            print("Document type: %s" % self.xbrl.fields['DocumentType'])
+# What happens when a step of a stage raises
+RAISE = 'raise'  # the error propagates
+SKIP = 'skip'  # the failing step is skipped
+ABORT = 'abort'  # the remaining steps of the stage are skipped
 
-            print("Balance Sheet Date (document period end date): %s" % self.xbrl.fields['BalanceSheetDate'])
-            print("Income Statement Period (YTD, current period, period start date): %s to %s" % (
-                self.xbrl.fields['IncomeStatementPeriodYTD'], self.xbrl.fields['BalanceSheetDate']))
 
-            print("Context ID for document period focus (instants): %s" % self.xbrl.fields['ContextForInstants'])
-            print("Context ID for YTD period (durations): %s" % self.xbrl.fields['ContextForDurations'])
-            print(" ")
+class Lookup:
+    """Sets `field` to the value of the first of `concepts` reported for the period.
 
-        # Assets
-        self.xbrl.fields['Assets'] = self.xbrl.GetFactValue("us-gaap:Assets", "Instant")
-
-        # Current Assets
-        self.xbrl.fields['CurrentAssets'] = self.xbrl.GetFactValue("us-gaap:AssetsCurrent", "Instant")
-
-        # Noncurrent Assets
-        self.xbrl.fields['NoncurrentAssets'] = self.xbrl.GetFactValue("us-gaap:AssetsNoncurrent", "Instant")
-        if self.xbrl.fields['NoncurrentAssets'] is None:
-            if self.xbrl.fields['Assets'] and self.xbrl.fields['CurrentAssets']:
-                self.xbrl.fields['NoncurrentAssets'] = self.xbrl.fields['Assets'] - self.xbrl.fields['CurrentAssets']
-
-        # LiabilitiesAndEquity
-        self.xbrl.fields['LiabilitiesAndEquity'] = self.xbrl.GetFactValue("us-gaap:LiabilitiesAndStockholdersEquity",
-                                                                          "Instant")
-        if self.xbrl.fields['LiabilitiesAndEquity'] is None:
-            self.xbrl.fields['LiabilitiesAndEquity'] = self.xbrl.GetFactValue("us-gaap:LiabilitiesAndPartnersCapital",
-                                                                              "Instant")
-
-        # Liabilities
-        self.xbrl.fields['Liabilities'] = self.xbrl.GetFactValue("us-gaap:Liabilities", "Instant")
-
-        # CurrentLiabilities
-        self.xbrl.fields['CurrentLiabilities'] = self.xbrl.GetFactValue("us-gaap:LiabilitiesCurrent", "Instant")
-
-        # Noncurrent Liabilities
-        self.xbrl.fields['NoncurrentLiabilities'] = self.xbrl.GetFactValue("us-gaap:LiabilitiesNoncurrent", "Instant")
-        if self.xbrl.fields['NoncurrentLiabilities'] is None:
-            if self.xbrl.fields['Liabilities'] and self.xbrl.fields['CurrentLiabilities']:
-                self.xbrl.fields['NoncurrentLiabilities'] = self.xbrl.fields['Liabilities'] - self.xbrl.fields[
-                    'CurrentLiabilities']
-
-        # CommitmentsAndContingencies
-        self.xbrl.fields['CommitmentsAndContingencies'] = self.xbrl.GetFactValue("us-gaap:CommitmentsAndContingencies",
-                                                                                 "Instant")
-
-        # TemporaryEquity
-        self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue("us-gaap:TemporaryEquityRedemptionValue",
-                                                                     "Instant")
-        if self.xbrl.fields['TemporaryEquity'] is None:
-            self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue(
-                "us-gaap:RedeemablePreferredStockCarryingAmount", "Instant")
-            if self.xbrl.fields['TemporaryEquity'] is None:
-                self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue("us-gaap:TemporaryEquityCarryingAmount",
-                                                                             "Instant")
-                if self.xbrl.fields['TemporaryEquity'] is None:
-                    self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue(
-                        "us-gaap:TemporaryEquityValueExcludingAdditionalPaidInCapital", "Instant")
-                    if self.xbrl.fields['TemporaryEquity'] is None:
-                        self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue(
-                            "us-gaap:TemporaryEquityCarryingAmountAttributableToParent", "Instant")
-                        if self.xbrl.fields['TemporaryEquity'] is None:
-                            self.xbrl.fields['TemporaryEquity'] = self.xbrl.GetFactValue(
-                                "us-gaap:RedeemableNoncontrollingInterestEquityFairValue", "Instant")
-
-        RedeemableNoncontrollingInterest = self.xbrl.GetFactValue(
-            "us-gaap:RedeemableNoncontrollingInterestEquityCarryingAmount", "Instant")
-        if RedeemableNoncontrollingInterest == None:
-            RedeemableNoncontrollingInterest = self.xbrl.GetFactValue(
-                "us-gaap:RedeemableNoncontrollingInterestEquityCommonCarryingAmount", "Instant")
-
-        # This adds redeemable noncontrolling interest and temporary equity which are rare, but can be reported seperately
-        if self.xbrl.fields['TemporaryEquity'] and RedeemableNoncontrollingInterest:
-            self.xbrl.fields['TemporaryEquity'] = float(self.xbrl.fields['TemporaryEquity']) + float(
-                RedeemableNoncontrollingInterest)
-
-        # Equity
-        self.xbrl.fields['Equity'] = self.xbrl.GetFactValue(
-            "us-gaap:StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest", "Instant")
-        if self.xbrl.fields['Equity'] is None:
-            self.xbrl.fields['Equity'] = self.xbrl.GetFactValue("us-gaap:StockholdersEquity", "Instant")
-            if self.xbrl.fields['Equity'] is None:
-                self.xbrl.fields['Equity'] = self.xbrl.GetFactValue(
-                    "us-gaap:PartnersCapitalIncludingPortionAttributableToNoncontrollingInterest", "Instant")
-                if self.xbrl.fields['Equity'] is None:
-                    self.xbrl.fields['Equity'] = self.xbrl.GetFactValue("us-gaap:PartnersCapital", "Instant")
-                    if self.xbrl.fields['Equity'] is None:
-                        self.xbrl.fields['Equity'] = self.xbrl.GetFactValue("us-gaap:CommonStockholdersEquity",
-                                                                            "Instant")
-                        if self.xbrl.fields['Equity'] is None:
-                            self.xbrl.fields['Equity'] = self.xbrl.GetFactValue("us-gaap:MemberEquity", "Instant")
-                            if self.xbrl.fields['Equity'] is None:
-                                self.xbrl.fields['Equity'] = self.xbrl.GetFactValue("us-gaap:AssetsNet", "Instant")
-
-        # EquityAttributableToNoncontrollingInterest
-        self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] = self.xbrl.GetFactValue(
-            "us-gaap:MinorityInterest", "Instant")
-        if self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is None:
-            self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] = self.xbrl.GetFactValue(
-                "us-gaap:PartnersCapitalAttributableToNoncontrollingInterest", "Instant")
-
-        # EquityAttributableToParent
-        self.xbrl.fields['EquityAttributableToParent'] = self.xbrl.GetFactValue("us-gaap:StockholdersEquity", "Instant")
-        if self.xbrl.fields['EquityAttributableToParent'] is None:
-            self.xbrl.fields['EquityAttributableToParent'] = self.xbrl.GetFactValue(
-                "us-gaap:LiabilitiesAndPartnersCapital", "Instant")
-
-        # Added to fix Assets
-        if self.xbrl.fields['Assets'] is None \
-                and self.xbrl.fields['LiabilitiesAndEquity'] is not None \
-                and self.xbrl.fields['CurrentAssets'] == self.xbrl.fields['LiabilitiesAndEquity']:
-            self.xbrl.fields['Assets'] = self.xbrl.fields['CurrentAssets']
-
-        # Added to fix Assets even more
-        if self.xbrl.fields['Assets'] is None \
-                and self.xbrl.fields['NoncurrentAssets'] is None \
-                and self.xbrl.fields['LiabilitiesAndEquity'] is not None \
-                and self.xbrl.fields['Liabilities'] is not None \
-                and self.xbrl.fields['Equity'] is not None \
-                and (self.xbrl.fields['LiabilitiesAndEquity'] == self.xbrl.fields['Liabilities'] + self.xbrl.fields[
-            'Equity']):
-            self.xbrl.fields['Assets'] = self.xbrl.fields['CurrentAssets']
-
-        if self.xbrl.fields['Assets'] is not None and self.xbrl.fields['CurrentAssets'] is not None:
-            self.xbrl.fields['NoncurrentAssets'] = self.xbrl.fields['Assets'] - self.xbrl.fields['CurrentAssets']
-
-        if self.xbrl.fields['LiabilitiesAndEquity'] is None and self.xbrl.fields['Assets'] is not None:
-            self.xbrl.fields['LiabilitiesAndEquity'] = self.xbrl.fields['Assets']
-
-        # Impute: Equity based no parent and noncontrolling interest being present
-        if self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is not None \
-                and self.xbrl.fields['EquityAttributableToParent'] is not None:
-            self.xbrl.fields['Equity'] = self.xbrl.fields['EquityAttributableToParent'] + self.xbrl.fields[
-                'EquityAttributableToNoncontrollingInterest']
-
-        if self.xbrl.fields['Equity'] is None \
-                and self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is None \
-                and self.xbrl.fields['EquityAttributableToParent'] is not None:
-            self.xbrl.fields['Equity'] = self.xbrl.fields['EquityAttributableToParent']
-
-        if self.xbrl.fields['Equity'] is None \
-                and self.xbrl.fields['EquityAttributableToParent'] is not None \
-                and self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is not None:
-            self.xbrl.fields['Equity'] = self.xbrl.fields['EquityAttributableToParent'] + \
-                                         self.xbrl.fields['EquityAttributableToNoncontrollingInterest']
-
-        # Added: Impute Equity attributable to parent based on existence of equity and noncontrolling interest.
-        if self.xbrl.fields['Equity'] is not None \
-                and self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is not None \
-                and self.xbrl.fields['EquityAttributableToParent'] is None:
-            self.xbrl.fields['EquityAttributableToParent'] = self.xbrl.fields['Equity'] - \
-                                                             self.xbrl.fields[
-                                                                 'EquityAttributableToNoncontrollingInterest']
-
-        # Added: Impute Equity attributable to parent based on existence of equity and noncontrolling interest.
-        if self.xbrl.fields['Equity'] is not None \
-                and self.xbrl.fields['EquityAttributableToNoncontrollingInterest'] is None \
-                and self.xbrl.fields['EquityAttributableToParent'] is None:
-            self.xbrl.fields['EquityAttributableToParent'] = self.xbrl.fields['Equity']
-
-        # if total liabilities is missing, figure it out based on liabilities and equity
-        if self.xbrl.fields['Liabilities'] is None \
-                and self.xbrl.fields['Equity'] is not None \
-                and self.xbrl.fields['LiabilitiesAndEquity'] is not None \
-                and self.xbrl.fields['CommitmentsAndContingencies'] is not None \
-                and self.xbrl.fields['TemporaryEquity'] is not None:
-            self.xbrl.fields['Liabilities'] = self.xbrl.fields['LiabilitiesAndEquity'] - (
-                    self.xbrl.fields['CommitmentsAndContingencies'] + self.xbrl.fields['TemporaryEquity'] +
-                    self.xbrl.fields['Equity'])
-
-        # This seems incorrect because liabilities might not be reported
-        if self.xbrl.fields['Liabilities'] is not None and self.xbrl.fields['CurrentLiabilities'] is not None:
-            self.xbrl.fields['NoncurrentLiabilities'] = self.xbrl.fields['Liabilities'] - \
-                                                        self.xbrl.fields['CurrentLiabilities']
-        # Added to fix liabilities based on current liabilities
-        if self.xbrl.fields['Liabilities'] is None \
-                and self.xbrl.fields['CurrentLiabilities'] is not None \
-                and self.xbrl.fields['NoncurrentLiabilities'] is None:
-            self.xbrl.fields['Liabilities'] = self.xbrl.fields['CurrentLiabilities']
-
-        # Income statement
-        # Revenues
-        self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue("us-gaap:Revenues", "Duration")
-        if self.xbrl.fields['Revenues'] is None:
-            self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue("us-gaap:SalesRevenueNet", "Duration")
-            if self.xbrl.fields['Revenues'] is None:
-                self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue("us-gaap:SalesRevenueServicesNet", "Duration")
-                if self.xbrl.fields['Revenues'] is None:
-                    self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue("us-gaap:RevenuesNetOfInterestExpense",
-                                                                          "Duration")
-                    if self.xbrl.fields['Revenues'] is None:
-                        self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                            "us-gaap:RegulatedAndUnregulatedOperatingRevenue", "Duration")
-                        if self.xbrl.fields['Revenues'] is None:
-                            self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                "us-gaap:HealthCareOrganizationRevenue", "Duration")
-                            if self.xbrl.fields['Revenues'] is None:
-                                self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                    "us-gaap:InterestAndDividendIncomeOperating", "Duration")
-                                if self.xbrl.fields['Revenues'] is None:
-                                    self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                        "us-gaap:RealEstateRevenueNet", "Duration")
-                                    if self.xbrl.fields['Revenues'] is None:
-                                        self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                            "us-gaap:RevenueMineralSales", "Duration")
-                                        if self.xbrl.fields['Revenues'] is None:
-                                            self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                                "us-gaap:OilAndGasRevenue", "Duration")
-                                            if self.xbrl.fields['Revenues'] is None:
-                                                self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                                    "us-gaap:FinancialServicesRevenue", "Duration")
-                                                if self.xbrl.fields['Revenues'] is None:
-                                                    self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue(
-                                                        "us-gaap:RegulatedAndUnregulatedOperatingRevenue", "Duration")
-
-        # CostOfRevenue
-        self.xbrl.fields['CostOfRevenue'] = self.xbrl.GetFactValue("us-gaap:CostOfRevenue", "Duration")
-        if self.xbrl.fields['CostOfRevenue'] is None:
-            self.xbrl.fields['CostOfRevenue'] = self.xbrl.GetFactValue("us-gaap:CostOfServices", "Duration")
-            if self.xbrl.fields['CostOfRevenue'] is None:
-                self.xbrl.fields['CostOfRevenue'] = self.xbrl.GetFactValue("us-gaap:CostOfGoodsSold", "Duration")
-                if self.xbrl.fields['CostOfRevenue'] is None:
-                    self.xbrl.fields['CostOfRevenue'] = self.xbrl.GetFactValue("us-gaap:CostOfGoodsAndServicesSold",
-                                                                               "Duration")
-
-        # GrossProfit
-        self.xbrl.fields['GrossProfit'] = self.xbrl.GetFactValue("us-gaap:GrossProfit", "Duration")
-        if self.xbrl.fields['GrossProfit'] is None:
-            self.xbrl.fields['GrossProfit'] = self.xbrl.GetFactValue("us-gaap:GrossProfit", "Duration")
-
-        # OperatingExpenses
-        self.xbrl.fields['OperatingExpenses'] = self.xbrl.GetFactValue("us-gaap:OperatingExpenses", "Duration")
-        if self.xbrl.fields['OperatingExpenses'] is None:
-            self.xbrl.fields['OperatingExpenses'] = self.xbrl.GetFactValue("us-gaap:OperatingCostsAndExpenses",
-                                                                           "Duration")  # This concept seems incorrect.
-
-        # CostsAndExpenses
-        self.xbrl.fields['CostsAndExpenses'] = self.xbrl.GetFactValue("us-gaap:CostsAndExpenses", "Duration")
-        if self.xbrl.fields['CostsAndExpenses'] is None:
-            self.xbrl.fields['CostsAndExpenses'] = self.xbrl.GetFactValue("us-gaap:CostsAndExpenses", "Duration")
-
-        # OtherOperatingIncome
-        self.xbrl.fields['OtherOperatingIncome'] = self.xbrl.GetFactValue("us-gaap:OtherOperatingIncome", "Duration")
-        if self.xbrl.fields['OtherOperatingIncome'] is None:
-            self.xbrl.fields['OtherOperatingIncome'] = self.xbrl.GetFactValue("us-gaap:OtherOperatingIncome",
-                                                                              "Duration")
-
-        # OperatingIncomeLoss
-        self.xbrl.fields['OperatingIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:OperatingIncomeLoss", "Duration")
-        if self.xbrl.fields['OperatingIncomeLoss'] is None:
-            self.xbrl.fields['OperatingIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:OperatingIncomeLoss", "Duration")
-
-        # NonoperatingIncomeLoss
-        self.xbrl.fields['NonoperatingIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:NonoperatingIncomeExpense",
-                                                                            "Duration")
-        if self.xbrl.fields['NonoperatingIncomeLoss'] is None:
-            self.xbrl.fields['NonoperatingIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:NonoperatingIncomeExpense",
-                                                                                "Duration")
-
-        # InterestAndDebtExpense
-        self.xbrl.fields['InterestAndDebtExpense'] = self.xbrl.GetFactValue("us-gaap:InterestAndDebtExpense",
-                                                                            "Duration")
-        if self.xbrl.fields['InterestAndDebtExpense'] is None:
-            self.xbrl.fields['InterestAndDebtExpense'] = self.xbrl.GetFactValue("us-gaap:InterestAndDebtExpense",
-                                                                                "Duration")
-
-        # IncomeBeforeEquityMethodInvestments
-        self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] = self.xbrl.GetFactValue(
-            "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments",
-            "Duration")
-
-        # IncomeFromEquityMethodInvestments
-        self.xbrl.fields['IncomeFromEquityMethodInvestments'] = self.xbrl.GetFactValue(
-            "us-gaap:IncomeLossFromEquityMethodInvestments", "Duration")
-        if self.xbrl.fields['IncomeFromEquityMethodInvestments'] is None:
-            self.xbrl.fields['IncomeFromEquityMethodInvestments'] = self.xbrl.GetFactValue(
-                "us-gaap:IncomeLossFromEquityMethodInvestments", "Duration")
-
-        # IncomeFromContinuingOperationsBeforeTax
-        self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] = self.xbrl.GetFactValue(
-            "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments",
-            "Duration")
-        if self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is None:
-            self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] = self.xbrl.GetFactValue(
-                "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest",
-                "Duration")
-
-        # IncomeTaxExpenseBenefit
-        self.xbrl.fields['IncomeTaxExpenseBenefit'] = self.xbrl.GetFactValue("us-gaap:IncomeTaxExpenseBenefit",
-                                                                             "Duration")
-        if self.xbrl.fields['IncomeTaxExpenseBenefit'] is None:
-            self.xbrl.fields['IncomeTaxExpenseBenefit'] = self.xbrl.GetFactValue(
-                "us-gaap:IncomeTaxExpenseBenefitContinuingOperations", "Duration")
-
-        # IncomeFromContinuingOperationsAfterTax
-        self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] = self.xbrl.GetFactValue(
-            "us-gaap:IncomeLossBeforeExtraordinaryItemsAndCumulativeEffectOfChangeInAccountingPrinciple", "Duration")
-        if self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] is None:
-            self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] = self.xbrl.GetFactValue(
-                "us-gaap:IncomeLossBeforeExtraordinaryItemsAndCumulativeEffectOfChangeInAccountingPrinciple",
-                "Duration")
-
-        # IncomeFromDiscontinuedOperations
-        self.xbrl.fields['IncomeFromDiscontinuedOperations'] = self.xbrl.GetFactValue(
-            "us-gaap:IncomeLossFromDiscontinuedOperationsNetOfTax", "Duration")
-        if self.xbrl.fields['IncomeFromDiscontinuedOperations'] is None:
-            self.xbrl.fields['IncomeFromDiscontinuedOperations'] = self.xbrl.GetFactValue(
-                "us-gaap:DiscontinuedOperationGainLossOnDisposalOfDiscontinuedOperationNetOfTax", "Duration")
-            if self.xbrl.fields['IncomeFromDiscontinuedOperations'] is None:
-                self.xbrl.fields['IncomeFromDiscontinuedOperations'] = self.xbrl.GetFactValue(
-                    "us-gaap:IncomeLossFromDiscontinuedOperationsNetOfTaxAttributableToReportingEntity", "Duration")
-
-        # ExtraordaryItemsGainLoss
-        self.xbrl.fields['ExtraordaryItemsGainLoss'] = self.xbrl.GetFactValue("us-gaap:ExtraordinaryItemNetOfTax",
-                                                                              "Duration")
-        if self.xbrl.fields['ExtraordaryItemsGainLoss'] is None:
-            self.xbrl.fields['ExtraordaryItemsGainLoss'] = self.xbrl.GetFactValue("us-gaap:ExtraordinaryItemNetOfTax",
-                                                                                  "Duration")
-
-        # NetIncomeLoss
-        self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:ProfitLoss", "Duration")
-        if self.xbrl.fields['NetIncomeLoss'] is None:
-            self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue("us-gaap:NetIncomeLoss", "Duration")
-            if self.xbrl.fields['NetIncomeLoss'] is None:
-                self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue(
-                    "us-gaap:NetIncomeLossAvailableToCommonStockholdersBasic", "Duration")
-                if self.xbrl.fields['NetIncomeLoss'] is None:
-                    self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue(
-                        "us-gaap:IncomeLossFromContinuingOperations", "Duration")
-                    if self.xbrl.fields['NetIncomeLoss'] is None:
-                        self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue(
-                            "us-gaap:IncomeLossAttributableToParent", "Duration")
-                        if self.xbrl.fields['NetIncomeLoss'] is None:
-                            self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue(
-                                "us-gaap:IncomeLossFromContinuingOperationsIncludingPortionAttributableToNoncontrollingInterest",
-                                "Duration")
-
-        #self.xbrl.fields['NetIncomeAttributableToShareholders'] = self.xbrl.GetFactValue(
-        #    "us-gaap:ProfitLossAttributableToOwnersOfParent", "Duration")
-        #if self.xbrl.fields['NetIncomeAttributableToShareholders'] is None:
-        #    self.xbrl.fields['NetIncomeAttributableToShareholders'] = self.xbrl.fields['NetIncomeLoss']
-
-        # NetIncomeAvailableToCommonStockholdersBasic
-        self.xbrl.fields['NetIncomeAvailableToCommonStockholdersBasic'] = self.xbrl.GetFactValue(
-            "us-gaap:NetIncomeLossAvailableToCommonStockholdersBasic", "Duration")
-
-        # PreferredStockDividendsAndOtherAdjustments
-        self.xbrl.fields['PreferredStockDividendsAndOtherAdjustments'] = self.xbrl.GetFactValue(
-            "us-gaap:PreferredStockDividendsAndOtherAdjustments", "Duration")
-
-        # NetIncomeAttributableToNoncontrollingInterest
-        self.xbrl.fields['NetIncomeAttributableToNoncontrollingInterest'] = self.xbrl.GetFactValue(
-            "us-gaap:NetIncomeLossAttributableToNoncontrollingInterest", "Duration")
-
-        # NetIncomeAttributableToParent
-        self.xbrl.fields['NetIncomeAttributableToParent'] = self.xbrl.GetFactValue("us-gaap:NetIncomeLoss", "Duration")
-
-        # OtherComprehensiveIncome
-        self.xbrl.fields['OtherComprehensiveIncome'] = self.xbrl.GetFactValue(
-            "us-gaap:OtherComprehensiveIncomeLossNetOfTax", "Duration")
-        if self.xbrl.fields['OtherComprehensiveIncome'] is None:
-            self.xbrl.fields['OtherComprehensiveIncome'] = self.xbrl.GetFactValue(
-                "us-gaap:OtherComprehensiveIncomeLossNetOfTax", "Duration")
-
-        # ComprehensiveIncome
-        self.xbrl.fields['ComprehensiveIncome'] = self.xbrl.GetFactValue(
-            "us-gaap:ComprehensiveIncomeNetOfTaxIncludingPortionAttributableToNoncontrollingInterest", "Duration")
-        if self.xbrl.fields['ComprehensiveIncome'] is None:
-            self.xbrl.fields['ComprehensiveIncome'] = self.xbrl.GetFactValue("us-gaap:ComprehensiveIncomeNetOfTax",
-                                                                             "Duration")
-
-        # ComprehensiveIncomeAttributableToParent
-        self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] = self.xbrl.GetFactValue(
-            "us-gaap:ComprehensiveIncomeNetOfTax", "Duration")
-        if self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] is None:
-            self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] = self.xbrl.GetFactValue(
-                "us-gaap:ComprehensiveIncomeNetOfTax", "Duration")
-
-        # ComprehensiveIncomeAttributableToNoncontrollingInterest
-        self.xbrl.fields['ComprehensiveIncomeAttributableToNoncontrollingInterest'] = self.xbrl.GetFactValue(
-            "us-gaap:ComprehensiveIncomeNetOfTaxAttributableToNoncontrollingInterest", "Duration")
-        if self.xbrl.fields['ComprehensiveIncomeAttributableToNoncontrollingInterest'] is None:
-            self.xbrl.fields['ComprehensiveIncomeAttributableToNoncontrollingInterest'] = self.xbrl.GetFactValue(
-                "us-gaap:ComprehensiveIncomeNetOfTaxAttributableToNoncontrollingInterest", "Duration")
-
-        #########'Adjustments to income statement information
-        # Impute: NonoperatingIncomeLossPlusInterestAndDebtExpense
-        if self.xbrl.fields['NonoperatingIncomeLoss'] is not None \
-                and self.xbrl.fields['InterestAndDebtExpense'] is not None:
-            self.xbrl.fields['NonoperatingIncomeLossPlusInterestAndDebtExpense'] = self.xbrl.fields[
-                                                                                       'NonoperatingIncomeLoss'] + \
-                                                                                   self.xbrl.fields[
-                                                                                       'InterestAndDebtExpense']
-
-        # Impute: Net income available to common stockholders  (if it does not exist)
-        if self.xbrl.fields['NetIncomeAvailableToCommonStockholdersBasic'] is None \
-                and self.xbrl.fields['PreferredStockDividendsAndOtherAdjustments'] is None \
-                and self.xbrl.fields['NetIncomeAttributableToParent'] is not None:
-            self.xbrl.fields['NetIncomeAvailableToCommonStockholdersBasic'] = self.xbrl.fields[
-                'NetIncomeAttributableToParent']
-
-        # Impute NetIncomeLoss
-        if self.xbrl.fields['NetIncomeLoss'] is not None \
-                and self.xbrl.fields['IncomeFromDiscontinuedOperations'] is not None \
-                and self.xbrl.fields['ExtraordaryItemsGainLoss'] is not None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] is None:
-            self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] = self.xbrl.fields['NetIncomeLoss'] - \
-                                                                         self.xbrl.fields[
-                                                                             'IncomeFromDiscontinuedOperations'] - \
-                                                                         self.xbrl.fields['ExtraordaryItemsGainLoss']
-
-        # Impute: Net income attributable to parent if it does not exist
-        if self.xbrl.fields['NetIncomeAttributableToParent'] is None \
-                and self.xbrl.fields['NetIncomeAttributableToNoncontrollingInterest'] is None \
-                and self.xbrl.fields['NetIncomeLoss'] is not None:
-            self.xbrl.fields['NetIncomeAttributableToParent'] = self.xbrl.fields['NetIncomeLoss']
-
-        # Impute: PreferredStockDividendsAndOtherAdjustments
-        if self.xbrl.fields['PreferredStockDividendsAndOtherAdjustments'] is None \
-                and self.xbrl.fields['NetIncomeAttributableToParent'] is not None \
-                and self.xbrl.fields['NetIncomeAvailableToCommonStockholdersBasic'] is not None:
-            self.xbrl.fields['PreferredStockDividendsAndOtherAdjustments'] = self.xbrl.fields[
-                                                                                 'NetIncomeAttributableToParent'] - \
-                                                                             self.xbrl.fields[
-                                                                                 'NetIncomeAvailableToCommonStockholdersBasic']
-
-        # Impute: comprehensive income
-        if self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] is None \
-                and self.xbrl.fields['ComprehensiveIncomeAttributableToNoncontrollingInterest'] is None \
-                and self.xbrl.fields['ComprehensiveIncome'] is None \
-                and self.xbrl.fields['OtherComprehensiveIncome'] is None:
-            self.xbrl.fields['ComprehensiveIncome'] = self.xbrl.fields['NetIncomeLoss']
-
-        # Impute: other comprehensive income
-        if self.xbrl.fields['ComprehensiveIncome'] is not None \
-                and self.xbrl.fields['NetIncomeLoss'] is not None \
-                and self.xbrl.fields['OtherComprehensiveIncome'] is None:
-            self.xbrl.fields['OtherComprehensiveIncome'] = self.xbrl.fields['ComprehensiveIncome'] - \
-                                                           self.xbrl.fields['NetIncomeLoss']
-
-        # Impute: comprehensive income attributable to parent if it does not exist
-        if self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] is None \
-                and self.xbrl.fields['ComprehensiveIncomeAttributableToNoncontrollingInterest'] is None \
-                and self.xbrl.fields['ComprehensiveIncome'] is not None:
-            self.xbrl.fields['ComprehensiveIncomeAttributableToParent'] = self.xbrl.fields['ComprehensiveIncome']
-
-        # Impute: IncomeFromContinuingOperations*Before*Tax
-        if self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['IncomeFromEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is None:
-            self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] = self.xbrl.fields[
-                                                                              'IncomeBeforeEquityMethodInvestments'] + \
-                                                                          self.xbrl.fields[
-                                                                              'IncomeFromEquityMethodInvestments']
-
-        # Impute: IncomeFromContinuingOperations*Before*Tax2 (if income before tax is missing)
-        if self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] is not None \
-                and self.xbrl.fields['IncomeTaxExpenseBenefit'] is not None:
-            self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] = self.xbrl.fields[
-                                                                              'IncomeFromContinuingOperationsAfterTax'] + \
-                                                                          self.xbrl.fields['IncomeTaxExpenseBenefit']
-
-        # Impute: IncomeFromContinuingOperations*After*Tax
-        if self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] is None \
-                and self.xbrl.fields['IncomeTaxExpenseBenefit'] is not None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is not None:
-            self.xbrl.fields['IncomeFromContinuingOperationsAfterTax'] = self.xbrl.fields[
-                                                                             'IncomeFromContinuingOperationsBeforeTax'] - \
-                                                                         self.xbrl.fields['IncomeTaxExpenseBenefit']
-
-        # Impute: GrossProfit
-        if self.xbrl.fields['GrossProfit'] is None \
-                and self.xbrl.fields['Revenues'] is not None \
-                and self.xbrl.fields['CostOfRevenue'] is not None:
-            self.xbrl.fields['GrossProfit'] = self.xbrl.fields['Revenues'] - self.xbrl.fields['CostOfRevenue']
-
-        # Impute: Revenues
-        if self.xbrl.fields['GrossProfit'] is not None \
-                and self.xbrl.fields['Revenues'] is None \
-                and self.xbrl.fields['CostOfRevenue'] is not None:
-            self.xbrl.fields['Revenues'] = self.xbrl.fields['GrossProfit'] + self.xbrl.fields['CostOfRevenue']
-
-        # Impute: CostOfRevenue
-        if self.xbrl.fields['GrossProfit'] is not None \
-                and self.xbrl.fields['Revenues'] is not None \
-                and self.xbrl.fields['CostOfRevenue'] is None:
-            self.xbrl.fields['CostOfRevenue'] = self.xbrl.fields['GrossProfit'] + self.xbrl.fields['Revenues']
-
-        # Impute: CostsAndExpenses (would NEVER have costs and expenses if has gross profit, gross profit is multi-step and costs and expenses is single-step)
-        if self.xbrl.fields['GrossProfit'] is None \
-                and self.xbrl.fields['CostsAndExpenses'] is None \
-                and self.xbrl.fields['CostOfRevenue'] is not None \
-                and self.xbrl.fields['OperatingExpenses'] is not None:
-            self.xbrl.fields['CostsAndExpenses'] = self.xbrl.fields['CostOfRevenue'] + \
-                                                   self.xbrl.fields['OperatingExpenses']
-
-        # Impute: CostsAndExpenses based on existance of both costs of revenues and operating expenses
-        if self.xbrl.fields['CostsAndExpenses'] is None \
-                and self.xbrl.fields['OperatingExpenses'] is not None \
-                and self.xbrl.fields['CostOfRevenue'] is not None:
-            self.xbrl.fields['CostsAndExpenses'] = self.xbrl.fields['CostOfRevenue'] + \
-                                                   self.xbrl.fields['OperatingExpenses']
-
-        # Impute: CostsAndExpenses
-        if self.xbrl.fields['GrossProfit'] is None \
-                and self.xbrl.fields['CostsAndExpenses'] is None \
-                and self.xbrl.fields['Revenues'] is not None \
-                and self.xbrl.fields['OperatingIncomeLoss'] is not None \
-                and self.xbrl.fields['OtherOperatingIncome'] is not None:
-            self.xbrl.fields['CostsAndExpenses'] = self.xbrl.fields['Revenues'] - \
-                                                   self.xbrl.fields['OperatingIncomeLoss'] - \
-                                                   self.xbrl.fields['OtherOperatingIncome']
-
-        # Impute: OperatingExpenses based on existance of costs and expenses and cost of revenues
-        if self.xbrl.fields['CostOfRevenue'] is not None \
-                and self.xbrl.fields['CostsAndExpenses'] is not None \
-                and self.xbrl.fields['OperatingExpenses'] is None:
-            self.xbrl.fields['OperatingExpenses'] = self.xbrl.fields['CostsAndExpenses'] - \
-                                                    self.xbrl.fields['CostOfRevenue']
-
-        # Impute: CostOfRevenues single-step method
-        if self.xbrl.fields['Revenues'] is not None \
-                and self.xbrl.fields['CostsAndExpenses'] is not None \
-                and self.xbrl.fields['GrossProfit'] is None \
-                and (self.xbrl.fields['OperatingIncomeLoss'] ==
-                     self.xbrl.fields['Revenues'] - self.xbrl.fields['CostsAndExpenses']) \
-                and self.xbrl.fields['OperatingExpenses'] is None \
-                and self.xbrl.fields['OtherOperatingIncome'] is None:
-            self.xbrl.fields['CostOfRevenue'] = self.xbrl.fields['CostsAndExpenses'] - \
-                                                self.xbrl.fields['OperatingExpenses']
-
-        # Impute: IncomeBeforeEquityMethodInvestments
-        if self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] is None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is not None \
-                and self.xbrl.fields['IncomeFromEquityMethodInvestments'] is not None:
-            self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] = self.xbrl.fields[
-                                                                          'IncomeFromContinuingOperationsBeforeTax'] - \
-                                                                      self.xbrl.fields[
-                                                                          'IncomeFromEquityMethodInvestments']
-
-        # Impute: IncomeBeforeEquityMethodInvestments
-        if self.xbrl.fields['OperatingIncomeLoss'] is not None \
-                and self.xbrl.fields['NonoperatingIncomeLoss'] is not None \
-                and self.xbrl.fields['InterestAndDebtExpense'] is None \
-                and self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] is not None:
-            self.xbrl.fields['InterestAndDebtExpense'] = self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] - (
-                    self.xbrl.fields['OperatingIncomeLoss'] + self.xbrl.fields['NonoperatingIncomeLoss'])
-
-        # Impute: OtherOperatingIncome
-        if self.xbrl.fields['OtherOperatingIncome'] is None \
-                and self.xbrl.fields['GrossProfit'] is not None \
-                and self.xbrl.fields['OperatingExpenses'] is not None \
-                and self.xbrl.fields['OperatingIncomeLoss'] is not None:
-            self.xbrl.fields['OtherOperatingIncome'] = self.xbrl.fields['OperatingIncomeLoss'] - (
-                    self.xbrl.fields['GrossProfit'] - self.xbrl.fields['OperatingExpenses'])
-
-        # Move IncomeFromEquityMethodInvestments
-        if self.xbrl.fields['IncomeFromEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is not None \
-                and self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] != self.xbrl.fields[
-            'IncomeFromContinuingOperationsBeforeTax']:
-            self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] = self.xbrl.fields[
-                                                                          'IncomeFromContinuingOperationsBeforeTax'] - \
-                                                                      self.xbrl.fields[
-                                                                          'IncomeFromEquityMethodInvestments']
-            if self.xbrl.fields['OperatingIncomeLoss'] is not None:
-                self.xbrl.fields['OperatingIncomeLoss'] = self.xbrl.fields['OperatingIncomeLoss'] - \
-                                                          self.xbrl.fields['IncomeFromEquityMethodInvestments']
-
-        # DANGEROUS!!  May need to turn off. IS3 had 2085 PASSES WITHOUT this imputing. if it is higher,: keep the test
-        # Impute: OperatingIncomeLoss
-        if self.xbrl.fields['OperatingIncomeLoss'] is None \
-                and self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['NonoperatingIncomeLoss'] is not None \
-                and self.xbrl.fields['InterestAndDebtExpense'] is not None:
-            self.xbrl.fields['OperatingIncomeLoss'] = self.xbrl.fields['IncomeBeforeEquityMethodInvestments'] + \
-                                                      self.xbrl.fields['NonoperatingIncomeLoss'] - \
-                                                      self.xbrl.fields['InterestAndDebtExpense']
-
-        if self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is not None \
-                and self.xbrl.fields['OperatingIncomeLoss'] is not None:
-            self.xbrl.fields['NonoperatingIncomePlusInterestAndDebtExpensePlusIncomeFromEquityMethodInvestments'] = \
-                self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] - self.xbrl.fields['OperatingIncomeLoss']
-
-        # NonoperatingIncomeLossPlusInterestAndDebtExpense
-        if self.xbrl.fields['NonoperatingIncomeLossPlusInterestAndDebtExpense'] is None \
-                and self.xbrl.fields[
-            'NonoperatingIncomePlusInterestAndDebtExpensePlusIncomeFromEquityMethodInvestments'] is not None \
-                and self.xbrl.fields['IncomeFromEquityMethodInvestments'] is not None:
-            self.xbrl.fields['NonoperatingIncomeLossPlusInterestAndDebtExpense'] = self.xbrl.fields[
-                                                                                       'NonoperatingIncomePlusInterestAndDebtExpensePlusIncomeFromEquityMethodInvestments'] - \
-                                                                                   self.xbrl.fields[
-                                                                                       'IncomeFromEquityMethodInvestments']
-
-        ###Cash flow statement
-
-        # NetCashFlow
-        self.xbrl.fields['NetCashFlow'] = self.xbrl.GetFactValue("us-gaap:CashAndCashEquivalentsPeriodIncreaseDecrease",
-                                                                 "Duration")
-        if self.xbrl.fields['NetCashFlow'] is None:
-            self.xbrl.fields['NetCashFlow'] = self.xbrl.GetFactValue("us-gaap:CashPeriodIncreaseDecrease", "Duration")
-            if self.xbrl.fields['NetCashFlow'] is None:
-                self.xbrl.fields['NetCashFlow'] = self.xbrl.GetFactValue(
-                    "us-gaap:NetCashProvidedByUsedInContinuingOperations", "Duration")
-
-        # NetCashFlowsOperating
-        self.xbrl.fields['NetCashFlowsOperating'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInOperatingActivities", "Duration")
-
-        # NetCashFlowsInvesting
-        self.xbrl.fields['NetCashFlowsInvesting'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInInvestingActivities", "Duration")
-
-        # NetCashFlowsFinancing
-        self.xbrl.fields['NetCashFlowsFinancing'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInFinancingActivities", "Duration")
-
-        # NetCashFlowsOperatingContinuing
-        self.xbrl.fields['NetCashFlowsOperatingContinuing'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInOperatingActivitiesContinuingOperations", "Duration")
-
-        # NetCashFlowsInvestingContinuing
-        self.xbrl.fields['NetCashFlowsInvestingContinuing'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInInvestingActivitiesContinuingOperations", "Duration")
-
-        # NetCashFlowsFinancingContinuing
-        self.xbrl.fields['NetCashFlowsFinancingContinuing'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInFinancingActivitiesContinuingOperations", "Duration")
-
-        # NetCashFlowsOperatingDiscontinued
-        self.xbrl.fields['NetCashFlowsOperatingDiscontinued'] = self.xbrl.GetFactValue(
-            "us-gaap:CashProvidedByUsedInOperatingActivitiesDiscontinuedOperations", "Duration")
-
-        # NetCashFlowsInvestingDiscontinued
-        self.xbrl.fields['NetCashFlowsInvestingDiscontinued'] = self.xbrl.GetFactValue(
-            "us-gaap:CashProvidedByUsedInInvestingActivitiesDiscontinuedOperations", "Duration")
-
-        # NetCashFlowsFinancingDiscontinued
-        self.xbrl.fields['NetCashFlowsFinancingDiscontinued'] = self.xbrl.GetFactValue(
-            "us-gaap:CashProvidedByUsedInFinancingActivitiesDiscontinuedOperations", "Duration")
-
-        # NetCashFlowsDiscontinued
-        self.xbrl.fields['NetCashFlowsDiscontinued'] = self.xbrl.GetFactValue(
-            "us-gaap:NetCashProvidedByUsedInDiscontinuedOperations", "Duration")
-
-        # ExchangeGainsLosses
-        self.xbrl.fields['ExchangeGainsLosses'] = self.xbrl.GetFactValue(
-            "us-gaap:EffectOfExchangeRateOnCashAndCashEquivalents", "Duration")
-        if self.xbrl.fields['ExchangeGainsLosses'] is None:
-            self.xbrl.fields['ExchangeGainsLosses'] = self.xbrl.GetFactValue(
-                "us-gaap:EffectOfExchangeRateOnCashAndCashEquivalentsContinuingOperations", "Duration")
-            if self.xbrl.fields['ExchangeGainsLosses'] is None:
-                self.xbrl.fields['ExchangeGainsLosses'] = self.xbrl.GetFactValue(
-                    "us-gaap:CashProvidedByUsedInFinancingActivitiesDiscontinuedOperations", "Duration")
-
-        ####Adjustments
-        # Impute: total net cash flows discontinued if not reported
-        if self.xbrl.fields['NetCashFlowsDiscontinued'] is None \
-                and self.xbrl.fields['NetCashFlowsOperatingDiscontinued'] is not None \
-                and self.xbrl.fields['NetCashFlowsInvestingDiscontinued'] is not None \
-                and self.xbrl.fields['NetCashFlowsFinancingDiscontinued'] is not None:
-            self.xbrl.fields['NetCashFlowsDiscontinued'] = self.xbrl.fields['NetCashFlowsOperatingDiscontinued'] + \
-                                                           self.xbrl.fields['NetCashFlowsInvestingDiscontinued'] + \
-                                                           self.xbrl.fields['NetCashFlowsFinancingDiscontinued']
-
-        # Impute: cash flows from continuing
-        if self.xbrl.fields['NetCashFlowsOperating'] is not None \
-                and self.xbrl.fields['NetCashFlowsOperatingDiscontinued'] is not None \
-                and self.xbrl.fields['NetCashFlowsOperatingContinuing'] is None:
-            self.xbrl.fields['NetCashFlowsOperatingContinuing'] = self.xbrl.fields['NetCashFlowsOperating'] - \
-                                                                  self.xbrl.fields['NetCashFlowsOperatingDiscontinued']
-
-        if self.xbrl.fields['NetCashFlowsInvesting'] is not None \
-                and self.xbrl.fields['NetCashFlowsInvestingDiscontinued'] is not None \
-                and self.xbrl.fields['NetCashFlowsInvestingContinuing'] is None:
-            self.xbrl.fields['NetCashFlowsInvestingContinuing'] = self.xbrl.fields['NetCashFlowsInvesting'] - \
-                                                                  self.xbrl.fields['NetCashFlowsInvestingDiscontinued']
-
-        if self.xbrl.fields['NetCashFlowsFinancing'] is not None \
-                and self.xbrl.fields['NetCashFlowsFinancingDiscontinued'] is not None \
-                and self.xbrl.fields['NetCashFlowsFinancingContinuing'] is None:
-            self.xbrl.fields['NetCashFlowsFinancingContinuing'] = self.xbrl.fields['NetCashFlowsFinancing'] - \
-                                                                  self.xbrl.fields['NetCashFlowsFinancingDiscontinued']
-
-        if self.xbrl.fields['NetCashFlowsOperating'] is None \
-                and self.xbrl.fields['NetCashFlowsOperatingContinuing'] is not None \
-                and self.xbrl.fields['NetCashFlowsOperatingDiscontinued'] is None:
-            self.xbrl.fields['NetCashFlowsOperating'] = self.xbrl.fields['NetCashFlowsOperatingContinuing']
-
-        if self.xbrl.fields['NetCashFlowsInvesting'] is None \
-                and self.xbrl.fields['NetCashFlowsInvestingContinuing'] is not None \
-                and self.xbrl.fields['NetCashFlowsInvestingDiscontinued'] is None:
-            self.xbrl.fields['NetCashFlowsInvesting'] = self.xbrl.fields['NetCashFlowsInvestingContinuing']
-
-        if self.xbrl.fields['NetCashFlowsFinancing'] is None \
-                and self.xbrl.fields['NetCashFlowsFinancingContinuing'] is not None \
-                and self.xbrl.fields['NetCashFlowsFinancingDiscontinued'] is None:
-            self.xbrl.fields['NetCashFlowsFinancing'] = self.xbrl.fields['NetCashFlowsFinancingContinuing']
-
-        if self.xbrl.fields['NetCashFlowsOperatingContinuing'] is not None \
-                and self.xbrl.fields['NetCashFlowsInvestingContinuing'] is not None \
-                and self.xbrl.fields['NetCashFlowsFinancingContinuing'] is not None:
-            self.xbrl.fields['NetCashFlowsContinuing'] = self.xbrl.fields['NetCashFlowsOperatingContinuing'] + \
-                                                         self.xbrl.fields['NetCashFlowsInvestingContinuing'] + \
-                                                         self.xbrl.fields['NetCashFlowsFinancingContinuing']
-
-        # Impute: if net cash flow is missing,: this tries to figure out the value by adding up the detail
-        if self.xbrl.fields['NetCashFlow'] is None \
-                and (self.xbrl.fields['NetCashFlowsOperating'] is not None
-                     or self.xbrl.fields['NetCashFlowsInvesting'] is not None
-                     or self.xbrl.fields['NetCashFlowsFinancing'] is not None):
-            operating_val = 0
-            investing_val = 0
-            financing_val = 0
-            unit_ref = None
-
-            if self.xbrl.fields['NetCashFlowsOperating']:
-                unit_ref = self.xbrl.fields['NetCashFlowsOperating'].unit_ref
-                operating_val = self.xbrl.fields['NetCashFlowsOperating'].value
-            if self.xbrl.fields['NetCashFlowsInvesting']:
-                unit_ref = self.xbrl.fields['NetCashFlowsInvesting'].unit_ref
-                investing_val = self.xbrl.fields['NetCashFlowsInvesting'].value
-            if self.xbrl.fields['NetCashFlowsFinancing']:
-                unit_ref = self.xbrl.fields['NetCashFlowsFinancing'].unit_ref
-                financing_val = self.xbrl.fields['NetCashFlowsFinancing'].value
-
-            from edgar_data.xbrl import Field
-            self.xbrl.fields['NetCashFlow'] = Field(operating_val + investing_val + financing_val, unit_ref)
-
-        # Key ratios
-        try:
-            self.xbrl.fields['SGR'] = ((self.xbrl.fields['NetIncomeLoss'] / self.xbrl.fields['Revenues']) * (1 + (
-                    (self.xbrl.fields['Assets'] - self.xbrl.fields['Equity']) / self.xbrl.fields['Equity']))) / (
-                                              (1 / (self.xbrl.fields['Revenues'] / self.xbrl.fields['Assets'])) - ((
-                                              (self.xbrl.fields['NetIncomeLoss'] / self.xbrl.fields[
-                                                  'Revenues']) * (1 + ((
-                                              (self.xbrl.fields['Assets'] - self.xbrl.fields['Equity']) /
-                                              self.xbrl.fields['Equity']))))))
-        except:
-            pass
-
-        try:
-            self.xbrl.fields['ROA'] = self.xbrl.fields['NetIncomeLoss'] / self.xbrl.fields['Assets']
-        except:
-            pass
-
-        try:
-            self.xbrl.fields['ROE'] = self.xbrl.fields['NetIncomeLoss'] / self.xbrl.fields['Equity']
-        except:
-            pass
-
-        try:
-            self.xbrl.fields['ROS'] = self.xbrl.fields['NetIncomeLoss'] / self.xbrl.fields['Revenues']
-        except:
-            pass
-
-        self.xbrl.fields['ResearchAndDevelopmentExpense'] = self.xbrl.GetFactValue(
-            'us-gaap:ResearchAndDevelopmentExpense', 'Duration')
-
-        try:
-            self.ifrs()
-        except:
-            pass
-
-    def ifrs(self):
+    :param field: Field name.
+    :param period_type: Either INSTANT or DURATION.
+    :param concepts: Candidate concepts, in order of preference.
+    :param only_if_missing: Only look the concepts up if the field has no value yet.
+    """
+
+    def __init__(self, field, period_type, concepts, only_if_missing=False):
+        self.field = field
+        self.period_type = period_type
+        self.concepts = concepts
+        self.only_if_missing = only_if_missing
+
+    def keys(self):
+        return [(concept, self.period_type) for concept in self.concepts]
+
+
+class Impute:
+    """Sets `field` to `formula(*operands)` when all `operands` and `present` fields have a value,
+    and none of the `missing` fields has one.
+
+    :param field: Field name.
+    :param formula: Callable taking the operands' values.
+    :param operands: Names of the fields passed to `formula`.
+    :param missing: Names of the fields that must have no value.
+    :param present: Names of the fields that must have a value, besides the operands.
+    :param partial: Apply if at least one operand has a value. Missing operands are passed as None,
+        or as zeros when evaluating a batch.
+    :param strict: Apply even if operands are missing, letting `formula` fail on them.
+    :param vectorized: Optional. Version of `formula` taking arrays, when `formula` can't.
+    """
+
+    def __init__(self, field, formula, operands, missing=(), present=(), partial=False, strict=False,
+                 vectorized=None):
+        self.field = field
+        self.formula = formula
+        self.operands = operands
+        self.missing = missing
+        self.present = present
+        self.partial = partial
+        self.strict = strict
+        self.vectorized = formula if vectorized is None else vectorized
+
+    def keys(self):
+        return []
+
+
+class Stage:
+    """Ordered steps, with `on_error` (RAISE, SKIP or ABORT) defining how failing steps are handled."""
+
+    def __init__(self, name, steps, on_error=RAISE):
+        self.name = name
+        self.steps = steps
+        self.on_error = on_error
+
+
+def _same(value):
+    return value
+
+
+def _sum_present(*fields):
+    total = 0
+    unit_ref = None
+    for field in fields:
+        if field is not None:
+            unit_ref = field.unit_ref
+            total += field.value
+
+    from edgar_data.xbrl import Field
+    return Field(total, unit_ref)
+
+
+def _div(numerator, denominator):
+    """Division failing on zero denominators: it raises for fields, and gives NaN on arrays."""
+    if hasattr(numerator, '__array__') or hasattr(denominator, '__array__'):
+        import numpy
+        return numpy.where(numpy.asarray(denominator) == 0, numpy.nan, numerator / denominator)
+    return numerator / denominator
+
+
+def _sgr(net_income, revenues, assets, equity):
+    return _div(_div(net_income, revenues) * (1 + _div(assets - equity, equity)),
+                _div(1, _div(revenues, assets)) - _div(net_income, revenues) * (1 + _div(assets - equity, equity)))
+
+
+class EvaluationPlan:
+    """A compiled list of stages.
+    All the candidate concepts are collected once, so each concept is looked up a single time per period,
+    and the steps are then evaluated over the collected values.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+
+        self.concepts = []
+        # Names of the fields set by the plan, in order of declaration
+        self.fields = []
+        seen = set()
+        for stage in stages:
+            for step in stage.steps:
+                for key in step.keys():
+                    if key not in seen:
+                        seen.add(key)
+                        self.concepts.append(key)
+                if not step.field.startswith('_') and step.field not in seen:
+                    seen.add(step.field)
+                    self.fields.append(step.field)
+
+    def collect(self, xbrl, fields):
+        """Looks up every candidate concept of the plan.
+
+        :return: Values keyed by (concept, period_type). Concepts not reported are None.
+        :rtype: dict
         """
-        Labels found at:
-        https://www.ifrs.org/-/media/feature/standards/taxonomy/2018/2018-taxonomy-view-with-definitions.xlsx?la=en&hash=5532C37EEAD057F62AA9AA1C920E33F43B3140FD
+        return {key: xbrl.GetFactValue(key[0], key[1], fields) for key in self.concepts}
+
+    def evaluate(self, xbrl, fields):
+        """Evaluates the plan for the period contexts set in `fields`, storing the results in it."""
+        facts = self.collect(xbrl, fields)
+        values = _Values(fields)
+
+        for stage in self.stages:
+            try:
+                for step in stage.steps:
+                    try:
+                        self._apply(step, values, facts)
+                    except Exception:
+                        if stage.on_error != SKIP:
+                            raise
+            except Exception:
+                if stage.on_error != ABORT:
+                    raise
+
+    def _apply(self, step, values, facts):
+        if isinstance(step, Lookup):
+            if step.only_if_missing and values[step.field] is not None:
+                return
+
+            value = None
+            for key in step.keys():
+                if facts[key] is not None:
+                    value = facts[key]
+                    break
+            values[step.field] = value
+            return
+
+        if any(values[name] is not None for name in step.missing):
+            return
+        if any(values[name] is None for name in step.present):
+            return
+
+        operands = [values[name] for name in step.operands]
+        if step.partial:
+            if all(operand is None for operand in operands):
+                return
+        elif not step.strict and any(operand is None for operand in operands):
+            return
+
+        values[step.field] = step.formula(*operands)
+
+    def collect_batch(self, xbrls, fields=None):
+        """Looks up every candidate concept of the plan for several filings, as arrays ready for `evaluate_batch`.
+
+        :param xbrls: Parsed instance documents.
+        :param fields: Optional. One FieldsDataset per instance, holding the period contexts.
+            Defaults to the current period of each instance.
+        :return: Arrays keyed by (concept, period_type), with NaN where the concept is not reported.
+        :rtype: dict[tuple, numpy.ndarray]
         """
+        import numpy
 
-        # These are the ones also found on GAAP:
-        if self.xbrl.fields['Revenues'] is None:
-            self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue('ifrs-full:Revenue', 'Duration')
-            if self.xbrl.fields['Revenues'] is None:
-                self.xbrl.fields['Revenues'] = self.xbrl.GetFactValue('ifrs-full:RevenueFromSaleOfOilAndGasProducts', 'Duration')
-
-        if self.xbrl.fields['NetIncomeAttributableToParent'] is None:
-            self.xbrl.fields['NetIncomeAttributableToParent'] = self.xbrl.GetFactValue(
-                "ifrs-full:ProfitLossAttributableToOwnersOfParent", "Duration")
-
-        if self.xbrl.fields['Assets'] is None:
-            self.xbrl.fields['Assets'] = self.xbrl.GetFactValue('ifrs-full:Assets', 'Instant')
-
-        if self.xbrl.fields['CurrentAssets'] is None:
-            self.xbrl.fields['CurrentAssets'] = self.xbrl.GetFactValue('ifrs-full:CurrentAssets', 'Instant')
-
-        if self.xbrl.fields['NoncurrentAssets'] is None:
-            self.xbrl.fields['NoncurrentAssets'] = self.xbrl.GetFactValue('ifrs-full:NoncurrentAssets', 'Instant')
-
-        if self.xbrl.fields['Liabilities'] is None:
-            self.xbrl.fields['Liabilities'] = self.xbrl.GetFactValue('ifrs-full:Liabilities', 'Instant')
+        xbrls = list(xbrls)
+        if fields is None:
+            fields = [xbrl.fields for xbrl in xbrls]
 
-        if self.xbrl.fields['CurrentLiabilities'] is None:
-            self.xbrl.fields['CurrentLiabilities'] = self.xbrl.GetFactValue('ifrs-full:CurrentLiabilities',
-                                                                            'Instant')
+        table = numpy.full((len(self.concepts), len(xbrls)), numpy.nan)
+        for column, (xbrl, dataset) in enumerate(zip(xbrls, fields)):
+            facts = self.collect(xbrl, dataset)
+            for row, key in enumerate(self.concepts):
+                if facts[key] is not None:
+                    table[row, column] = facts[key].value
 
-        if self.xbrl.fields['NoncurrentLiabilities'] is None:
-            self.xbrl.fields['NoncurrentLiabilities'] = self.xbrl.GetFactValue('ifrs-full:NoncurrentLiabilities',
-                                                                               'Instant')
+        return {key: table[row] for row, key in enumerate(self.concepts)}
 
-        if self.xbrl.fields['LiabilitiesAndEquity'] is None:
-            self.xbrl.fields['LiabilitiesAndEquity'] = self.xbrl.GetFactValue('ifrs-full:EquityAndLiabilities',
-                                                                              'Instant')
+    def evaluate_batch(self, facts):
+        """Evaluates the plan for a batch of filings at once, every step running as array operations.
+        Each row gets the same values as evaluating the plan for that filing alone, with NaN in place of None.
 
-        if self.xbrl.fields['Equity'] is None:
-            self.xbrl.fields['Equity'] = self.xbrl.GetFactValue('ifrs-full:Equity', 'Instant')
-
-        if self.xbrl.fields['CostOfRevenue'] is None:
-            self.xbrl.fields['CostOfRevenue'] = self.xbrl.GetFactValue('ifrs-full:CostOfSales', 'Duration')
-
-        if self.xbrl.fields['GrossProfit'] is None:
-            self.xbrl.fields['GrossProfit'] = self.xbrl.GetFactValue('ifrs-full:GrossProfit', 'Duration')
-
-        if self.xbrl.fields['NetCashFlowsOperating'] is None:
-            self.xbrl.fields['NetCashFlowsOperating'] = self.xbrl.GetFactValue(
-                'ifrs-full:CashFlowsFromUsedInOperatingActivities', 'Duration')
-
-        if self.xbrl.fields['NetCashFlowsInvesting'] is None:
-            self.xbrl.fields['NetCashFlowsInvesting'] = self.xbrl.GetFactValue(
-                'ifrs-full:CashFlowsFromUsedInInvestingActivities', 'Duration')
-
-        if self.xbrl.fields['NetCashFlowsFinancing'] is None:
-            self.xbrl.fields['NetCashFlowsFinancing'] = self.xbrl.GetFactValue(
-                'ifrs-full:CashFlowsFromUsedInFinancingActivities', 'Duration')
+        :param facts: Arrays of equal length keyed by (concept, period_type), with NaN for the concepts not reported.
+            Concepts missing from the dict are taken as not reported at all.
+        :return: Arrays keyed by field name.
+        :rtype: dict[str, numpy.ndarray]
+        """
+        import numpy
+
+        arrays = [numpy.asarray(value, dtype=float) for value in facts.values()]
+        if not arrays:
+            raise ValueError('No facts to evaluate')
+        size = len(arrays[0])
+
+        empty = numpy.full(size, numpy.nan)
+        columns = {key: numpy.asarray(facts[key], dtype=float) if key in facts else empty for key in self.concepts}
+        values = {}
+
+        with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for stage in self.stages:
+                active = numpy.ones(size, dtype=bool)
+                for step in stage.steps:
+                    self._apply_batch(numpy, step, stage, values, columns, active, empty)
+
+        return {name: value for name, value in values.items() if not name.startswith('_')}
+
+    def _apply_batch(self, numpy, step, stage, values, columns, active, empty):
+        current = values.get(step.field, empty)
+
+        if isinstance(step, Lookup):
+            value = empty
+            for key in reversed(step.keys()):
+                value = numpy.where(numpy.isnan(columns[key]), value, columns[key])
+
+            applies = active
+            if step.only_if_missing:
+                applies = applies & numpy.isnan(current)
+            values[step.field] = numpy.where(applies, value, current)
+            return
+
+        applies = active.copy()
+        for name in step.missing:
+            applies &= numpy.isnan(values.get(name, empty))
+        for name in step.present:
+            applies &= ~numpy.isnan(values.get(name, empty))
+
+        operands = [values.get(name, empty) for name in step.operands]
+        present = [~numpy.isnan(operand) for operand in operands]
+        if step.partial:
+            applies &= numpy.any(present, axis=0)
+            operands = [numpy.where(mask, operand, 0.0) for operand, mask in zip(operands, present)]
+        elif not step.strict:
+            applies &= numpy.all(present, axis=0)
+
+        result = step.vectorized(*operands)
+        if stage.on_error != RAISE:
+            # Rows where the step fails, as it would have raised
+            failed = applies & numpy.isnan(result)
+            applies &= ~failed
+            if stage.on_error == ABORT:
+                active &= ~failed
+
+        values[step.field] = numpy.where(applies, result, current)
+
+
+class _Values:
+    """Fields being evaluated. Names starting with an underscore are intermediate values, not stored as fields."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.intermediate = {}
+
+    def __getitem__(self, item):
+        if item.startswith('_'):
+            return self.intermediate.get(item)
+        return self.fields[item]
+
+    def __setitem__(self, key, value):
+        if key.startswith('_'):
+            self.intermediate[key] = value
+        else:
+            self.fields[key] = value
+
+
+BALANCE_SHEET = Stage('balance sheet', [
+    Lookup('Assets', INSTANT, ["us-gaap:Assets"]),
+    Lookup('CurrentAssets', INSTANT, ["us-gaap:AssetsCurrent"]),
+    Lookup('NoncurrentAssets', INSTANT, ["us-gaap:AssetsNoncurrent"]),
+    Impute('NoncurrentAssets', sub, ['Assets', 'CurrentAssets'], missing=['NoncurrentAssets']),
+    Lookup('LiabilitiesAndEquity', INSTANT, ["us-gaap:LiabilitiesAndStockholdersEquity",
+                                             "us-gaap:LiabilitiesAndPartnersCapital"]),
+    Lookup('Liabilities', INSTANT, ["us-gaap:Liabilities"]),
+    Lookup('CurrentLiabilities', INSTANT, ["us-gaap:LiabilitiesCurrent"]),
+    Lookup('NoncurrentLiabilities', INSTANT, ["us-gaap:LiabilitiesNoncurrent"]),
+    Impute('NoncurrentLiabilities', sub, ['Liabilities', 'CurrentLiabilities'], missing=['NoncurrentLiabilities']),
+    Lookup('CommitmentsAndContingencies', INSTANT, ["us-gaap:CommitmentsAndContingencies"]),
+    Lookup('TemporaryEquity', INSTANT, ["us-gaap:TemporaryEquityRedemptionValue",
+                                        "us-gaap:RedeemablePreferredStockCarryingAmount",
+                                        "us-gaap:TemporaryEquityCarryingAmount",
+                                        "us-gaap:TemporaryEquityValueExcludingAdditionalPaidInCapital",
+                                        "us-gaap:TemporaryEquityCarryingAmountAttributableToParent",
+                                        "us-gaap:RedeemableNoncontrollingInterestEquityFairValue"]),
+    Lookup('_RedeemableNoncontrollingInterest', INSTANT, [
+        "us-gaap:RedeemableNoncontrollingInterestEquityCarryingAmount",
+        "us-gaap:RedeemableNoncontrollingInterestEquityCommonCarryingAmount"]),
+    # This adds redeemable noncontrolling interest and temporary equity which are rare, but can be reported seperately
+    Impute('TemporaryEquity', add, ['TemporaryEquity', '_RedeemableNoncontrollingInterest']),
+    Lookup('Equity', INSTANT, ["us-gaap:StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
+                               "us-gaap:StockholdersEquity",
+                               "us-gaap:PartnersCapitalIncludingPortionAttributableToNoncontrollingInterest",
+                               "us-gaap:PartnersCapital",
+                               "us-gaap:CommonStockholdersEquity",
+                               "us-gaap:MemberEquity",
+                               "us-gaap:AssetsNet"]),
+    Lookup('EquityAttributableToNoncontrollingInterest', INSTANT, [
+        "us-gaap:MinorityInterest",
+        "us-gaap:PartnersCapitalAttributableToNoncontrollingInterest"]),
+    Lookup('EquityAttributableToParent', INSTANT, ["us-gaap:StockholdersEquity",
+                                                   "us-gaap:LiabilitiesAndPartnersCapital"]),
+
+    Impute('NoncurrentAssets', sub, ['Assets', 'CurrentAssets']),
+    Impute('LiabilitiesAndEquity', _same, ['Assets'], missing=['LiabilitiesAndEquity']),
+    # Impute: Equity based no parent and noncontrolling interest being present
+    Impute('Equity', add, ['EquityAttributableToParent', 'EquityAttributableToNoncontrollingInterest']),
+    Impute('Equity', _same, ['EquityAttributableToParent'],
+           missing=['Equity', 'EquityAttributableToNoncontrollingInterest']),
+    Impute('Equity', add, ['EquityAttributableToParent', 'EquityAttributableToNoncontrollingInterest'],
+           missing=['Equity']),
+    # Added: Impute Equity attributable to parent based on existence of equity and noncontrolling interest.
+    Impute('EquityAttributableToParent', sub, ['Equity', 'EquityAttributableToNoncontrollingInterest'],
+           missing=['EquityAttributableToParent']),
+    Impute('EquityAttributableToParent', _same, ['Equity'],
+           missing=['EquityAttributableToNoncontrollingInterest', 'EquityAttributableToParent']),
+    # If total liabilities is missing, figure it out based on liabilities and equity
+    Impute('Liabilities', lambda liabilities_and_equity, commitments, temporary_equity, equity:
+           liabilities_and_equity - (commitments + temporary_equity + equity),
+           ['LiabilitiesAndEquity', 'CommitmentsAndContingencies', 'TemporaryEquity', 'Equity'],
+           missing=['Liabilities']),
+    # This seems incorrect because liabilities might not be reported
+    Impute('NoncurrentLiabilities', sub, ['Liabilities', 'CurrentLiabilities']),
+    # Added to fix liabilities based on current liabilities
+    Impute('Liabilities', _same, ['CurrentLiabilities'], missing=['Liabilities', 'NoncurrentLiabilities']),
+])
+
+INCOME_STATEMENT = Stage('income statement', [
+    Lookup('Revenues', DURATION, ["us-gaap:Revenues",
+                                  "us-gaap:SalesRevenueNet",
+                                  "us-gaap:SalesRevenueServicesNet",
+                                  "us-gaap:RevenuesNetOfInterestExpense",
+                                  "us-gaap:RegulatedAndUnregulatedOperatingRevenue",
+                                  "us-gaap:HealthCareOrganizationRevenue",
+                                  "us-gaap:InterestAndDividendIncomeOperating",
+                                  "us-gaap:RealEstateRevenueNet",
+                                  "us-gaap:RevenueMineralSales",
+                                  "us-gaap:OilAndGasRevenue",
+                                  "us-gaap:FinancialServicesRevenue"]),
+    Lookup('CostOfRevenue', DURATION, ["us-gaap:CostOfRevenue",
+                                       "us-gaap:CostOfServices",
+                                       "us-gaap:CostOfGoodsSold",
+                                       "us-gaap:CostOfGoodsAndServicesSold"]),
+    Lookup('GrossProfit', DURATION, ["us-gaap:GrossProfit"]),
+    Lookup('OperatingExpenses', DURATION, ["us-gaap:OperatingExpenses",
+                                           "us-gaap:OperatingCostsAndExpenses"]),  # This concept seems incorrect.
+    Lookup('CostsAndExpenses', DURATION, ["us-gaap:CostsAndExpenses"]),
+    Lookup('OtherOperatingIncome', DURATION, ["us-gaap:OtherOperatingIncome"]),
+    Lookup('OperatingIncomeLoss', DURATION, ["us-gaap:OperatingIncomeLoss"]),
+    Lookup('NonoperatingIncomeLoss', DURATION, ["us-gaap:NonoperatingIncomeExpense"]),
+    Lookup('InterestAndDebtExpense', DURATION, ["us-gaap:InterestAndDebtExpense"]),
+    Lookup('IncomeBeforeEquityMethodInvestments', DURATION, [
+        "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments"]),
+    Lookup('IncomeFromEquityMethodInvestments', DURATION, ["us-gaap:IncomeLossFromEquityMethodInvestments"]),
+    Lookup('IncomeFromContinuingOperationsBeforeTax', DURATION, [
+        "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments",
+        "us-gaap:IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest"]),
+    Lookup('IncomeTaxExpenseBenefit', DURATION, ["us-gaap:IncomeTaxExpenseBenefit",
+                                                 "us-gaap:IncomeTaxExpenseBenefitContinuingOperations"]),
+    Lookup('IncomeFromContinuingOperationsAfterTax', DURATION, [
+        "us-gaap:IncomeLossBeforeExtraordinaryItemsAndCumulativeEffectOfChangeInAccountingPrinciple"]),
+    Lookup('IncomeFromDiscontinuedOperations', DURATION, [
+        "us-gaap:IncomeLossFromDiscontinuedOperationsNetOfTax",
+        "us-gaap:DiscontinuedOperationGainLossOnDisposalOfDiscontinuedOperationNetOfTax",
+        "us-gaap:IncomeLossFromDiscontinuedOperationsNetOfTaxAttributableToReportingEntity"]),
+    Lookup('ExtraordaryItemsGainLoss', DURATION, ["us-gaap:ExtraordinaryItemNetOfTax"]),
+    Lookup('NetIncomeLoss', DURATION, [
+        "us-gaap:ProfitLoss",
+        "us-gaap:NetIncomeLoss",
+        "us-gaap:NetIncomeLossAvailableToCommonStockholdersBasic",
+        "us-gaap:IncomeLossFromContinuingOperations",
+        "us-gaap:IncomeLossAttributableToParent",
+        "us-gaap:IncomeLossFromContinuingOperationsIncludingPortionAttributableToNoncontrollingInterest"]),
+    Lookup('NetIncomeAvailableToCommonStockholdersBasic', DURATION, [
+        "us-gaap:NetIncomeLossAvailableToCommonStockholdersBasic"]),
+    Lookup('PreferredStockDividendsAndOtherAdjustments', DURATION, [
+        "us-gaap:PreferredStockDividendsAndOtherAdjustments"]),
+    Lookup('NetIncomeAttributableToNoncontrollingInterest', DURATION, [
+        "us-gaap:NetIncomeLossAttributableToNoncontrollingInterest"]),
+    Lookup('NetIncomeAttributableToParent', DURATION, ["us-gaap:NetIncomeLoss"]),
+    Lookup('OtherComprehensiveIncome', DURATION, ["us-gaap:OtherComprehensiveIncomeLossNetOfTax"]),
+    Lookup('ComprehensiveIncome', DURATION, [
+        "us-gaap:ComprehensiveIncomeNetOfTaxIncludingPortionAttributableToNoncontrollingInterest",
+        "us-gaap:ComprehensiveIncomeNetOfTax"]),
+    Lookup('ComprehensiveIncomeAttributableToParent', DURATION, ["us-gaap:ComprehensiveIncomeNetOfTax"]),
+    Lookup('ComprehensiveIncomeAttributableToNoncontrollingInterest', DURATION, [
+        "us-gaap:ComprehensiveIncomeNetOfTaxAttributableToNoncontrollingInterest"]),
+
+    # Adjustments to income statement information
+    Impute('NonoperatingIncomeLossPlusInterestAndDebtExpense', add,
+           ['NonoperatingIncomeLoss', 'InterestAndDebtExpense']),
+    # Net income available to common stockholders (if it does not exist)
+    Impute('NetIncomeAvailableToCommonStockholdersBasic', _same, ['NetIncomeAttributableToParent'],
+           missing=['NetIncomeAvailableToCommonStockholdersBasic', 'PreferredStockDividendsAndOtherAdjustments']),
+    Impute('IncomeFromContinuingOperationsAfterTax', lambda net_income, discontinued, extraordinary:
+           net_income - discontinued - extraordinary,
+           ['NetIncomeLoss', 'IncomeFromDiscontinuedOperations', 'ExtraordaryItemsGainLoss'],
+           missing=['IncomeFromContinuingOperationsAfterTax']),
+    # Net income attributable to parent if it does not exist
+    Impute('NetIncomeAttributableToParent', _same, ['NetIncomeLoss'],
+           missing=['NetIncomeAttributableToParent', 'NetIncomeAttributableToNoncontrollingInterest']),
+    Impute('PreferredStockDividendsAndOtherAdjustments', sub,
+           ['NetIncomeAttributableToParent', 'NetIncomeAvailableToCommonStockholdersBasic'],
+           missing=['PreferredStockDividendsAndOtherAdjustments']),
+    Impute('ComprehensiveIncome', _same, ['NetIncomeLoss'],
+           missing=['ComprehensiveIncomeAttributableToParent', 'ComprehensiveIncomeAttributableToNoncontrollingInterest',
+                    'ComprehensiveIncome', 'OtherComprehensiveIncome']),
+    Impute('OtherComprehensiveIncome', sub, ['ComprehensiveIncome', 'NetIncomeLoss'],
+           missing=['OtherComprehensiveIncome']),
+    Impute('ComprehensiveIncomeAttributableToParent', _same, ['ComprehensiveIncome'],
+           missing=['ComprehensiveIncomeAttributableToParent',
+                    'ComprehensiveIncomeAttributableToNoncontrollingInterest']),
+    Impute('IncomeFromContinuingOperationsBeforeTax', add,
+           ['IncomeBeforeEquityMethodInvestments', 'IncomeFromEquityMethodInvestments'],
+           missing=['IncomeFromContinuingOperationsBeforeTax']),
+    # IncomeFromContinuingOperations*Before*Tax2 (if income before tax is missing)
+    Impute('IncomeFromContinuingOperationsBeforeTax', add,
+           ['IncomeFromContinuingOperationsAfterTax', 'IncomeTaxExpenseBenefit'],
+           missing=['IncomeFromContinuingOperationsBeforeTax']),
+    Impute('IncomeFromContinuingOperationsAfterTax', sub,
+           ['IncomeFromContinuingOperationsBeforeTax', 'IncomeTaxExpenseBenefit'],
+           missing=['IncomeFromContinuingOperationsAfterTax']),
+    Impute('GrossProfit', sub, ['Revenues', 'CostOfRevenue'], missing=['GrossProfit']),
+    Impute('Revenues', add, ['GrossProfit', 'CostOfRevenue'], missing=['Revenues']),
+    Impute('CostOfRevenue', add, ['GrossProfit', 'Revenues'], missing=['CostOfRevenue']),
+    # CostsAndExpenses (would NEVER have costs and expenses if has gross profit, gross profit is multi-step and
+    # costs and expenses is single-step)
+    Impute('CostsAndExpenses', add, ['CostOfRevenue', 'OperatingExpenses'],
+           missing=['GrossProfit', 'CostsAndExpenses']),
+    # CostsAndExpenses based on existance of both costs of revenues and operating expenses
+    Impute('CostsAndExpenses', add, ['CostOfRevenue', 'OperatingExpenses'], missing=['CostsAndExpenses']),
+    Impute('CostsAndExpenses', lambda revenues, operating_income, other_operating_income:
+           revenues - operating_income - other_operating_income,
+           ['Revenues', 'OperatingIncomeLoss', 'OtherOperatingIncome'],
+           missing=['GrossProfit', 'CostsAndExpenses']),
+    # OperatingExpenses based on existance of costs and expenses and cost of revenues
+    Impute('OperatingExpenses', sub, ['CostsAndExpenses', 'CostOfRevenue'], missing=['OperatingExpenses']),
+    Impute('IncomeBeforeEquityMethodInvestments', sub,
+           ['IncomeFromContinuingOperationsBeforeTax', 'IncomeFromEquityMethodInvestments'],
+           missing=['IncomeBeforeEquityMethodInvestments']),
+    Impute('InterestAndDebtExpense', lambda income_before_equity_method, operating_income, nonoperating_income:
+           income_before_equity_method - (operating_income + nonoperating_income),
+           ['IncomeBeforeEquityMethodInvestments', 'OperatingIncomeLoss', 'NonoperatingIncomeLoss'],
+           missing=['InterestAndDebtExpense']),
+    Impute('OtherOperatingIncome', lambda operating_income, gross_profit, operating_expenses:
+           operating_income - (gross_profit - operating_expenses),
+           ['OperatingIncomeLoss', 'GrossProfit', 'OperatingExpenses'],
+           missing=['OtherOperatingIncome']),
+    # Move IncomeFromEquityMethodInvestments
+    Impute('IncomeBeforeEquityMethodInvestments', sub,
+           ['IncomeFromContinuingOperationsBeforeTax', 'IncomeFromEquityMethodInvestments'],
+           present=['IncomeBeforeEquityMethodInvestments']),
+    Impute('OperatingIncomeLoss', sub, ['OperatingIncomeLoss', 'IncomeFromEquityMethodInvestments'],
+           present=['IncomeFromContinuingOperationsBeforeTax', 'IncomeBeforeEquityMethodInvestments']),
+    # DANGEROUS!!  May need to turn off. IS3 had 2085 PASSES WITHOUT this imputing. if it is higher,: keep the test
+    Impute('OperatingIncomeLoss', lambda income_before_equity_method, nonoperating_income, interest:
+           income_before_equity_method + nonoperating_income - interest,
+           ['IncomeBeforeEquityMethodInvestments', 'NonoperatingIncomeLoss', 'InterestAndDebtExpense'],
+           missing=['OperatingIncomeLoss']),
+    Impute('NonoperatingIncomePlusInterestAndDebtExpensePlusIncomeFromEquityMethodInvestments', sub,
+           ['IncomeFromContinuingOperationsBeforeTax', 'OperatingIncomeLoss']),
+    Impute('NonoperatingIncomeLossPlusInterestAndDebtExpense', sub,
+           ['NonoperatingIncomePlusInterestAndDebtExpensePlusIncomeFromEquityMethodInvestments',
+            'IncomeFromEquityMethodInvestments'],
+           missing=['NonoperatingIncomeLossPlusInterestAndDebtExpense']),
+])
+
+CASH_FLOW_STATEMENT = Stage('cash flow statement', [
+    Lookup('NetCashFlow', DURATION, ["us-gaap:CashAndCashEquivalentsPeriodIncreaseDecrease",
+                                     "us-gaap:CashPeriodIncreaseDecrease",
+                                     "us-gaap:NetCashProvidedByUsedInContinuingOperations"]),
+    Lookup('NetCashFlowsOperating', DURATION, ["us-gaap:NetCashProvidedByUsedInOperatingActivities"]),
+    Lookup('NetCashFlowsInvesting', DURATION, ["us-gaap:NetCashProvidedByUsedInInvestingActivities"]),
+    Lookup('NetCashFlowsFinancing', DURATION, ["us-gaap:NetCashProvidedByUsedInFinancingActivities"]),
+    Lookup('NetCashFlowsOperatingContinuing', DURATION, [
+        "us-gaap:NetCashProvidedByUsedInOperatingActivitiesContinuingOperations"]),
+    Lookup('NetCashFlowsInvestingContinuing', DURATION, [
+        "us-gaap:NetCashProvidedByUsedInInvestingActivitiesContinuingOperations"]),
+    Lookup('NetCashFlowsFinancingContinuing', DURATION, [
+        "us-gaap:NetCashProvidedByUsedInFinancingActivitiesContinuingOperations"]),
+    Lookup('NetCashFlowsOperatingDiscontinued', DURATION, [
+        "us-gaap:CashProvidedByUsedInOperatingActivitiesDiscontinuedOperations"]),
+    Lookup('NetCashFlowsInvestingDiscontinued', DURATION, [
+        "us-gaap:CashProvidedByUsedInInvestingActivitiesDiscontinuedOperations"]),
+    Lookup('NetCashFlowsFinancingDiscontinued', DURATION, [
+        "us-gaap:CashProvidedByUsedInFinancingActivitiesDiscontinuedOperations"]),
+    Lookup('NetCashFlowsDiscontinued', DURATION, ["us-gaap:NetCashProvidedByUsedInDiscontinuedOperations"]),
+    Lookup('ExchangeGainsLosses', DURATION, [
+        "us-gaap:EffectOfExchangeRateOnCashAndCashEquivalents",
+        "us-gaap:EffectOfExchangeRateOnCashAndCashEquivalentsContinuingOperations",
+        "us-gaap:CashProvidedByUsedInFinancingActivitiesDiscontinuedOperations"]),
+
+    # Total net cash flows discontinued if not reported
+    Impute('NetCashFlowsDiscontinued', lambda operating, investing, financing: operating + investing + financing,
+           ['NetCashFlowsOperatingDiscontinued', 'NetCashFlowsInvestingDiscontinued',
+            'NetCashFlowsFinancingDiscontinued'],
+           missing=['NetCashFlowsDiscontinued']),
+    # Cash flows from continuing
+    Impute('NetCashFlowsOperatingContinuing', sub, ['NetCashFlowsOperating', 'NetCashFlowsOperatingDiscontinued'],
+           missing=['NetCashFlowsOperatingContinuing']),
+    Impute('NetCashFlowsInvestingContinuing', sub, ['NetCashFlowsInvesting', 'NetCashFlowsInvestingDiscontinued'],
+           missing=['NetCashFlowsInvestingContinuing']),
+    Impute('NetCashFlowsFinancingContinuing', sub, ['NetCashFlowsFinancing', 'NetCashFlowsFinancingDiscontinued'],
+           missing=['NetCashFlowsFinancingContinuing']),
+    Impute('NetCashFlowsOperating', _same, ['NetCashFlowsOperatingContinuing'],
+           missing=['NetCashFlowsOperating', 'NetCashFlowsOperatingDiscontinued']),
+    Impute('NetCashFlowsInvesting', _same, ['NetCashFlowsInvestingContinuing'],
+           missing=['NetCashFlowsInvesting', 'NetCashFlowsInvestingDiscontinued']),
+    Impute('NetCashFlowsFinancing', _same, ['NetCashFlowsFinancingContinuing'],
+           missing=['NetCashFlowsFinancing', 'NetCashFlowsFinancingDiscontinued']),
+    Impute('NetCashFlowsContinuing', lambda operating, investing, financing: operating + investing + financing,
+           ['NetCashFlowsOperatingContinuing', 'NetCashFlowsInvestingContinuing', 'NetCashFlowsFinancingContinuing']),
+    # If net cash flow is missing, this tries to figure out the value by adding up the detail
+    Impute('NetCashFlow', _sum_present, ['NetCashFlowsOperating', 'NetCashFlowsInvesting', 'NetCashFlowsFinancing'],
+           missing=['NetCashFlow'], partial=True,
+           vectorized=lambda operating, investing, financing: operating + investing + financing),
+])
+
+KEY_RATIOS = Stage('key ratios', [
+    Impute('SGR', _sgr, ['NetIncomeLoss', 'Revenues', 'Assets', 'Equity']),
+    Impute('ROA', _div, ['NetIncomeLoss', 'Assets']),
+    Impute('ROE', _div, ['NetIncomeLoss', 'Equity']),
+    Impute('ROS', _div, ['NetIncomeLoss', 'Revenues']),
+], on_error=SKIP)
+
+OTHER = Stage('other', [
+    Lookup('ResearchAndDevelopmentExpense', DURATION, ['us-gaap:ResearchAndDevelopmentExpense']),
+])
+
+# Labels found at:
+# https://www.ifrs.org/-/media/feature/standards/taxonomy/2018/2018-taxonomy-view-with-definitions.xlsx?la=en&hash=5532C37EEAD057F62AA9AA1C920E33F43B3140FD
+IFRS = Stage('ifrs', [
+    # These are the ones also found on GAAP:
+    Lookup('Revenues', DURATION, ['ifrs-full:Revenue', 'ifrs-full:RevenueFromSaleOfOilAndGasProducts'],
+           only_if_missing=True),
+    Lookup('NetIncomeAttributableToParent', DURATION, ["ifrs-full:ProfitLossAttributableToOwnersOfParent"],
+           only_if_missing=True),
+    Lookup('Assets', INSTANT, ['ifrs-full:Assets'], only_if_missing=True),
+    Lookup('CurrentAssets', INSTANT, ['ifrs-full:CurrentAssets'], only_if_missing=True),
+    Lookup('NoncurrentAssets', INSTANT, ['ifrs-full:NoncurrentAssets'], only_if_missing=True),
+    Lookup('Liabilities', INSTANT, ['ifrs-full:Liabilities'], only_if_missing=True),
+    Lookup('CurrentLiabilities', INSTANT, ['ifrs-full:CurrentLiabilities'], only_if_missing=True),
+    Lookup('NoncurrentLiabilities', INSTANT, ['ifrs-full:NoncurrentLiabilities'], only_if_missing=True),
+    Lookup('LiabilitiesAndEquity', INSTANT, ['ifrs-full:EquityAndLiabilities'], only_if_missing=True),
+    Lookup('Equity', INSTANT, ['ifrs-full:Equity'], only_if_missing=True),
+    Lookup('CostOfRevenue', DURATION, ['ifrs-full:CostOfSales'], only_if_missing=True),
+    Lookup('GrossProfit', DURATION, ['ifrs-full:GrossProfit'], only_if_missing=True),
+    Lookup('NetCashFlowsOperating', DURATION, ['ifrs-full:CashFlowsFromUsedInOperatingActivities'],
+           only_if_missing=True),
+    Lookup('NetCashFlowsInvesting', DURATION, ['ifrs-full:CashFlowsFromUsedInInvestingActivities'],
+           only_if_missing=True),
+    Lookup('NetCashFlowsFinancing', DURATION, ['ifrs-full:CashFlowsFromUsedInFinancingActivities'],
+           only_if_missing=True),
+    # Might also try to use IncreaseDecreaseInCashAndCashEquivalentsBeforeEffectOfExchangeRateChanges ??
+    # Makes sense since many 20-F forms can use foreign currencies
+    Lookup('NetCashFlow', DURATION, ['ifrs-full:IncreaseDecreaseInCashAndCashEquivalents'], only_if_missing=True),
+    # Fails when any of the cash flows is missing, which skips the rest of the IFRS concepts
+    Impute('NetCashFlow', lambda operating, investing, financing: operating + investing + financing,
+           ['NetCashFlowsOperating', 'NetCashFlowsInvesting', 'NetCashFlowsFinancing'],
+           missing=['NetCashFlow'], strict=True),
+    Lookup('OperatingExpenses', DURATION, ['ifrs-full:OperatingExpense'], only_if_missing=True),
+    Lookup('OperatingIncomeLoss', DURATION, ['ifrs-full:ProfitLossBeforeTax'], only_if_missing=True),
+    Lookup('InterestAndDebtExpense', DURATION, ['ifrs-full:InterestExpense'], only_if_missing=True),
+    Lookup('IncomeFromContinuingOperationsBeforeTax', DURATION, ['ifrs-full:ProfitLossBeforeTax'],
+           only_if_missing=True),
+    Lookup('NetIncomeLoss', DURATION, ['ifrs-full:ProfitLoss'], only_if_missing=True),
+    Lookup('ResearchAndDevelopmentExpense', DURATION, ['ifrs-full:ResearchAndDevelopmentExpense'],
+           only_if_missing=True),
+
+    # These are the ones not found on pysec GAAP parsing:
+    Lookup('SellingGeneralAndAdministrativeExpense', DURATION, ['ifrs-full:SellingGeneralAndAdministrativeExpense']),
+    Lookup('RentalExpenses', DURATION, ['ifrs-full:RentalExpense']),
+    Lookup('RepairsAndMaintenanceExpense', DURATION, ['ifrs-full:RepairsAndMaintenanceExpense']),
+    Lookup('SalesAndMarketingExpense', DURATION, ['ifrs-full:SalesAndMarketingExpense']),
+], on_error=ABORT)
+
+FUNDAMENTALS_PLAN = EvaluationPlan([BALANCE_SHEET, INCOME_STATEMENT, CASH_FLOW_STATEMENT, KEY_RATIOS, OTHER, IFRS])
 
-        if self.xbrl.fields['NetCashFlow'] is None:
-            # Might also try to use IncreaseDecreaseInCashAndCashEquivalentsBeforeEffectOfExchangeRateChanges ??
-            # Makes sense since many 20-F forms can use foreign currencies
-            self.xbrl.fields['NetCashFlow'] = self.xbrl.GetFactValue(
-                'ifrs-full:IncreaseDecreaseInCashAndCashEquivalents', 'Duration')
-            if self.xbrl.fields['NetCashFlow'] is None:
-                self.xbrl.fields['NetCashFlow'] = self.xbrl.fields['NetCashFlowsOperating'] + \
-                                                  self.xbrl.fields['NetCashFlowsInvesting'] + \
-                                                  self.xbrl.fields['NetCashFlowsFinancing']
 
-        if self.xbrl.fields['OperatingExpenses'] is None:
-            self.xbrl.fields['OperatingExpenses'] = self.xbrl.GetFactValue('ifrs-full:OperatingExpense',
-                                                                           'Duration')
+class FundamentantalAccountingConcepts:
 
-        if self.xbrl.fields['OperatingIncomeLoss'] is None:
-            self.xbrl.fields['OperatingIncomeLoss'] = self.xbrl.GetFactValue('ifrs-full:ProfitLossBeforeTax',
-                                                                             'Duration')
+    def __init__(self, xbrl, no_output=True, fields=None):
+        """Computes the fundamental accounting concepts of `xbrl` into `fields`.
 
-        if self.xbrl.fields['InterestAndDebtExpense'] is None:
-            self.xbrl.fields['InterestAndDebtExpense'] = self.xbrl.GetFactValue('ifrs-full:InterestExpense',
-                                                                                'Duration')
+        :param xbrl: Parsed instance document.
+        :param no_output: Defaults to True. Prints a check report if False.
+        :param fields: Optional. FieldsDataset holding the period contexts to evaluate. Defaults to `xbrl.fields`.
+        """
 
-        if self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] is None:
-            self.xbrl.fields['IncomeFromContinuingOperationsBeforeTax'] = self.xbrl.GetFactValue(
-                'ifrs-full:ProfitLossBeforeTax', 'Duration')
+        self.xbrl = xbrl
+        self.fields = xbrl.fields if fields is None else fields
 
-        if self.xbrl.fields['NetIncomeLoss'] is None:
-            self.xbrl.fields['NetIncomeLoss'] = self.xbrl.GetFactValue('ifrs-full:ProfitLoss', 'Duration')
+        if not no_output:
+            print(" ")
+            print("FUNDAMENTAL ACCOUNTING CONCEPTS CHECK REPORT:")
 
-        if self.xbrl.fields['ResearchAndDevelopmentExpense'] is None:
-            self.xbrl.fields['ResearchAndDevelopmentExpense'] = self.xbrl.GetFactValue(
-                'ifrs-full:ResearchAndDevelopmentExpense', 'Duration')
+            print("Entity regiant name: %s" % self.fields['EntityRegistrantName'])
+            print("CIK: %s" % self.fields['EntityCentralIndexKey'])
+            print("Entity filer category: %s" % self.fields['EntityFilerCategory'])
+            print("Trading symbol: %s" % self.fields['TradingSymbol'])
+            print("Fiscal year: %s" % self.fields['DocumentFiscalYearFocus'])
+            print("Fiscal period: %s" % self.fields['DocumentFiscalPeriodFocus'])
+            print("Document type: %s" % self.fields['DocumentType'])
 
-        # These are the ones not found on pysec GAAP parsing:
+            print("Balance Sheet Date (document period end date): %s" % self.fields['BalanceSheetDate'])
+            print("Income Statement Period (YTD, current period, period start date): %s to %s" % (
+                self.fields['IncomeStatementPeriodYTD'], self.fields['BalanceSheetDate']))
 
-        self.xbrl.fields['SellingGeneralAndAdministrativeExpense'] = self.xbrl.GetFactValue(
-            'ifrs-full:SellingGeneralAndAdministrativeExpense', 'Duration')
+            print("Context ID for document period focus (instants): %s" % self.fields['ContextForInstants'])
+            print("Context ID for YTD period (durations): %s" % self.fields['ContextForDurations'])
+            print(" ")
 
-        self.xbrl.fields['RentalExpenses'] = self.xbrl.GetFactValue('ifrs-full:RentalExpense', 'Duration')
+        FUNDAMENTALS_PLAN.evaluate(self.xbrl, self.fields)
 
-        self.xbrl.fields['RepairsAndMaintenanceExpense'] = self.xbrl.GetFactValue(
-            'ifrs-full:RepairsAndMaintenanceExpense', 'Duration')
 
-        self.xbrl.fields['SalesAndMarketingExpense'] = self.xbrl.GetFactValue('ifrs-full:SalesAndMarketingExpense',
-                                                                              'Duration')
+def batch_fundamentals(xbrls, fields=None):
+    """Computes the fundamental accounting concepts of several filings at once. Requires NumPy.
 
+    :param xbrls: Parsed instance documents.
+    :param fields: Optional. One FieldsDataset per instance, holding the period contexts.
+        Defaults to the current period of each instance.
+    :return: One array per field, with a row per filing and NaN where the field has no value.
+    :rtype: dict[str, numpy.ndarray]
+    """
+    return FUNDAMENTALS_PLAN.evaluate_batch(FUNDAMENTALS_PLAN.collect_batch(xbrls, fields))
@@ -0,0 +1,178 @@
+"""Inline XBRL: facts tagged in the primary HTML document of a filing.
+
+The contexts and units are declared in the hidden `ix:header` of the document, and each fact is an
+`ix:nonFraction` (numbers) or `ix:nonNumeric` (text, dates) element wrapping the displayed value.
+Displayed values are normalized (transformation format, scale and sign), so the facts read the same as in the
+instance document.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+from .xbrl import XBRL, Fact
+
+IX_NAMESPACES = ['http://www.xbrl.org/2013/inlineXBRL', 'http://www.xbrl.org/2008/inlineXBRL']
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+
+NON_FRACTION_TAGS = {'{%s}nonFraction' % ns for ns in IX_NAMESPACES}
+NON_NUMERIC_TAGS = {'{%s}nonNumeric' % ns for ns in IX_NAMESPACES}
+
+MONTHS = {month: number for number, month in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+month_day_year_re = re.compile(r'([a-zA-Z]+)\.?\s*(\d{1,2}),?\s*(\d{4})')
+day_month_year_re = re.compile(r'(\d{1,2})\s*([a-zA-Z]+)\.?,?\s*(\d{4})')
+numeric_date_re = re.compile(r'(\d{1,2})\D(\d{1,2})\D(\d{2}|\d{4})$')
+
+
+def is_inline_xbrl(document):
+    """Whether an HTML document has inline XBRL facts.
+
+    :param document: Document, as str or bytes.
+    :rtype: bool
+    """
+    for namespace in IX_NAMESPACES:
+        if isinstance(document, bytes):
+            namespace = namespace.encode()
+        if namespace in document:
+            return True
+    return False
+
+
+def _iso_date(year, month, day):
+    year = int(year)
+    if year < 100:
+        year += 2000
+    return '%04d-%02d-%02d' % (year, int(month), int(day))
+
+
+def _month(name):
+    return MONTHS[name[:3].lower()]
+
+
+def _number_dot_decimal(text):
+    return re.sub(r'[^0-9.]', '', text)
+
+
+def _number_comma_decimal(text):
+    return re.sub(r'[^0-9,]', '', text).replace(',', '.')
+
+
+def _zero(text):
+    return '0'
+
+
+def _date_month_day_year(text):
+    month, day, year = month_day_year_re.search(text).groups()
+    return _iso_date(year, _month(month), day)
+
+
+def _date_day_month_year(text):
+    day, month, year = day_month_year_re.search(text).groups()
+    return _iso_date(year, _month(month), day)
+
+
+def _date_numeric_month_first(text):
+    month, day, year = numeric_date_re.search(text).groups()
+    return _iso_date(year, month, day)
+
+
+def _date_numeric_day_first(text):
+    day, month, year = numeric_date_re.search(text).groups()
+    return _iso_date(year, month, day)
+
+
+# Transformation rules by local name, from the 2010-2015 transformation registries
+TRANSFORMS = {
+    'numdotdecimal': _number_dot_decimal,
+    'num-dot-decimal': _number_dot_decimal,
+    'numcommadot': _number_dot_decimal,
+    'numspacedot': _number_dot_decimal,
+    'numcommadecimal': _number_comma_decimal,
+    'num-comma-decimal': _number_comma_decimal,
+    'numdotcomma': _number_comma_decimal,
+    'numspacecomma': _number_comma_decimal,
+    'zerodash': _zero,
+    'numdash': _zero,
+    'fixed-zero': _zero,
+    'datemonthdayyearen': _date_month_day_year,
+    'date-monthname-day-year-en': _date_month_day_year,
+    'datelongus': _date_month_day_year,
+    'dateshortus': _date_month_day_year,
+    'datedaymonthyearen': _date_day_month_year,
+    'date-day-monthname-year-en': _date_day_month_year,
+    'datelonguk': _date_day_month_year,
+    'dateshortuk': _date_day_month_year,
+    'dateslashus': _date_numeric_month_first,
+    'datedotus': _date_numeric_month_first,
+    'date-month-day-year': _date_numeric_month_first,
+    'dateslasheu': _date_numeric_day_first,
+    'datedoteu': _date_numeric_day_first,
+    'date-day-month-year': _date_numeric_day_first,
+}
+
+
+def _transform(element, text):
+    format_name = element.get('format')
+    if not format_name:
+        return None
+    transform = TRANSFORMS.get(format_name.rpartition(':')[2])
+    if transform is None:
+        return None
+    return transform(text)
+
+
+class InlineXBRL(XBRL):
+    """XBRL read from an inline XBRL document, e.g. the primary HTML of a filing.
+    Provides the same contexts, units, facts and fields as `XBRL` does for the instance document.
+
+    :Example:
+
+    >>> xbrl = InlineXBRL(html.encode())
+    >>> xbrl.fields['Revenues']
+    """
+    # The primary documents are XHTML, but not always well-formed
+    recover = True
+
+    def _concept(self, element):
+        prefix, _, name = (element.get('name') or '').partition(':')
+        namespace = element.nsmap.get(prefix)
+        if namespace is None:
+            return None
+        return '{%s}%s' % (namespace, name)
+
+    def _read_fact(self, element):
+        is_numeric = element.tag in NON_FRACTION_TAGS
+        if not is_numeric and element.tag not in NON_NUMERIC_TAGS:
+            return None
+
+        context_ref = element.get('contextRef')
+        concept = self._concept(element)
+        if context_ref is None or concept is None:
+            return None
+
+        if element.get('{%s}nil' % XSI_NS) == 'true':
+            # Same as a nil fact of an instance document
+            text = None
+        elif is_numeric:
+            text = self._read_number(element)
+        else:
+            text = ''.join(element.itertext()).strip()
+            try:
+                text = _transform(element, text) or text
+            except (AttributeError, KeyError):
+                pass
+
+        return Fact(concept=concept, context_ref=context_ref,
+                    unit_ref=element.get('unitRef'), text=text, nil=False)
+
+    def _read_number(self, element):
+        text = ''.join(element.itertext()).strip()
+        try:
+            value = Decimal(_transform(element, text) or text.replace(',', '').replace(' ', ''))
+            value = value.scaleb(int(element.get('scale') or 0))
+        except (AttributeError, KeyError, InvalidOperation, ValueError):
+            return None
+
+        if element.get('sign') == '-':
+            value = -value
+        return format(value, 'f')
@@ -0,0 +1,55 @@
+"""Parsing of XBRL instance documents on a pool of processes.
+
+Parsing is CPU bound, and `XBRL` objects hold lxml trees that can't be pickled, so the workers send back
+`ParsedXBRL` summaries instead.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .xbrl import XBRL
+
+
+def parse_xbrl(xbrl_doc, all_periods=False):
+    """Parses an instance document into its picklable summary.
+
+    :param xbrl_doc: Instance document, as bytes.
+    :param all_periods: Defaults to False. Whether to compute the fields of every period.
+    :return: The summary, or None if the document could not be parsed.
+    :rtype: edgar_data.xbrl.ParsedXBRL
+    """
+    try:
+        return XBRL(xbrl_doc).GetSummary(all_periods)
+    except Exception:
+        return None
+
+
+def parse_xbrl_many(xbrl_docs, processes=None, all_periods=False):
+    """Parses instance documents on a pool of processes.
+    Documents are read from `xbrl_docs` as workers become free, so it can be a generator of downloads.
+
+    :Example:
+
+    >>> for parsed in parse_xbrl_many(docs, processes=8):
+    ...     if parsed is not None:
+    ...         print(parsed.fields['Revenues'], parsed.fields.currency('Revenues'))
+
+    :param xbrl_docs: Iterable of instance documents, as bytes.
+    :param processes: Optional. Number of worker processes. Defaults to the number of CPUs.
+    :param all_periods: Defaults to False. Whether to compute the fields of every period.
+    :return: Generator of summaries, in the order of `xbrl_docs`. None for documents that could not be parsed.
+    :rtype: collections.Iterable[edgar_data.xbrl.ParsedXBRL]
+    """
+    processes = processes or os.cpu_count() or 1
+    # Bounds the documents held in memory, while keeping every worker busy
+    window = processes * 4
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque()
+        for xbrl_doc in xbrl_docs:
+            pending.append(executor.submit(parse_xbrl, xbrl_doc, all_periods))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -1,5 +1,10 @@
+import re
+
 from setuptools import setup, find_packages
 
+with open('edgar_data/__init__.py') as f:
+    version = re.search(r"__version__ = '(.*?)'", f.read()).group(1)
+
 setup(
     author="Gaussian Holdings, LLC",
     classifiers=[
@@ -11,10 +16,12 @@ setup(
     ],
     description="A tool for retrieving information from EDGAR.",
     name="edgar_data",
-    version='0.2.10',
+    version=version,
     url='https://github.com/gaussian/edgar-data/',
     setup_requires=['pytest-runner'],
     tests_require=['pytest', 'pytest-cov', 'pytest-mock'],
     install_requires=['requests', 'lxml', 'beautifulsoup4'],
-    packages=find_packages()
+    extras_require={'batch': ['numpy']},
+    packages=find_packages(),
+    entry_points={'console_scripts': ['edgar-data-bulk = edgar_data.bulk:main']}
 )
@@ -1,6 +1,10 @@
+import os
+
 import pytest
 from edgar_data import EdgarData
 
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
 
 @pytest.fixture
 def sec():
@@ -108,3 +112,27 @@ def sec():
 ])
 def company(request):
     return request.param
+
+
+@pytest.fixture
+def sample_10k():
+    with open(os.path.join(FIXTURES_DIR, 'sample-10k.xml'), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def sample_10k_inline():
+    with open(os.path.join(FIXTURES_DIR, 'sample-10k.htm'), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def sample_10k_index():
+    with open(os.path.join(FIXTURES_DIR, 'sample-10k-index.htm'), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def sample_daily_index():
+    with open(os.path.join(FIXTURES_DIR, 'master.20180208.idx'), 'rb') as f:
+        return f.read()
@@ -0,0 +1,239 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import EdgarForm
+from edgar_data.bulk import BulkJob, BulkJobError, main, merge, shard_of
+from edgar_data.cache import FundamentalsCache
+from edgar_data.filing_index import FilingIndex
+from edgar_data.search import FullTextIndex
+from edgar_data.throttle import RateLimiter, SharedRateLimiter
+from edgar_data.xbrl import XBRL, Field, FieldsDataset
+
+INDEX_URL = 'https://www.sec.gov/Archives/edgar/data/{0}/{1}-index.htm'
+
+FILINGS = {
+    ('0000000001', '10-K'): ['0000000001-17-000001', '0000000001-18-000001'],
+    ('0000000001', '10-Q'): ['0000000001-18-000002'],
+    ('0000000002', '10-K'): ['0000000002-18-000001'],
+    ('0000000002', '10-Q'): [],
+}
+
+
+def make_form(cik, form_type, index_url, **kwargs):
+    fields = FieldsDataset()
+    fields['TradingSymbol'] = 'ABC'
+    fields['DocumentFiscalPeriodFocus'] = 'FY'
+    fields['DocumentFiscalYearFocus'] = '2017'
+    fields['Revenues'] = Field(1000.0, 'USD')
+    filing = {'form': form_type, 'period_of_report': '2017-12-31', 'filing_date': '2018-02-20',
+              'index_url': index_url, 'accession_number': index_url.rpartition('/')[2][:20]}
+    return EdgarForm('<html>{0}</html>'.format(index_url), None, cik, index_url, filing, [], fields=fields)
+
+
+@pytest.fixture
+def edgar(mocker):
+    edgar = EdgarData()
+    mocker.patch.object(edgar, 'get_cik', return_value='0000000002')
+    mocker.patch.object(edgar, 'list_filings', side_effect=lambda cik, form, date_start, date_end: [
+        INDEX_URL.format(int(cik), number) for number in FILINGS[(cik, form)]])
+    mocker.patch.object(edgar, 'get_filing', side_effect=make_form)
+    return edgar
+
+
+class TestBulkJob:
+
+    def test_run(self, tmpdir, edgar):
+        job = BulkJob(str(tmpdir), ['1', 'ABC'], date_start=datetime(2017, 1, 1), edgar=edgar)
+
+        assert job.run() == {'pending': 0, 'done': 4, 'failed': 0}
+        edgar.get_cik.assert_called_once_with(ticker='ABC')
+
+        with open(str(tmpdir.join('0000000001', '0000000001-18-000001.json'))) as f:
+            record = json.load(f)
+        assert record['form_type'] == '10-K'
+        assert record['filing_date'] == '2018-02-20'
+        assert record['fields']['Revenues'] == 1000.0
+        assert record['currencies'] == {'Revenues': 'USD'}
+        assert tmpdir.join('0000000002', '0000000002-18-000001.htm').read() == '<html>{0}</html>'.format(
+            INDEX_URL.format(2, '0000000002-18-000001'))
+
+    def test_resume(self, tmpdir, edgar):
+        edgar.get_filing.side_effect = [make_form('0000000001', '10-K', INDEX_URL.format(1, '0000000001-17-000001')),
+                                        KeyboardInterrupt]
+        job = BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), workers=1, edgar=edgar)
+        with pytest.raises(KeyboardInterrupt):
+            job.run()
+        job.close()
+
+        edgar.list_filings.reset_mock()
+        edgar.get_filing.reset_mock()
+        edgar.get_filing.side_effect = make_form
+        job = BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), edgar=edgar)
+
+        assert job.run() == {'pending': 0, 'done': 3, 'failed': 0}
+        assert edgar.list_filings.call_count == 0
+        assert sorted(call[0][2] for call in edgar.get_filing.call_args_list) == [
+            INDEX_URL.format(1, '0000000001-18-000001'), INDEX_URL.format(1, '0000000001-18-000002')]
+
+    def test_failures(self, tmpdir, edgar):
+        def get_filing(cik, form_type, index_url, **kwargs):
+            if form_type == '10-Q':
+                raise ValueError('Malformed filing')
+            return make_form(cik, form_type, index_url)
+
+        edgar.get_filing.side_effect = get_filing
+        job = BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), edgar=edgar)
+        assert job.run() == {'pending': 0, 'done': 2, 'failed': 1}
+        assert job.run() == {'pending': 0, 'done': 2, 'failed': 1}
+        assert edgar.get_filing.call_count == 3
+
+        edgar.get_filing.side_effect = make_form
+        assert job.run(retry_failed=True) == {'pending': 0, 'done': 3, 'failed': 0}
+        assert job.connection.execute('SELECT attempts FROM filings WHERE form = ?', ('10-Q',)).fetchone() == (2,)
+
+    def test_cache_and_index(self, tmpdir, mocker, sample_10k):
+        # The cache and the index are used from the workers' threads
+        cache = FundamentalsCache(str(tmpdir.join('fundamentals.db')))
+        index = FullTextIndex(str(tmpdir.join('index.db')))
+        edgar = EdgarData(cache=cache, index=index)
+        mocker.patch.object(edgar, 'get_cik', return_value='0000000002')
+        mocker.patch.object(edgar, 'list_filings', side_effect=lambda cik, form, date_start, date_end: [
+            INDEX_URL.format(int(cik), number) for number in FILINGS[(cik, form)]])
+        mocker.patch.object(edgar, '_get_filing', side_effect=lambda cik, form, index_url: {
+            'form': form, 'index_url': index_url, 'index': FilingIndex(index_url, '2018-02-20', None, [], []),
+            'period_of_report': '2017-12-31', 'filing_date': '2018-02-20',
+            'accession_number': index_url.rpartition('/')[2][:20]})
+        mocker.patch.object(edgar, 'retrieve', side_effect=lambda index_url, form, filing_index, **kwargs: (
+            index_url, '<p>Item 1A. Risk Factors</p><p>Going concern.</p>', XBRL(sample_10k)))
+
+        job = BulkJob(str(tmpdir.join('out')), ['1', 'ABC'], date_start=datetime(2017, 1, 1), workers=4, edgar=edgar)
+
+        assert job.run() == {'pending': 0, 'done': 4, 'failed': 0}
+        assert cache.get('0000000002-18-000001')['Revenues'].value == 3e9
+        assert sorted(hit.accession_number for hit in index.search('"going concern"')) == [
+            '0000000001-17-000001', '0000000001-18-000001', '0000000001-18-000002', '0000000002-18-000001']
+
+    def test_other_settings(self, tmpdir, edgar):
+        BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), edgar=edgar).close()
+
+        with pytest.raises(BulkJobError):
+            BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), form_types=['8-K'], edgar=edgar)
+
+    def test_main(self, tmpdir, mocker):
+        run = mocker.patch.object(BulkJob, 'run', return_value={'pending': 0, 'done': 2, 'failed': 1})
+        companies = tmpdir.join('companies.txt')
+        companies.write('320193\n\nMSFT\n')
+
+        assert main([str(tmpdir.join('out')), '--ciks', '1', '--companies-file', str(companies),
+                     '--date-start', '2017-01-01', '--retry-failed']) == 1
+        run.assert_called_once_with(retry_failed=True)
+        assert os.path.exists(str(tmpdir.join('out', 'manifest.db')))
+
+        with pytest.raises(SystemExit):
+            main([str(tmpdir.join('out')), '--ciks', '1'])
+
+
+class TestShards:
+
+    def test_shard_of(self):
+        identifiers = [str(cik) for cik in range(1, 200)]
+        shards = [shard_of(identifier, 4) for identifier in identifiers]
+
+        assert set(shards) == {0, 1, 2, 3}
+        assert shard_of('320193', 4) == shard_of('0000320193', 4)
+        assert shard_of('ibm', 4) == shard_of('IBM', 4)
+
+    def test_sharded_jobs(self, tmpdir, edgar):
+        for index in range(3):
+            job = BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), shard=(index, 3), edgar=edgar)
+            assert job.identifiers == [identifier for identifier in ['1', '2'] if shard_of(identifier, 3) == index]
+            job.run()
+            job.close()
+
+        assert edgar.list_filings.call_count == 4
+        assert sorted(os.path.basename(path) for path in tmpdir.listdir() if path.ext == '.db') == [
+            'manifest-0-of-3.db', 'manifest-1-of-3.db', 'manifest-2-of-3.db']
+
+        assert merge(str(tmpdir)) == {'pending': 0, 'done': 4, 'failed': 0}
+        records = [json.loads(line) for line in tmpdir.join('filings.jsonl').readlines()]
+        assert [record['accession_number'] for record in records] == [
+            '0000000001-17-000001', '0000000001-18-000001', '0000000001-18-000002', '0000000002-18-000001']
+
+        with pytest.raises(ValueError):
+            BulkJob(str(tmpdir), ['1'], date_start=datetime(2017, 1, 1), shard=(3, 3), edgar=edgar)
+
+    def test_other_split(self, tmpdir, edgar):
+        for index in range(2):
+            job = BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), shard=(index, 2), edgar=edgar)
+            job.run()
+            job.close()
+        assert json.loads(tmpdir.join('job.json').read()) == {'shard_count': 2}
+
+        with pytest.raises(BulkJobError):
+            BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), shard=(0, 4), edgar=edgar)
+        with pytest.raises(BulkJobError):
+            BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), edgar=edgar)
+        assert main([str(tmpdir), '--ciks', '1', '2', '--date-start', '2017-01-01', '--processes', '4']) == 2
+        assert sorted(os.path.basename(path) for path in tmpdir.listdir() if path.ext == '.db') == [
+            'manifest-0-of-2.db', 'manifest-1-of-2.db']
+
+        # Manifests of other splits are not merged
+        tmpdir.join('manifest-0-of-2.db').copy(tmpdir.join('manifest-0-of-4.db'))
+        assert merge(str(tmpdir)) == {'pending': 0, 'done': 4, 'failed': 0}
+
+        # Directories of jobs run before the split was recorded
+        tmpdir.join('job.json').remove()
+        with pytest.raises(BulkJobError):
+            BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), shard=(0, 2), edgar=edgar)
+        tmpdir.join('manifest-0-of-4.db').remove()
+        BulkJob(str(tmpdir), ['1', '2'], date_start=datetime(2017, 1, 1), shard=(0, 2), edgar=edgar).close()
+        assert merge(str(tmpdir)) == {'pending': 0, 'done': 4, 'failed': 0}
+
+    def test_main_processes(self, tmpdir, mocker):
+        mocker.patch('edgar_data.bulk.ProcessPoolExecutor', ThreadPoolExecutor)
+        mocker.patch.object(BulkJob, 'run', return_value={'pending': 0, 'done': 1, 'failed': 0})
+        merge = mocker.patch('edgar_data.bulk.merge', return_value={'pending': 0, 'done': 2, 'failed': 0})
+        lock = str(tmpdir.join('requests.lock'))
+
+        assert main([str(tmpdir), '--ciks', '1', '2', '--date-start', '2017-01-01', '--processes', '2',
+                     '--shard-count', '3', '--shard-index', '1', '--rate-lock', lock]) == 0
+        assert sorted(os.path.basename(path) for path in tmpdir.listdir() if path.ext == '.db') == [
+            'manifest-2-of-6.db', 'manifest-3-of-6.db']
+        assert merge.call_count == 0
+
+        assert main([str(tmpdir), '--merge']) == 0
+        merge.assert_called_once_with(str(tmpdir))
+
+        with pytest.raises(SystemExit):
+            main([str(tmpdir), '--ciks', '1', '--date-start', '2017-01-01', '--shard-count', '2', '--shard-index', '2'])
+
+
+class TestRateLimiter:
+
+    def test_acquire(self):
+        limiter = RateLimiter(50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 5 / 50
+
+    def test_shared_acquire(self, tmpdir):
+        path = str(tmpdir.join('requests.lock'))
+        limiters = [SharedRateLimiter(path, 50), SharedRateLimiter(path, 50)]
+        start = time.monotonic()
+        for _ in range(3):
+            for limiter in limiters:
+                limiter.acquire()
+        assert time.monotonic() - start >= 5 / 50
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+        with pytest.raises(ValueError):
+            SharedRateLimiter(rate=0)
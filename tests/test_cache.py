@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import XBRLNotLoaded
+from edgar_data.cache import FundamentalsCache, selection_key
+from edgar_data.xbrl import XBRL
+
+
+class TestFundamentalsCache:
+
+    def test_put_get(self, tmpdir, sample_10k):
+        xbrl = XBRL(sample_10k)
+        cache = FundamentalsCache(str(tmpdir.join('fundamentals.db')))
+
+        assert cache.get('0000000001-18-000001') is None
+        cache.put('0000000001-18-000001', xbrl.fields)
+
+        fields = cache.get('0000000001-18-000001')
+        assert fields['Revenues'].value == 3e9
+        assert fields.currency('Revenues').code == 'USD'
+        assert fields['ContextForDurations'] == 'FY2017'
+        assert fields['ROA'] == xbrl.fields['ROA']
+        assert fields['OperatingExpenses'].value == xbrl.fields['OperatingExpenses'].value
+        assert fields['ExchangeGainsLosses'] is None
+
+        xbrl.loadYear(1)
+        cache.put('0000000001-18-000001', xbrl.fields, selection=selection_key(1))
+        assert cache.get('0000000001-18-000001', selection_key(1))['Revenues'].value == 2.6e9
+        assert cache.get('0000000001-18-000001')['Revenues'].value == 3e9
+
+    def test_find(self, tmpdir, sample_10k):
+        cache = FundamentalsCache(str(tmpdir.join('fundamentals.db')))
+        fields = XBRL(sample_10k).fields
+        cache.put('0000000001-18-000001', fields, cik='0000000001', form='10-K',
+                  period_of_report='2017-12-31', filing_date='2018-02-20')
+        cache.put('0000000001-17-000001', fields, cik='0000000001', form='10-K',
+                  period_of_report='2016-12-31', filing_date='2017-02-20')
+
+        found = cache.find('1', date_start=datetime(2018, 1, 1))
+        assert [filing.accession_number for filing in found] == ['0000000001-18-000001']
+        assert found[0].fields['Revenues'].value == 3e9
+        assert len(cache.find('1', form_types=['10-K'])) == 2
+        assert cache.find('1', form_types=['10-Q']) == []
+
+    def test_other_versions_are_ignored(self, tmpdir, sample_10k):
+        path = str(tmpdir.join('fundamentals.db'))
+        cache = FundamentalsCache(path)
+        cache.put('0000000001-18-000001', XBRL(sample_10k).fields)
+        cache.close()
+
+        cache = FundamentalsCache(path)
+        cache.version = 'other'
+        assert cache.get('0000000001-18-000001') is None
+
+        cache.purge()
+        cache.version = FundamentalsCache(path).version
+        assert cache.get('0000000001-18-000001') is None
+
+    def test_get_form_data_uses_cache(self, tmpdir, mocker, sample_10k):
+        cache = FundamentalsCache(str(tmpdir.join('fundamentals.db')))
+        sec = EdgarData(cache=cache)
+        filing = {'form': '10-K', 'index_url': 'https://www.sec.gov/0000000001-18-000001-index.htm', 'index': None,
+                  'period_of_report': '2017-12-31', 'filing_date': '2018-02-20',
+                  'accession_number': '0000000001-18-000001'}
+        mocker.patch.object(sec, '_get_all_filings_index_pages', side_effect=lambda *args: iter([filing]))
+        mocker.patch.object(sec, '_supplemental_links', return_value=[])
+        retrieve = mocker.patch.object(sec, 'retrieve', side_effect=lambda **kwargs: (
+            'text_url', None, XBRL(sample_10k) if kwargs['fetch_xbrl'] else None))
+
+        first = sec.get_form_data('1', datetime(2018, 1, 1), fetch_html=False, form_types=['10-K'])
+        second = sec.get_form_data('1', datetime(2018, 1, 1), fetch_html=False, form_types=['10-K'])
+
+        assert retrieve.call_args_list[0][1]['fetch_xbrl']
+        assert not retrieve.call_args_list[1][1]['fetch_xbrl']
+        assert second[0].xbrl is None
+        assert second[0].fields['Revenues'].value == first[0].fields['Revenues'].value
+        assert second[0].ticker == 'SMPL'
+        assert second[0].accession_number == '0000000001-18-000001'
+
+        first[0].set_period(this_year=True)
+        with pytest.raises(XBRLNotLoaded):
+            second[0].set_period(this_year=True)
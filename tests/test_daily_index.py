@@ -0,0 +1,88 @@
+import gzip
+from datetime import datetime
+
+import pytest
+import requests
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import EDGARRequestError
+from edgar_data.daily_index import DailyIndexNotFound, daily_index_url, parse_index
+from edgar_data.metrics import FILINGS_SKIPPED, MetricsRegistry
+from edgar_data.store import DocumentStore
+
+DATE = datetime(2018, 2, 8)
+
+
+class TestDailyIndex:
+
+    def test_parse_index(self, sample_daily_index):
+        filings = parse_index(sample_daily_index)
+
+        assert len(filings) == 6
+        assert filings[0].cik == '0001000045'
+        assert filings[0].company_name == 'NICHOLAS FINANCIAL INC'
+        assert filings[0].filing_date == '2018-02-08'
+        assert filings[0].accession_number == '0001193125-18-037381'
+        assert filings[0].index_url == ('https://www.sec.gov/Archives/edgar/data/1000045/000119312518037381/'
+                                        '0001193125-18-037381-index.htm')
+
+        assert [filing.accession_number for filing in parse_index(sample_daily_index, ['10-Q'])] == [
+            '0001193125-18-037381', '0001001039-18-000042']
+        assert parse_index(sample_daily_index.decode('latin-1'), ['8-K'])[0].cik == '0000100517'
+
+    def test_daily_index_url(self):
+        assert daily_index_url(DATE) == 'https://www.sec.gov/Archives/edgar/daily-index/2018/QTR1/master.20180208.idx'
+        assert daily_index_url(datetime(2018, 10, 1)).endswith('/2018/QTR4/master.20181001.idx')
+
+    def test_local_directory(self, tmpdir, sample_daily_index):
+        sec = EdgarData()
+        with gzip.open(str(tmpdir.join('master.20180208.idx.gz')), 'wb') as f:
+            f.write(sample_daily_index)
+
+        assert len(sec.get_daily_index(DATE, ['10-Q', '10-Q/A'], directory=str(tmpdir))) == 3
+        with pytest.raises(DailyIndexNotFound):
+            sec.get_daily_index(datetime(2018, 2, 10), directory=str(tmpdir))
+
+    def test_network(self, tmpdir, mocker, sample_daily_index):
+        sec = EdgarData(store=DocumentStore(str(tmpdir)))
+        get = mocker.patch('edgar_data.EdgarData.requests_get_retry',
+                           return_value=mocker.Mock(content=sample_daily_index))
+
+        assert len(sec.get_daily_index(DATE, ['8-K'])) == 1
+        assert len(sec.get_daily_index(DATE, ['10-Q'])) == 2
+        get.assert_called_once_with(daily_index_url(DATE), None, sec.metrics)
+
+        not_found = requests.HTTPError(response=mocker.Mock(status_code=404))
+        get.side_effect = not_found
+        with pytest.raises(DailyIndexNotFound):
+            sec.get_daily_index(datetime(2018, 2, 10))
+
+    def test_get_daily_form_data(self, tmpdir, mocker, sample_daily_index):
+        sec = EdgarData()
+        tmpdir.join('master.20180208.idx').write_binary(sample_daily_index)
+        get_filing = mocker.patch.object(sec, 'get_filing')
+
+        forms = sec.get_daily_form_data(DATE, form_types=['10-Q'], fetch_html=False, directory=str(tmpdir))
+
+        assert len(forms) == 2
+        assert [call[0][:2] for call in get_filing.call_args_list] == [('0001000045', '10-Q'), ('0001001039', '10-Q')]
+        assert get_filing.call_args[1] == {'fetch_html': False, 'fetch_xbrl': True}
+
+    def test_get_daily_form_data_failures(self, tmpdir, mocker, sample_daily_index):
+        metrics = MetricsRegistry()
+        sec = EdgarData(metrics=metrics)
+        tmpdir.join('master.20180208.idx').write_binary(sample_daily_index)
+        error = EDGARRequestError()
+        mocker.patch.object(sec, 'get_filing', side_effect=[error, 'form'])
+        failures = []
+
+        forms = sec.get_daily_form_data(DATE, form_types=['10-Q'], directory=str(tmpdir), failures=failures)
+
+        assert forms == ['form']
+        assert [(filing.cik, e) for filing, e in failures] == [('0001000045', error)]
+        assert metrics.get(FILINGS_SKIPPED, error='EDGARRequestError') == 1
+
+        # Errors other than failures to retrieve a filing are not skipped
+        mocker.patch.object(sec, 'get_filing', side_effect=AttributeError)
+        with pytest.raises(AttributeError):
+            sec.get_daily_form_data(DATE, form_types=['10-Q'], directory=str(tmpdir), failures=failures)
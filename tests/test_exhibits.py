@@ -0,0 +1,51 @@
+from edgar_data import EdgarData
+from edgar_data.EdgarData import EdgarForm
+
+LINKS = [
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/form10k.htm', '10-K', '2345678'),
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/ex21.htm', 'EX-21.1', '12345'),
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/ex99-1.htm', 'EX-99.1', '45678'),
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/ex99-2.pdf', 'EX-99.2', '9876543'),
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/ex991.htm', 'EX-991', '10'),
+    ('https://www.sec.gov/Archives/edgar/data/1/000000000118000001/graphic.jpg', 'GRAPHIC', None),
+]
+
+
+def make_form():
+    filing = {'form': '10-K', 'period_of_report': '2017-12-31', 'filing_date': '2018-02-20', 'index_url': None}
+    return EdgarForm(None, None, '0000000001', None, filing, LINKS)
+
+
+class TestExhibits:
+
+    def test_exhibit_links(self):
+        form = make_form()
+
+        assert [link_type for _, link_type, _ in form.exhibit_links(['EX-21', 'ex-99'])] == [
+            'EX-21.1', 'EX-99.1', 'EX-99.2']
+        assert [size for _, _, size in form.exhibit_links(['EX-99'], max_size=1000000)] == [45678]
+        assert [link_type for _, link_type, _ in form.exhibit_links(['GRAPHIC'], max_size=10)] == ['GRAPHIC']
+        assert form.exhibit_links(['EX-32']) == []
+
+    def test_get_exhibits(self, mocker):
+        sec = EdgarData()
+        retrieve = mocker.patch.object(sec, '_retrieve_document', side_effect=lambda url: url.rpartition('/')[2])
+
+        exhibits = sec.get_exhibits(make_form(), ['EX-21', 'EX-99'], max_size=1000000)
+
+        assert [(exhibit.type, exhibit.document) for exhibit in exhibits] == [
+            ('EX-21.1', 'ex21.htm'), ('EX-99.1', 'ex99-1.htm')]
+        assert retrieve.call_count == 2
+        assert sec.get_exhibits(make_form(), ['EX-32']) == []
+
+    def test_binary_exhibits(self, mocker):
+        sec = EdgarData()
+        mocker.patch.object(sec, '_retrieve_document', side_effect=lambda url: url.rpartition('/')[2])
+        get = mocker.patch('edgar_data.EdgarData.requests_get_retry',
+                           return_value=mocker.Mock(content=b'%PDF-1.4\xe2\xe3'))
+
+        exhibits = sec.get_exhibits(make_form(), ['EX-99'])
+
+        assert [(exhibit.type, exhibit.document) for exhibit in exhibits] == [
+            ('EX-99.1', 'ex99-1.htm'), ('EX-99.2', b'%PDF-1.4\xe2\xe3')]
+        assert get.call_args[0][0].endswith('ex99-2.pdf')
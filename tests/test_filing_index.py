@@ -0,0 +1,48 @@
+import pytest
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import FilingNotFound
+from edgar_data.filing_index import DATA_FILES_TABLE, FilingIndex
+
+INDEX_URL = 'https://www.sec.gov/Archives/edgar/data/1/000000000118000001/0000000001-18-000001-index.htm'
+DATA_URL = 'https://www.sec.gov/Archives/edgar/data/1/000000000118000001/'
+
+
+class TestFilingIndex:
+
+    def test_from_html(self, sample_10k_index):
+        filing_index = FilingIndex.from_html(sample_10k_index, INDEX_URL)
+
+        assert filing_index.filing_date == '2018-02-20'
+        assert filing_index.period_of_report == '2017-12-31'
+        assert [document.type for document in filing_index.documents] == ['10-K', 'EX-21.1', None]
+        assert filing_index.documents[1].description == 'SUBSIDIARIES OF THE REGISTRANT'
+        assert filing_index.data_files[0].name == 'smpl-20171231.xml'
+        assert filing_index.supplemental_links[1] == (DATA_URL + 'smpl-20171231xex21.htm', 'EX-21.1', '12345')
+
+    def test_find(self, sample_10k_index):
+        filing_index = FilingIndex.from_html(sample_10k_index, INDEX_URL)
+
+        assert filing_index.find('10-K').url == DATA_URL + 'smpl-20171231x10k.htm'
+        assert filing_index.find('EX-101.INS', DATA_FILES_TABLE).url == DATA_URL + 'smpl-20171231.xml'
+        assert filing_index.find('EX-101.INS') is None
+
+    def test_document_urls(self, sample_10k_index):
+        sec = EdgarData()
+        filing_index = FilingIndex.from_html(sample_10k_index, INDEX_URL)
+
+        assert sec._html_url('10-K', filing_index, INDEX_URL) == DATA_URL + 'smpl-20171231x10k.htm'
+        assert sec._xbrl_url(filing_index, INDEX_URL) == DATA_URL + 'smpl-20171231.xml'
+        with pytest.raises(FilingNotFound):
+            sec._html_url('20-F', filing_index, INDEX_URL)
+
+    def test_index_pages_are_parsed_once(self, mocker, sample_10k_index):
+        sec = EdgarData()
+        mocker.patch.object(sec, '_get_filings_index_urls', return_value=iter([(INDEX_URL, '10-K')]))
+        mocker.patch('edgar_data.EdgarData.requests_get_retry', return_value=mocker.Mock(content=sample_10k_index))
+
+        filing, = sec._get_filing_index_page('0000000001', '10-K', None, None)
+
+        assert filing['period_of_report'] == '2017-12-31'
+        assert filing['accession_number'] == '0000000001-18-000001'
+        assert isinstance(filing['index'], FilingIndex)
@@ -0,0 +1,54 @@
+import numpy
+import pytest
+
+from edgar_data.fx import FXRates, UnknownCurrencyError
+
+RATES_CSV = """date,currency,rate
+2017-01-02,JPY,117.0
+2017-12-29,JPY,112.0
+2017-01-02,EUR,0.95
+2017-12-29,EUR,0.83
+"""
+
+
+@pytest.fixture
+def rates(tmpdir):
+    path = tmpdir.join('rates.csv')
+    path.write(RATES_CSV)
+    return FXRates.from_csv([str(path)])
+
+
+class TestFXRates:
+
+    def test_rates(self, rates):
+        dates = numpy.array(['2016-12-31', '2017-01-02', '2017-06-30', '2018-03-31', 'NaT'], dtype='datetime64[D]')
+        found = rates.rates('JPY', dates)
+        assert numpy.isnan(found[0])
+        assert found[1:4].tolist() == [117.0, 117.0, 112.0]
+        assert numpy.isnan(found[4])
+        assert numpy.isnan(rates.rates('CNY', dates)).all()
+
+    def test_convert(self, rates):
+        converted = rates.convert([234e9, 10, 95, 5], ['JPY', 'USD', 'EUR', None],
+                                  ['2017-03-31', '2017-12-31', '2017-06-30', '2017-12-31'])
+        assert converted[:2].tolist() == pytest.approx([2e9, 10])
+        assert converted[2] == pytest.approx(100)
+        assert numpy.isnan(converted[3])
+
+        assert rates.convert([95], ['EUR'], ['2017-06-30'], 'EUR').tolist() == [95]
+        assert rates.convert([117], ['JPY'], ['2017-06-30'], 'EUR')[0] == pytest.approx(0.95)
+        with pytest.raises(UnknownCurrencyError):
+            rates.convert([1], ['USD'], ['2017-06-30'], 'CNY')
+
+    def test_convert_panel(self, rates):
+        panel = {
+            'Revenues': numpy.array([234e9, 3e9]),
+            'ROA': numpy.array([0.1, 0.2]),
+            'currency': numpy.array(['JPY', 'USD'], dtype=object),
+            'period_end_date': numpy.array(['2017-03-31', '2017-12-31'], dtype='datetime64[D]'),
+        }
+        converted = rates.convert_panel(panel)
+        assert converted['Revenues'].tolist() == pytest.approx([2e9, 3e9])
+        assert converted['ROA'].tolist() == [0.1, 0.2]
+        assert converted['currency'].tolist() == ['USD', 'USD']
+        assert panel['Revenues'][0] == 234e9
@@ -0,0 +1,30 @@
+from edgar_data import EdgarData
+from edgar_data.html_cleaner import HTMLCleaner, clean_html
+
+DOCUMENT = ('<table cellpadding="0" CELLSPACING="0">\n'
+            '<tr valign="top"><td width="50%" style="color:red"><font size="2">Revenue</font></td>'
+            '<td ALIGN="right"><FONT face="Arial">229,234</FONT></td></tr>\n'
+            '<tr><td align="left" class="total">Total</td></tr>\n'
+            '</table>\n')
+CLEANED = ('<table  >\n'
+           '<tr ><td  >Revenue</td><td >229,234</td></tr>\n'
+           '<tr><td  class="total">Total</td></tr>\n'
+           '</table>\n')
+
+
+class TestHTMLCleaner:
+
+    def test_clean_html(self):
+        assert clean_html(DOCUMENT) == CLEANED
+        assert clean_html('<p>Unterminated <font\nsize="2">text</p>') == '<p>Unterminated <font\n>text</p>'
+
+    def test_chunks(self):
+        for chunk_size in (1, 7, 64, len(DOCUMENT)):
+            cleaner = HTMLCleaner()
+            parts = [cleaner.feed(DOCUMENT[start:start + chunk_size])
+                     for start in range(0, len(DOCUMENT), chunk_size)]
+            assert ''.join(parts) + cleaner.close() == CLEANED
+
+    def test_edgar_data_cleans_when_asked(self):
+        assert EdgarData(clean_html=True)._clean_html(DOCUMENT) == CLEANED
+        assert EdgarData()._clean_html(DOCUMENT) == DOCUMENT
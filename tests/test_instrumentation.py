@@ -0,0 +1,65 @@
+import pytest
+from requests import RequestException
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import EDGARRequestError
+from edgar_data.instrumentation import NULL_STAGE, StageRecorder, stage
+from edgar_data.store import DocumentStore
+from edgar_data.xbrl import XBRL
+
+INDEX_URL = 'https://www.sec.gov/Archives/edgar/data/1/000000000118000001/0000000001-18-000001-index.htm'
+HTML_URL = 'https://www.sec.gov/Archives/edgar/data/1/000000000118000001/sample-10k.htm'
+
+
+class TestInstrumentation:
+
+    def test_disabled(self):
+        assert stage(None, 'html_download') is NULL_STAGE
+        with stage(None, 'html_download') as download:
+            download.bytes = 10
+        assert not hasattr(NULL_STAGE, 'bytes')
+
+    def test_xbrl_stages(self, sample_10k):
+        recorder = StageRecorder()
+        XBRL(sample_10k, on_stage=recorder)
+
+        assert [event.stage for event in recorder.events] == ['xbrl_parse', 'periods', 'fundamentals']
+        assert recorder.events[0].bytes == len(sample_10k)
+        assert all(event.outcome == 'ok' and event.end >= event.start for event in recorder.events)
+        assert XBRL.on_stage is None
+
+    def test_retrieve_stages(self, tmpdir, mocker, sample_10k_inline):
+        recorder = StageRecorder()
+        sec = EdgarData(store=DocumentStore(str(tmpdir)), on_stage=recorder)
+        mocker.patch.object(sec, '_html_url', return_value=HTML_URL)
+        mocker.patch('edgar_data.EdgarData.requests_get_retry',
+                     return_value=mocker.Mock(content=sample_10k_inline, text=sample_10k_inline.decode()))
+
+        sec.retrieve(INDEX_URL, '10-K', None, fetch_html=True, fetch_xbrl=True)
+
+        assert [event.stage for event in recorder.events] == [
+            'html_download', 'clean_html', 'xbrl_parse', 'periods', 'fundamentals']
+        assert all(event.accession_number == '0000000001-18-000001' for event in recorder.events)
+        assert all(event.url == HTML_URL for event in recorder.events)
+        assert recorder.events[0].bytes == len(sample_10k_inline)
+
+        sec.retrieve(INDEX_URL, '10-K', None, fetch_html=True, fetch_xbrl=False)
+        assert recorder.events[-2].stage == 'html_download'
+        assert (recorder.events[-2].outcome, recorder.events[-2].bytes) == ('stored', 0)
+
+        count, seconds, size = recorder.summary()['html_download']
+        assert (count, size) == (2, len(sample_10k_inline))
+        assert seconds >= 0
+
+    def test_failed_stage(self, mocker):
+        recorder = StageRecorder()
+        sec = EdgarData(on_stage=recorder)
+        mocker.patch.object(sec, '_html_url', return_value=HTML_URL)
+        mocker.patch('edgar_data.EdgarData.requests_get_retry', side_effect=RequestException('Timeout'))
+
+        with pytest.raises(EDGARRequestError):
+            sec.retrieve(INDEX_URL, '10-K', None, fetch_html=True, fetch_xbrl=False)
+
+        event, = recorder.events
+        assert (event.stage, event.outcome) == ('html_download', 'error')
+        assert event.error == 'EDGARRequestError()'
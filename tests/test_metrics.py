@@ -0,0 +1,84 @@
+import pytest
+from requests import ConnectionError
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import requests_get_retry
+from edgar_data.metrics import (CACHE_REQUESTS, DOWNLOADED_BYTES, FILINGS, RATE_LIMIT_WAIT, REQUESTS, RETRIES,
+                                XBRL_FAILURES, XBRL_PARSED, MetricsRegistry, registry)
+from edgar_data.store import DocumentStore
+from edgar_data.throttle import RateLimiter
+from edgar_data.xbrl import XBRL, EDGARPeriodError
+
+
+class TestMetrics:
+
+    def test_registry(self):
+        metrics = MetricsRegistry()
+        metrics.inc(REQUESTS, status_class='2xx')
+        metrics.inc(REQUESTS, 2, status_class='2xx')
+        metrics.inc(REQUESTS, status_class='5xx')
+        metrics.inc(RATE_LIMIT_WAIT, 0.25)
+        metrics.inc(CACHE_REQUESTS, cache='documents', result='hit')
+
+        assert metrics.get(REQUESTS, status_class='2xx') == 3
+        assert metrics.get(RETRIES) == 0
+
+        snapshot = metrics.snapshot()
+        assert snapshot['edgar_requests_total{status_class="2xx"}'] == 3
+        assert snapshot['edgar_cache_requests_total{cache="documents",result="hit"}'] == 1
+        assert snapshot[RETRIES] == 0
+        assert REQUESTS not in snapshot
+
+        text = metrics.prometheus()
+        assert '# TYPE edgar_requests_total counter\n' in text
+        assert 'edgar_requests_total{status_class="2xx"} 3\n' in text
+        assert 'edgar_request_retries_total 0\n' in text
+        assert 'edgar_rate_limit_wait_seconds_total 0.25\n' in text
+        assert '\nedgar_filings_retrieved_total' not in text
+
+        metrics.reset()
+        assert metrics.get(REQUESTS, status_class='2xx') == 0
+
+    def test_requests(self, mocker):
+        metrics = MetricsRegistry()
+        mocker.patch('edgar_data.EdgarData.sleep')
+        ok = mocker.Mock(status_code=200, content=b'12345')
+        get = mocker.patch('requests.get', side_effect=[ConnectionError('Reset'), ok])
+
+        assert requests_get_retry('https://www.sec.gov/', RateLimiter(1000), metrics) is ok
+        assert get.call_count == 2
+        assert metrics.get(REQUESTS, status_class='error') == 1
+        assert metrics.get(REQUESTS, status_class='2xx') == 1
+        assert metrics.get(RETRIES) == 1
+        assert metrics.get(DOWNLOADED_BYTES) == 5
+        assert metrics.get(RATE_LIMIT_WAIT) > 0
+
+    def test_document_store(self, tmpdir, mocker):
+        metrics = MetricsRegistry()
+        sec = EdgarData(store=DocumentStore(str(tmpdir)), metrics=metrics)
+        mocker.patch('edgar_data.EdgarData.requests_get_retry', return_value=mocker.Mock(text='<html></html>'))
+
+        sec._retrieve_document('https://www.sec.gov/doc.htm')
+        sec._retrieve_document('https://www.sec.gov/doc.htm')
+
+        assert metrics.get(CACHE_REQUESTS, cache='documents', result='miss') == 1
+        assert metrics.get(CACHE_REQUESTS, cache='documents', result='hit') == 1
+        assert metrics.get(FILINGS, form_type='10-K') == 0
+
+    def test_xbrl(self, mocker, sample_10k):
+        metrics = MetricsRegistry()
+        XBRL(sample_10k, metrics=metrics)
+        assert metrics.get(XBRL_PARSED) == 1
+
+        mocker.patch.object(XBRL, 'GetCurrentPeriodAndContextInformation', side_effect=EDGARPeriodError)
+        with pytest.raises(EDGARPeriodError):
+            XBRL(sample_10k, metrics=metrics)
+        assert metrics.get(XBRL_PARSED) == 1
+        assert metrics.get(XBRL_FAILURES, error='EDGARPeriodError') == 1
+
+    def test_default_registry(self, sample_10k):
+        parsed = registry.get(XBRL_PARSED)
+        XBRL(sample_10k)
+        assert registry.get(XBRL_PARSED) == parsed + 1
+        assert EdgarData().metrics is registry
+        assert XBRL(sample_10k, metrics=None).metrics is None
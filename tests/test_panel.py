@@ -0,0 +1,53 @@
+import numpy
+
+from edgar_data.EdgarData import EdgarForm
+from edgar_data.cache import FundamentalsCache
+from edgar_data.panel import build_panel
+from edgar_data.xbrl import XBRL
+
+
+def make_form(xbrl, accession_number, period_of_report, filing_date):
+    filing = {'form': '10-K', 'period_of_report': period_of_report, 'filing_date': filing_date,
+              'index_url': None, 'accession_number': accession_number}
+    return EdgarForm(None, xbrl, '0000000001', None, filing, [])
+
+
+class TestPanel:
+
+    def test_build_panel(self, sample_10k):
+        current = XBRL(sample_10k)
+        previous = XBRL(sample_10k)
+        previous.loadYear(1)
+        forms = [make_form(current, '0000000001-18-000001', '2017-12-31', '2018-02-20'),
+                 make_form(previous, '0000000001-17-000001', '2016-12-31', '2017-02-20')]
+
+        panel = build_panel(forms, fields=['Revenues', 'ROA', 'ExchangeGainsLosses'])
+        assert panel['Revenues'].tolist() == [3e9, 2.6e9]
+        assert panel['ROA'][0] == current.fields['ROA']
+        assert numpy.isnan(panel['ExchangeGainsLosses']).all()
+        assert panel['currency'].tolist() == ['USD', 'USD']
+        assert panel['form_type'].tolist() == ['10-K', '10-K']
+        assert panel['period_end_date'].tolist()[0].isoformat() == '2017-12-31'
+        assert panel['fiscal_year_focus'][0] == current.fields['DocumentFiscalYearFocus']
+        assert len(set(len(column) for column in panel.values())) == 1
+
+    def test_default_fields(self, sample_10k):
+        panel = build_panel([make_form(XBRL(sample_10k), None, None, '2018-02-20')])
+        assert panel['Assets'].dtype == float
+        assert panel['Revenues'][0] == 3e9
+        assert numpy.isnat(panel['period_end_date'][0])
+
+    def test_cached_filings(self, tmpdir, sample_10k):
+        cache = FundamentalsCache(str(tmpdir.join('fundamentals.db')))
+        cache.put('0000000001-18-000001', XBRL(sample_10k).fields, cik='0000000001', form='10-K',
+                  period_of_report='2017-12-31', filing_date='2018-02-20')
+
+        panel = build_panel(cache.find('1'), fields=['Revenues'])
+        assert panel['Revenues'].tolist() == [3e9]
+        assert panel['accession_number'].tolist() == ['0000000001-18-000001']
+        assert panel['currency'].tolist() == ['USD']
+
+    def test_empty(self):
+        panel = build_panel([], fields=['Revenues'])
+        assert len(panel['Revenues']) == 0
+        assert len(panel['cik']) == 0
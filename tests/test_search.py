@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from edgar_data import EdgarData
+from edgar_data.search import FullTextIndex, tokenize
+
+GOING_CONCERN = ('<html><body><p><b>Item 1A. Risk Factors</b></p>'
+                 '<p>There is <i>substantial doubt</i> about our ability to continue as a going&nbsp;concern.</p>'
+                 '<p><b>Item 7. Management&#8217;s Discussion</b></p><p>Going concern disclosures.</p></body></html>')
+GROWTH = ('<html><body><p><b>Item 7. Management Discussion</b></p>'
+          '<p style="going">Revenues grew. The concern of going abroad remains.</p></body></html>')
+
+
+class TestFullTextIndex:
+
+    def make_index(self, tmpdir):
+        index = FullTextIndex(str(tmpdir.join('search.db')))
+        assert index.add_document('0000000001-18-000001', GOING_CONCERN, cik='0000000001', form='8-K',
+                                  filing_date='2018-02-20')
+        assert index.add_document('0000000002-18-000001', GROWTH, cik='0000000002', form='10-K',
+                                  filing_date='2018-03-01')
+        return index
+
+    def test_tokenize(self):
+        assert list(tokenize('<p class="x">Going&nbsp;concern</p>')) == [('going', 13), ('concern', 24)]
+
+    def test_phrase(self, tmpdir):
+        index = self.make_index(tmpdir)
+        hits = index.search('"going concern"')
+
+        assert [(hit.accession_number, hit.section) for hit in hits] == [
+            ('0000000001-18-000001', '1A'), ('0000000001-18-000001', '7')]
+        assert GOING_CONCERN[hits[0].offset:].startswith('going&nbsp;concern')
+
+    def test_boolean(self, tmpdir):
+        index = self.make_index(tmpdir)
+
+        assert {hit.accession_number for hit in index.search('going concern')} == {
+            '0000000001-18-000001', '0000000002-18-000001'}
+        assert {hit.accession_number for hit in index.search('going AND NOT doubt')} == {'0000000002-18-000001'}
+        assert {hit.accession_number for hit in index.search('"substantial doubt" OR revenues')} == {
+            '0000000001-18-000001', '0000000002-18-000001'}
+        assert index.search('going', form_types=['8-K'])[0].accession_number == '0000000001-18-000001'
+        assert index.search('"concern going"') == []
+        assert index.search('bankruptcy') == []
+        # Attribute values are not indexed
+        assert index.search('style') == []
+
+    def test_incremental(self, tmpdir):
+        index = self.make_index(tmpdir)
+        index.close()
+
+        index = FullTextIndex(str(tmpdir.join('search.db')))
+        assert '0000000001-18-000001' in index
+        assert not index.add_document('0000000001-18-000001', GROWTH)
+        assert len(index.search('"substantial doubt"')) == 1
+
+    def test_get_form_data_indexes_filings(self, tmpdir, mocker):
+        index = FullTextIndex(str(tmpdir.join('search.db')))
+        sec = EdgarData(index=index)
+        filing = {'form': '8-K', 'index_url': 'https://www.sec.gov/0000000001-18-000001-index.htm', 'index': None,
+                  'period_of_report': '2018-02-20', 'filing_date': '2018-02-20',
+                  'accession_number': '0000000001-18-000001'}
+        mocker.patch.object(sec, '_get_all_filings_index_pages', side_effect=lambda *args: iter([filing]))
+        mocker.patch.object(sec, '_supplemental_links', return_value=[])
+        mocker.patch.object(sec, 'retrieve', return_value=('text_url', GOING_CONCERN, None))
+
+        sec.get_form_data('1', datetime(2018, 1, 1), form_types=['8-K'])
+
+        assert index.search('"going concern"')[0].accession_number == '0000000001-18-000001'
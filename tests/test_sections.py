@@ -0,0 +1,65 @@
+from edgar_data.EdgarData import EdgarForm
+from edgar_data.sections import index_sections
+
+TEN_K = """<html><body>
+<p><b>TABLE OF CONTENTS</b></p>
+<table>
+<tr><td><b>PART I</b></td></tr>
+<tr><td>Item 1.</td><td><a href="#i1">Business</a></td><td>3</td></tr>
+<tr><td>Item 1A.</td><td><a href="#i1a">Risk Factors</a></td><td>8</td></tr>
+<tr><td><b>PART II</b></td></tr>
+<tr><td>Item 7.</td><td><a href="#i7">Management's Discussion and Analysis</a></td><td>20</td></tr>
+</table>
+<p style="page-break-before:always"><b>PART I</b></p>
+<p><b>ITEM&nbsp;1. BUSINESS</b></p>
+<p>We make widgets. See Item 1A for the risks of our business.</p>
+<p><b><span>Item 1A.&#160;&#160;Risk Factors</span></b></p>
+<p>Widgets may go out of fashion.</p>
+<p><b>PART II</b></p>
+<p><b>Item 7. Management&#8217;s Discussion and Analysis</b></p>
+<p>Revenues grew, as discussed in Item 1.</p>
+</body></html>
+"""
+
+TEN_Q = """PART I - FINANCIAL INFORMATION
+Item 1. Financial Statements
+Balance sheets.
+Item 2. Management's Discussion and Analysis
+Results.
+PART II - OTHER INFORMATION
+Item 1. Legal Proceedings
+None.
+Item 1A. Risk Factors
+No changes.
+"""
+
+
+class TestSections:
+
+    def test_index_sections(self):
+        sections = index_sections(TEN_K)
+
+        assert [(section.part, section.item) for section in sections] == [('I', '1'), ('I', '1A'), ('II', '7')]
+        assert [section.title for section in sections] == ['BUSINESS', 'Risk Factors',
+                                                   'Management\u2019s Discussion and Analysis']
+        assert TEN_K[sections[1].start:sections[1].end] == \
+            '<span>Item 1A.&#160;&#160;Risk Factors</span></b></p>\n<p>Widgets may go out of fashion.</p>\n' \
+            '<p><b>PART II</b></p>\n<p>'
+        assert sections[-1].end == len(TEN_K)
+
+    def test_parts(self):
+        sections = index_sections(TEN_Q)
+
+        assert [(section.part, section.item) for section in sections] == [
+            ('I', '1'), ('I', '2'), ('II', '1'), ('II', '1A')]
+        assert TEN_Q[sections[2].start:sections[2].end] == 'Item 1. Legal Proceedings\nNone.\n'
+
+    def test_edgar_form_section(self):
+        filing = {'form': '10-K', 'period_of_report': None, 'filing_date': '2018-02-20', 'index_url': None}
+        form = EdgarForm(TEN_K, None, '0000000001', None, filing, [])
+
+        assert 'Widgets may go out of fashion.' in form.section('1a')
+        assert 'We make widgets' not in form.section('1A')
+        assert form.section('7', part='II').startswith('<b>Item 7.')
+        assert form.section('9A') is None
+        assert EdgarForm(None, None, '0000000001', None, filing, []).section('1A') is None
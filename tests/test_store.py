@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import EdgarForm
+from edgar_data.store import DocumentNotStored, DocumentStore, StoredDocument
+
+HTML = '<html><body><p><b>Item 1A. Risk Factors</b></p><p>Widgets may go out of fashion.</p></body></html>'
+
+
+class TestDocumentStore:
+
+    def test_put_get(self, tmpdir):
+        store = DocumentStore(str(tmpdir))
+        digest = store.put(HTML)
+
+        assert store.get(digest) == HTML
+        assert digest in store
+        assert store.put(HTML) == digest
+        assert len([path for path in tmpdir.join('objects').visit() if path.isfile()]) == 1
+        with pytest.raises(DocumentNotStored):
+            store.get('0' * 64)
+
+    def test_put_from_threads(self, tmpdir):
+        store = DocumentStore(str(tmpdir))
+        document = HTML * 1000
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            digests = list(executor.map(lambda _: store.put_url('https://www.sec.gov/doc.htm', document), range(64)))
+
+        assert len(set(digests)) == 1
+        assert store.get_url('https://www.sec.gov/doc.htm') == document
+        assert not [path for path in tmpdir.visit() if path.ext == '.tmp']
+
+    def test_urls(self, tmpdir):
+        store = DocumentStore(str(tmpdir))
+        assert store.get_url('https://www.sec.gov/doc.htm') is None
+
+        store.put_url('https://www.sec.gov/doc.htm', HTML)
+        assert store.get_url('https://www.sec.gov/doc.htm') == HTML
+
+    def test_retrieve_document_uses_store(self, tmpdir, mocker):
+        sec = EdgarData(store=DocumentStore(str(tmpdir)))
+        response = mocker.Mock(text=HTML)
+        get = mocker.patch('edgar_data.EdgarData.requests_get_retry', return_value=response)
+
+        assert sec._retrieve_document('https://www.sec.gov/doc.htm') == HTML
+        assert sec._retrieve_document('https://www.sec.gov/doc.htm') == HTML
+        assert get.call_count == 1
+
+    def test_lazy_html(self, tmpdir, mocker):
+        store = DocumentStore(str(tmpdir))
+        sec = EdgarData(store=store)
+        filing = {'form': '10-K', 'index_url': 'https://www.sec.gov/0000000001-18-000001-index.htm', 'index': None,
+                  'period_of_report': '2017-12-31', 'filing_date': '2018-02-20',
+                  'accession_number': '0000000001-18-000001'}
+        mocker.patch.object(sec, '_get_all_filings_index_pages', side_effect=lambda *args: iter([filing]))
+        mocker.patch.object(sec, '_supplemental_links', return_value=[])
+        mocker.patch.object(sec, 'retrieve', return_value=('text_url', HTML, None))
+
+        form = sec.get_form_data('1', datetime(2018, 1, 1), fetch_xbrl=False, form_types=['10-K'])[0]
+
+        assert isinstance(form._html, StoredDocument)
+        assert form.html == HTML
+        assert form.section('1A').endswith('Widgets may go out of fashion.</p></body></html>')
+
+    def test_stored_sections(self, tmpdir, mocker):
+        store = DocumentStore(str(tmpdir))
+        form = EdgarForm(StoredDocument(store, store.put(HTML)), None, '0000000001', None,
+                         {'form': '10-K', 'index_url': None, 'period_of_report': None, 'filing_date': '2018-02-20'},
+                         [])
+        form.sections
+        get = mocker.spy(store, 'get')
+
+        assert form.section('1A') == HTML[HTML.index('<b>Item 1A.'):]
+        assert form.section('1A') == HTML[HTML.index('<b>Item 1A.'):]
+        # The document is read once per section, and indexing its sections stores nothing
+        assert get.call_count == 2
+        assert len([path for path in tmpdir.join('objects').visit() if path.isfile()]) == 1
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from edgar_data import EdgarData
+from edgar_data.EdgarData import accession_number
+from edgar_data.filing_index import FilingIndex
+from edgar_data.sync import SyncState
+
+INDEX_URL = 'https://www.sec.gov/Archives/edgar/data/1/{0}-index.htm'
+
+FILING = '<filing><dateFiled>{0}</dateFiled><filingHREF>{1}</filingHREF><type>{2}</type></filing>'
+
+
+def listing(*filings):
+    """Company listing of browse-edgar, newest first."""
+    return ('<?xml version="1.0" encoding="ISO-8859-1" ?><companyFilings><results>{0}</results></companyFilings>'
+            .format(''.join(FILING.format(date, INDEX_URL.format(number), form_type)
+                            for date, number, form_type in filings))).encode('ascii')
+
+
+@pytest.fixture
+def edgar(mocker):
+    edgar = EdgarData()
+    edgar.filing_dates = {}
+
+    def get_filing(cik, form, filing_url):
+        filing_date = edgar.filing_dates[accession_number(filing_url)]
+        return {'form': form, 'index_url': filing_url, 'index': FilingIndex(filing_url, filing_date, None, [], []),
+                'period_of_report': '2017-12-31', 'filing_date': filing_date,
+                'accession_number': accession_number(filing_url)}
+
+    mocker.patch.object(edgar, '_get_filing', side_effect=get_filing)
+    mocker.patch.object(edgar, 'retrieve', return_value=(None, None, None))
+    mocker.patch.object(edgar, '_request_edgar')
+    return edgar
+
+
+def respond(edgar, *filings):
+    edgar.filing_dates.update((number, date) for date, number, _ in filings)
+    edgar._request_edgar.return_value.content = listing(*filings)
+
+
+class TestSyncState:
+
+    def test_advance(self, tmpdir):
+        state = SyncState(str(tmpdir.join('sync.db')))
+        assert state.get('0000000001', '10-Q') is None
+        assert state.is_new('0000000001', '10-Q', '2018-01-01', 'a')
+
+        state.advance('0000000001', '10-Q', '2018-05-01', 'a')
+        state.advance('0000000001', '10-Q', '2018-05-01', 'b')
+        state.advance('0000000001', '10-Q', '2018-02-01', 'c')
+
+        assert state.get('0000000001', '10-Q').filing_date == '2018-05-01'
+        assert state.get('0000000001', '10-Q').accession_number == 'b'
+        assert not state.is_new('0000000001', '10-Q', '2018-05-01', 'a')
+        assert state.is_new('0000000001', '10-Q', '2018-05-01', 'd')
+        assert not state.is_new('0000000001', '10-Q', '2018-04-30', 'd')
+        assert state.is_new('0000000001', '10-Q', '2018-05-02', 'a')
+        assert state.is_new('0000000001', '10-Q', None, 'd')
+
+        state.advance('0000000001', '10-Q', '2018-08-01', 'e')
+        assert state.is_new('0000000001', '10-Q', '2018-08-01', 'a')
+        assert [watermark.accession_number for watermark in state.watermarks()] == ['e']
+
+
+class TestSync:
+
+    def test_sync(self, tmpdir, edgar):
+        state = SyncState(str(tmpdir.join('sync.db')))
+        respond(edgar, ('2018-05-01', '0000000001-18-000002', '10-Q'), ('2018-02-01', '0000000001-18-000001', '10-Q'))
+
+        forms = edgar.sync('1', state, form_types=['10-Q'], date_start=datetime(2018, 1, 1), fetch_html=False)
+
+        assert [form.accession_number for form in forms] == ['0000000001-18-000001', '0000000001-18-000002']
+        assert edgar._request_edgar.call_args[1]['datea'] == '2018-01-01'
+        assert state.get('0000000001', '10-Q').accession_number == '0000000001-18-000002'
+
+        # Listed again from the watermark date: only the filing not synced yet is fetched
+        respond(edgar, ('2018-05-01', '0000000001-18-000003', '10-Q'), ('2018-05-01', '0000000001-18-000002', '10-Q'))
+        edgar._get_filing.reset_mock()
+
+        forms = edgar.sync('1', state, form_types=['10-Q'], fetch_html=False)
+
+        assert [form.accession_number for form in forms] == ['0000000001-18-000003']
+        assert edgar._request_edgar.call_args[1]['datea'] == '2018-05-01'
+        assert edgar._get_filing.call_count == 1
+
+        assert edgar.sync('1', state, form_types=['10-Q'], fetch_html=False) == []
+
+    def test_first_sync_needs_date_start(self, tmpdir, edgar):
+        state = SyncState(str(tmpdir.join('sync.db')))
+
+        with pytest.raises(ValueError):
+            edgar.sync('1', state, form_types=['10-K'])
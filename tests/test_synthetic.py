@@ -0,0 +1,68 @@
+import pytest
+from lxml import etree
+
+from edgar_data.synthetic import CURRENT_VALUES, PRIOR_RATIO, base_contexts, base_facts, synthetic_instance
+from edgar_data.xbrl import XBRL
+
+
+class TestSyntheticInstance:
+
+    def test_knobs(self):
+        document = synthetic_instance(contexts=50, facts=600, dimensions=3, units=10, text_blocks=4,
+                                      text_block_size=5000)
+        xbrl = XBRL(document)
+
+        assert len(xbrl.contexts) == 50
+        assert len([fact for fact in xbrl.facts if fact.unit_ref is not None]) == 600
+        assert len(xbrl.units) == 10
+        assert len(set(xbrl.units.values())) == 10
+        dimensional = [context for context in xbrl.contexts.values() if context.dimensions]
+        assert len(dimensional) == 50 - base_contexts()
+        assert all(len(context.dimensions) == 3 for context in dimensional)
+
+        text_blocks = [fact for fact in xbrl.facts if fact.concept.endswith('TextBlock')]
+        assert len(text_blocks) == 4
+        assert all(len(fact.text) == 5000 for fact in text_blocks)
+
+    def test_periods(self):
+        xbrl = XBRL(synthetic_instance(contexts=40, facts=400))
+
+        assert xbrl.fields['DocumentType'] == '10-K'
+        assert xbrl.fields['ContextForDurations'] == 'D_CURRENT'
+        assert xbrl.fields['ContextForInstants'] == 'I_CURRENT'
+        assert xbrl.fields['Revenues'].value == CURRENT_VALUES['Revenues']
+        assert xbrl.fields['NetIncomeLoss'].value == CURRENT_VALUES['NetIncomeLoss']
+        assert xbrl.fields['CurrentAssets'].value == CURRENT_VALUES['AssetsCurrent']
+
+        xbrl.loadYear(1)
+        assert xbrl.fields['Revenues'].value == CURRENT_VALUES['Revenues'] * PRIOR_RATIO
+        assert xbrl.fields['Assets'].value == CURRENT_VALUES['Assets'] * PRIOR_RATIO
+
+    def test_quarterly(self):
+        xbrl = XBRL(synthetic_instance(contexts=30, dimensions=1, quarterly=True, period_end='2018-06-30'))
+
+        assert xbrl.fields['DocumentFiscalPeriodFocus'] == 'Q2'
+        assert xbrl.fields['IncomeStatementPeriodYTD'] == '2018-01-01'
+        assert xbrl.fields['Revenues'].value == CURRENT_VALUES['Revenues']
+
+        xbrl.loadYear(0, quarter=True)
+        assert xbrl.fields['ContextForDurations'] == 'Q_CURRENT'
+        assert xbrl.fields['IncomeStatementPeriodYTD'] == '2018-04-01'
+        assert xbrl.fields['Revenues'].value == CURRENT_VALUES['Revenues'] // 3
+
+    def test_valid_document(self):
+        document = synthetic_instance(contexts=20, facts=base_facts() + 100, units=12, text_blocks=1)
+        root = etree.fromstring(document)
+
+        context_ids = [element.get('id') for element in root.iterfind('{http://www.xbrl.org/2003/instance}context')]
+        assert len(context_ids) == len(set(context_ids))
+        facts = [(element.tag, element.get('contextRef')) for element in root if element.get('contextRef')]
+        assert len(facts) == len(set(facts))
+
+    def test_minimums(self):
+        with pytest.raises(ValueError):
+            synthetic_instance(contexts=base_contexts(quarterly=True) - 1, quarterly=True)
+        with pytest.raises(ValueError):
+            synthetic_instance(facts=base_facts() - 1)
+        with pytest.raises(ValueError):
+            synthetic_instance(units=0)
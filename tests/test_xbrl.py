@@ -0,0 +1,256 @@
+import math
+import pickle
+
+import pytest
+from edgar_data import EdgarData
+from edgar_data.filing_index import FilingIndex, IndexDocument
+from edgar_data.xbrl import XBRL, Field, Period, XBRLFormatError
+from edgar_data.xbrl_fundamentals import FUNDAMENTALS_PLAN, DURATION, INSTANT, batch_fundamentals
+from edgar_data.xbrl_inline import InlineXBRL, is_inline_xbrl
+from edgar_data.xbrl_pool import parse_xbrl_many
+
+
+class TestXBRL:
+
+    def test_current_period(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+
+        assert xbrl.fields['ContextForInstants'] == 'I2017'
+        assert xbrl.fields['ContextForDurations'] == 'FY2017'
+        assert xbrl.fields['Revenues'].value == 3e9
+        assert xbrl.fields['GrossProfit'].value == 1.2e9
+        assert xbrl.fields.currency('Revenues').code == 'USD'
+
+    def test_get_all_periods(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+        periods = xbrl.GetAllPeriods()
+
+        assert list(periods) == [
+            Period('2017-01-01', '2017-12-31'),
+            Period('2016-01-01', '2016-12-31'),
+            Period('2015-01-01', '2015-12-31'),
+            Period(None, '2014-12-31'),
+        ]
+
+        assert [fields['Revenues'].value for fields in list(periods.values())[:3]] == [3e9, 2.6e9, 2.2e9]
+        assert periods[Period('2015-01-01', '2015-12-31')]['Assets'] is None
+        assert periods[Period(None, '2014-12-31')]['Equity'].value == 1.2e9
+
+        # The current period is left untouched
+        assert xbrl.fields['ContextForDurations'] == 'FY2017'
+
+    def test_get_all_periods_matches_load_year(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+        periods = xbrl.GetAllPeriods()
+
+        xbrl.loadYear(1)
+        prior_year = periods[Period('2016-01-01', '2016-12-31')]
+        for name in ('Revenues', 'Assets', 'NetIncomeLoss', 'NoncurrentLiabilities', 'NetCashFlow'):
+            assert prior_year[name].value == xbrl.fields[name].value
+
+    def test_member_values(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+        axis = 'us-gaap:StatementBusinessSegmentsAxis'
+
+        revenues = xbrl.GetMemberValues('us-gaap:Revenues', axis)
+        assert list(revenues) == ['smpl:WidgetsMember', 'smpl:GadgetsMember']
+        assert [field.value for field in revenues.values()] == [1.8e9, 1.2e9]
+
+        assert xbrl.GetMemberValues('us-gaap:Revenues', axis, Period('2016-01-01', '2016-12-31')) == {}
+        assert xbrl.GetMemberValues('us-gaap:Assets', axis) == {}
+        assert xbrl.GetMemberValues('us-gaap:OperatingIncomeLoss', axis)['smpl:GadgetsMember'].value == 2e8
+
+    def test_to_bytes(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+        loaded = XBRL.from_bytes(xbrl.to_bytes())
+
+        assert loaded.facts == xbrl.facts
+        assert loaded.contexts == xbrl.contexts
+        assert loaded.units == xbrl.units
+        assert loaded.fields['Revenues'].value == 3e9
+        assert loaded.fields.currency('Revenues').code == 'USD'
+        assert loaded.fields['ContextForDurations'] == 'FY2017'
+
+        # Loaded instances are fully functional
+        assert len(loaded.GetMemberValues('us-gaap:Revenues', 'us-gaap:StatementBusinessSegmentsAxis')) == 2
+        assert len(loaded.GetAllPeriods()) == 4
+        loaded.loadYear(1)
+        assert loaded.fields['Revenues'].value == 2.6e9
+
+    def test_from_bytes_invalid(self, sample_10k):
+        with pytest.raises(XBRLFormatError):
+            XBRL.from_bytes(sample_10k)
+        with pytest.raises(XBRLFormatError):
+            XBRL.from_bytes(b'EDG')
+
+        data = XBRL(sample_10k).to_bytes()
+        with pytest.raises(XBRLFormatError):
+            XBRL.from_bytes(data[:4] + b'\x00\x63' + data[6:])
+        with pytest.raises(XBRLFormatError):
+            XBRL.from_bytes(data[:-10])
+
+    def test_selective_parsing(self, sample_10k):
+        text_block = b'<us-gaap:IncomeTaxDisclosureTextBlock contextRef="FY2017">' \
+                     b'&lt;p&gt;Policies&lt;/p&gt;</us-gaap:IncomeTaxDisclosureTextBlock>'
+        doc = sample_10k.replace(b'</xbrli:xbrl>', text_block + b'</xbrli:xbrl>')
+        text_block_concept = '{http://fasb.org/us-gaap/2017-01-31}IncomeTaxDisclosureTextBlock'
+
+        full = XBRL(doc)
+        assert full._first_fact('us-gaap:IncomeTaxDisclosureTextBlock').text == '<p>Policies</p>'
+
+        numeric = XBRL(doc, numeric_only=True)
+        assert numeric.fields.fields.keys() == full.fields.fields.keys()
+        assert all(float(numeric.fields[name] or 0) == float(full.fields[name] or 0) for name in full.fields.fields
+                   if isinstance(full.fields[name], (Field, float)))
+        assert numeric.fields['DocumentType'] == '10-K'
+        assert numeric._first_fact('us-gaap:IncomeTaxDisclosureTextBlock').text is None
+        assert numeric.contexts == full.contexts
+        assert numeric.units == full.units
+        assert [fact.concept for fact in numeric.facts] == [fact.concept for fact in full.facts]
+        # The elements are freed once indexed
+        assert len(numeric.oInstance) <= 1 and not len(numeric.oInstance[-1])
+
+        selected = XBRL(doc, concepts=['us-gaap:Revenues', 'us-gaap:IncomeTaxDisclosureTextBlock'])
+        assert selected.fields['Revenues'].value == 3e9
+        assert selected.fields['Assets'] is None
+        assert selected.fields['ContextForInstants'] == 'I2017'
+        assert [fact.text for fact in selected.facts if fact.concept == text_block_concept] == ['<p>Policies</p>']
+
+    def test_plan_collects_each_concept_once(self):
+        assert len(FUNDAMENTALS_PLAN.concepts) == len(set(FUNDAMENTALS_PLAN.concepts))
+        assert ('us-gaap:StockholdersEquity', INSTANT) in FUNDAMENTALS_PLAN.concepts
+        assert ('us-gaap:NetIncomeLoss', DURATION) in FUNDAMENTALS_PLAN.concepts
+
+    def test_plan_collect(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+        facts = FUNDAMENTALS_PLAN.collect(xbrl, xbrl.fields)
+
+        assert set(facts) == set(FUNDAMENTALS_PLAN.concepts)
+        assert facts[('us-gaap:Revenues', DURATION)].value == 3e9
+        assert facts[('ifrs-full:Revenue', DURATION)] is None
+
+    def test_ratios(self, sample_10k):
+        xbrl = XBRL(sample_10k)
+
+        assert xbrl.fields['ROA'] == xbrl.fields['NetIncomeLoss'].value / xbrl.fields['Assets'].value
+        assert xbrl.fields['ROS'] == xbrl.fields['NetIncomeLoss'].value / xbrl.fields['Revenues'].value
+
+    def test_batch_matches_single_filing(self, sample_10k):
+        numpy = pytest.importorskip('numpy')
+
+        xbrl = XBRL(sample_10k)
+        periods = list(xbrl.GetAllPeriods().values())
+        fundamentals = batch_fundamentals([xbrl] * len(periods), periods)
+
+        for row, fields in enumerate(periods):
+            for name, values in fundamentals.items():
+                value = fields[name]
+                if isinstance(value, Field):
+                    value = value.value
+                if value is None or math.isnan(value):
+                    assert numpy.isnan(values[row]), name
+                else:
+                    assert values[row] == value, name
+
+    def test_batch_division_by_zero(self):
+        numpy = pytest.importorskip('numpy')
+
+        fundamentals = FUNDAMENTALS_PLAN.evaluate_batch({
+            ('us-gaap:NetIncomeLoss', DURATION): [10.0, 10.0, numpy.nan],
+            ('us-gaap:Assets', INSTANT): [100.0, 0.0, 100.0],
+        })
+
+        assert fundamentals['ROA'][0] == 0.1
+        assert numpy.isnan(fundamentals['ROA'][1:]).all()
+        assert fundamentals['NoncurrentAssets'].shape == (3,)
+
+
+class TestXBRLPool:
+
+    def test_summary_is_picklable(self, sample_10k):
+        summary = pickle.loads(pickle.dumps(XBRL(sample_10k).GetSummary(all_periods=True)))
+
+        assert summary.fields['Revenues'].value == 3e9
+        assert summary.fields.currency('Revenues').code == 'USD'
+        assert summary.currencies['USD'].code == 'USD'
+        assert summary.contexts['FY2017_Widgets'].dimensions == (
+            ('us-gaap:StatementBusinessSegmentsAxis', 'smpl:WidgetsMember'),)
+        assert len(summary.periods) == 4
+
+    def test_parse_xbrl_many(self, sample_10k):
+        results = list(parse_xbrl_many([sample_10k, b'not xml', sample_10k], processes=2))
+
+        assert results[1] is None
+        assert [parsed.fields['Revenues'].value for parsed in (results[0], results[2])] == [3e9, 3e9]
+        assert results[0].periods is None
+
+
+class TestInlineXBRL:
+
+    def test_same_fields_as_instance(self, sample_10k, sample_10k_inline):
+        xbrl = XBRL(sample_10k)
+        inline = InlineXBRL(sample_10k_inline)
+
+        assert inline.contexts == xbrl.contexts
+        assert inline.units == xbrl.units
+        for period, fields in xbrl.GetAllPeriods().items():
+            inline_fields = inline.GetAllPeriods()[period]
+            for name, value in fields.fields.items():
+                if isinstance(value, Field):
+                    assert inline_fields[name].value == value.value, name
+                    assert inline_fields[name].unit_ref == value.unit_ref, name
+                else:
+                    assert inline_fields[name] == value, name
+
+    def test_transforms(self, sample_10k_inline):
+        inline = InlineXBRL(sample_10k_inline)
+
+        # "December 31, 2017"
+        assert inline.fields['BalanceSheetDate'] == '2017-12-31'
+        # "(400)", scale 6, sign "-"
+        assert inline.fields['NetCashFlowsInvesting'].value == -4e8
+
+    def test_is_inline_xbrl(self, sample_10k, sample_10k_inline):
+        assert is_inline_xbrl(sample_10k_inline)
+        assert is_inline_xbrl(sample_10k_inline.decode())
+        assert not is_inline_xbrl(sample_10k)
+
+    def test_retrieve_reads_primary_document(self, mocker, sample_10k_inline):
+        sec = EdgarData()
+        mocker.patch.object(sec, '_html_url', return_value='https://www.sec.gov/sample-10k.htm')
+        retrieve_document = mocker.patch.object(sec, '_retrieve_document', return_value=sample_10k_inline.decode())
+
+        text_url, filing, xbrl = sec.retrieve('index_url', '10-K', None, fetch_html=True, fetch_xbrl=True)
+
+        retrieve_document.assert_called_once_with('https://www.sec.gov/sample-10k.htm')
+        assert isinstance(xbrl, InlineXBRL)
+        assert xbrl.fields['Revenues'].value == 3e9
+
+    def test_retrieve_falls_back_to_inline(self, mocker, sample_10k_inline):
+        sec = EdgarData()
+        filing_index = FilingIndex('index_url', '2018-02-01', '2017-12-31',
+                                   [IndexDocument('1', '10-K', 'sample-10k.htm', 'https://www.sec.gov/sample-10k.htm',
+                                                  '10-K', '1000')],
+                                   [IndexDocument('2', 'XBRL SCHEMA FILE', 'smpl-20171231.xsd',
+                                                  'https://www.sec.gov/smpl-20171231.xsd', 'EX-101.SCH', '100')])
+        retrieve_document = mocker.patch.object(sec, '_retrieve_document', return_value=sample_10k_inline.decode())
+
+        text_url, filing, xbrl = sec.retrieve('index_url', '10-K', filing_index, fetch_html=False, fetch_xbrl=True)
+
+        retrieve_document.assert_called_once_with('https://www.sec.gov/sample-10k.htm')
+        assert filing is None
+        assert isinstance(xbrl, InlineXBRL)
+
+    def test_retrieve_without_xbrl(self, mocker):
+        # e.g. a 10-K filed before XBRL: the index has no data files
+        sec = EdgarData()
+        filing_index = FilingIndex('index_url', '2005-03-01', '2004-12-31',
+                                   [IndexDocument('1', '10-K', 'sample-10k.htm', 'https://www.sec.gov/sample-10k.htm',
+                                                  '10-K', '1000')], [])
+        retrieve_document = mocker.patch.object(sec, '_retrieve_document')
+
+        text_url, filing, xbrl = sec.retrieve('index_url', '10-K', filing_index, fetch_html=False, fetch_xbrl=True)
+
+        assert text_url == 'https://www.sec.gov/sample-10k.htm'
+        assert xbrl is None
+        retrieve_document.assert_not_called()